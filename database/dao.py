@@ -9,6 +9,12 @@ from typing import List, Optional, Dict, Tuple
 from datetime import datetime, date
 import json
 
+# 可选依赖：orjson 可加速口令配置的导入导出，未安装时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .models import (
     Player, Position, InventoryItem, Achievement,
     PlayerGameState, ShopItem, ContentTrigger, GameRanking
@@ -21,14 +27,15 @@ class PlayerDAO:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
-    def create_player(self, qq_id: str, nickname: str) -> Player:
-        """创建新玩家"""
+    def create_player(self, qq_id: str, nickname: str, faction: Optional[str] = None,
+                      initial_score: int = 0) -> Player:
+        """创建新玩家（阵营和初始积分在同一条 INSERT 中写入）"""
+        score = max(initial_score, 0)
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT OR IGNORE INTO players (qq_id, nickname)
-            VALUES (?, ?)
-        ''', (qq_id, nickname))
-        self.conn.commit()
+            INSERT OR IGNORE INTO players (qq_id, nickname, faction, current_score, total_score)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (qq_id, nickname, faction, score, score))
 
         # 同时创建游戏状态
         cursor.execute('''
@@ -39,6 +46,36 @@ class PlayerDAO:
 
         return self.get_player(qq_id)
 
+    def bulk_create_players(self, rows: List[Tuple[str, str, Optional[str], int]]) -> int:
+        """批量创建玩家（单个事务）
+
+        Args:
+            rows: [(qq_id, nickname, faction, initial_score), ...]
+
+        Returns:
+            int: 实际新增的玩家数（已存在的QQ号会被忽略）
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.executemany('''
+                INSERT OR IGNORE INTO players (qq_id, nickname, faction, current_score, total_score)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (qq_id, nickname, faction, max(score, 0), max(score, 0))
+                for qq_id, nickname, faction, score in rows
+            ])
+            inserted = cursor.rowcount
+
+            cursor.executemany('''
+                INSERT OR IGNORE INTO game_state (qq_id)
+                VALUES (?)
+            ''', [(row[0],) for row in rows])
+            self.conn.commit()
+            return inserted
+        except Exception:
+            self.conn.rollback()
+            raise
+
     def get_player(self, qq_id: str) -> Optional[Player]:
         """获取玩家信息"""
         cursor = self.conn.cursor()
@@ -128,6 +165,12 @@ class PlayerDAO:
         self.conn.commit()
         return True
 
+    def get_all_qq_ids(self) -> List[str]:
+        """获取所有玩家的QQ号"""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT qq_id FROM players')
+        return [row['qq_id'] for row in cursor.fetchall()]
+
     def get_all_players(self) -> List[Player]:
         """获取所有玩家"""
         cursor = self.conn.cursor()
@@ -144,6 +187,18 @@ class PlayerDAO:
             last_active=row['last_active']
         ) for row in rows]
 
+    def get_all_player_rows(self) -> List[sqlite3.Row]:
+        """获取所有玩家的显示字段（只读刷新用，直接返回行，不构造 Player）
+
+        行字段: qq_id, nickname, faction, current_score, total_score
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT qq_id, nickname, faction, current_score, total_score
+            FROM players ORDER BY total_score DESC
+        ''')
+        return cursor.fetchall()
+
 
 class PositionDAO:
     """位置数据访问对象"""
@@ -177,6 +232,42 @@ class PositionDAO:
             marker_type=row['marker_type']
         ) for row in rows]
 
+    def count_by_type(self, qq_id: str) -> Dict[str, int]:
+        """按标记类型统计玩家位置数量 {marker_type: count}"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT marker_type, COUNT(*) AS cnt
+            FROM player_positions
+            WHERE qq_id = ?
+            GROUP BY marker_type
+        ''', (qq_id,))
+        return {row['marker_type']: row['cnt'] for row in cursor.fetchall()}
+
+    def get_topped_counts(self, column_heights: Dict[int, int], min_topped: int = 1) -> Dict[str, int]:
+        """统计每个玩家已登顶的列数 {qq_id: 登顶列数}（在 SQL 中与列高比较）
+
+        Args:
+            column_heights: {列号: 列高}
+            min_topped: 只返回登顶列数不少于该值的玩家
+        """
+        if not column_heights:
+            return {}
+        heights_values = ", ".join("(?, ?)" for _ in column_heights)
+        params = [v for item in column_heights.items() for v in item]
+        params.append(min_topped)
+
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            WITH heights(col, h) AS (VALUES {heights_values})
+            SELECT p.qq_id, COUNT(*) AS topped
+            FROM player_positions p
+            JOIN heights ON heights.col = p.column_number
+            WHERE p.marker_type = 'permanent' AND p.position >= heights.h
+            GROUP BY p.qq_id
+            HAVING COUNT(*) >= ?
+        ''', params)
+        return {row['qq_id']: row['topped'] for row in cursor.fetchall()}
+
     def add_or_update_position(self, qq_id: str, column: int, position: int, marker_type: str):
         """添加或更新位置"""
         cursor = self.conn.cursor()
@@ -270,14 +361,22 @@ class PositionDAO:
 
         self.conn.commit()
 
-    def get_all_positions_on_map(self) -> Dict[str, List[Position]]:
-        """获取地图上所有玩家的位置"""
+    def get_all_positions_on_map(self, marker_type: Optional[str] = None) -> Dict[str, List[Position]]:
+        """获取地图上所有玩家的位置 {qq_id: [Position, ...]}，可按标记类型过滤"""
         cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT qq_id, column_number, position, marker_type
-            FROM player_positions
-            ORDER BY qq_id, column_number
-        ''')
+        if marker_type:
+            cursor.execute('''
+                SELECT qq_id, column_number, position, marker_type
+                FROM player_positions
+                WHERE marker_type = ?
+                ORDER BY qq_id, column_number
+            ''', (marker_type,))
+        else:
+            cursor.execute('''
+                SELECT qq_id, column_number, position, marker_type
+                FROM player_positions
+                ORDER BY qq_id, column_number
+            ''')
         rows = cursor.fetchall()
 
         result = {}
@@ -300,8 +399,9 @@ class InventoryDAO:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
-    def add_item(self, qq_id: str, item_id: int, item_name: str, item_type: str = 'item'):
-        """添加物品"""
+    def add_item(self, qq_id: str, item_id: int, item_name: str, item_type: str = 'item',
+                 quantity: int = 1):
+        """添加物品（quantity 个一次写入）"""
         cursor = self.conn.cursor()
         # 检查是否已有该物品
         cursor.execute('''
@@ -314,16 +414,16 @@ class InventoryDAO:
             # 增加数量
             cursor.execute('''
                 UPDATE player_inventory
-                SET quantity = quantity + 1
+                SET quantity = quantity + ?
                 WHERE id = ?
-            ''', (row['id'],))
+            ''', (quantity, row['id']))
         else:
             # 新增物品
             cursor.execute('''
                 INSERT INTO player_inventory
                 (qq_id, item_type, item_id, item_name, quantity)
-                VALUES (?, ?, ?, ?, 1)
-            ''', (qq_id, item_type, item_id, item_name))
+                VALUES (?, ?, ?, ?, ?)
+            ''', (qq_id, item_type, item_id, item_name, quantity))
 
         self.conn.commit()
 
@@ -423,6 +523,12 @@ class InventoryDAO:
 class GameStateDAO:
     """游戏状态数据访问对象"""
 
+    # 可通过 set_fields 单独更新的标量字段（列名白名单）
+    SCALAR_FIELDS = frozenset({
+        'current_round_active', 'can_start_new_round', 'temp_markers_used',
+        'skipped_rounds', 'lockout_until', 'forced_remaining_rounds', 'free_rounds',
+    })
+
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
@@ -440,6 +546,42 @@ class GameStateDAO:
 
         return PlayerGameState.from_dict(qq_id, dict(row))
 
+    def get_all_states(self) -> Dict[str, PlayerGameState]:
+        """一次获取所有玩家的游戏状态 {qq_id: PlayerGameState}"""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT * FROM game_state')
+        return {
+            row['qq_id']: PlayerGameState.from_dict(row['qq_id'], dict(row))
+            for row in cursor.fetchall()
+        }
+
+    def get_all_lockouts(self) -> Dict[str, str]:
+        """获取所有设置了锁定时间的玩家 {qq_id: lockout_until}（不解析其余状态字段）"""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT qq_id, lockout_until FROM game_state WHERE lockout_until IS NOT NULL')
+        return {row['qq_id']: row['lockout_until'] for row in cursor.fetchall()}
+
+    def set_fields(self, qq_id: str, **fields):
+        """只更新指定的标量字段，无需先读取完整状态
+
+        例: set_fields(qq_id, current_round_active=True, can_start_new_round=False)
+        """
+        unknown = set(fields) - self.SCALAR_FIELDS
+        if unknown:
+            raise ValueError(f"不支持单独更新的字段: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+
+        columns = list(fields)
+        values = [int(v) if isinstance(v, bool) else v for v in fields.values()]
+        assignments = ", ".join(f"{col} = ?" for col in columns)
+
+        cursor = self.conn.cursor()
+        # 与 get_state 一致：状态行不存在时先创建默认行
+        cursor.execute('INSERT OR IGNORE INTO game_state (qq_id) VALUES (?)', (qq_id,))
+        cursor.execute(f'UPDATE game_state SET {assignments} WHERE qq_id = ?', (*values, qq_id))
+        self.conn.commit()
+
     def update_state(self, state: PlayerGameState):
         """更新游戏状态"""
         cursor = self.conn.cursor()
@@ -823,6 +965,50 @@ class ContractDAO:
         self.conn.commit()
         return cursor.rowcount > 0
 
+    def load_contract_context(self, qq_a: str, qq_b: str) -> Dict[str, Tuple[str, Optional[str], Optional[str]]]:
+        """一次查询两名玩家的昵称及其现有契约对象
+
+        Returns:
+            {qq_id: (昵称, 契约对象QQ号或None, 契约对象昵称或None)}，不存在的玩家不在结果中
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT p.qq_id, p.nickname,
+                   CASE WHEN c.player1_qq = p.qq_id THEN c.player2_qq ELSE c.player1_qq END AS partner_qq,
+                   pp.nickname AS partner_nickname
+            FROM players p
+            LEFT JOIN player_contracts c
+                ON c.player1_qq = p.qq_id OR c.player2_qq = p.qq_id
+            LEFT JOIN players pp
+                ON pp.qq_id = CASE WHEN c.player1_qq = p.qq_id THEN c.player2_qq ELSE c.player1_qq END
+            WHERE p.qq_id IN (?, ?)
+        ''', (qq_a, qq_b))
+        return {
+            row['qq_id']: (row['nickname'], row['partner_qq'], row['partner_nickname'])
+            for row in cursor.fetchall()
+        }
+
+    def replace_contract(self, player1_qq: str, player2_qq: str) -> bool:
+        """解除双方现有契约并建立新契约（单个事务）"""
+        if player1_qq > player2_qq:
+            player1_qq, player2_qq = player2_qq, player1_qq
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute('''
+                DELETE FROM player_contracts
+                WHERE player1_qq IN (?, ?) OR player2_qq IN (?, ?)
+            ''', (player1_qq, player2_qq, player1_qq, player2_qq))
+            cursor.execute('''
+                INSERT INTO player_contracts (player1_qq, player2_qq)
+                VALUES (?, ?)
+            ''', (player1_qq, player2_qq))
+            self.conn.commit()
+            return True
+        except Exception:
+            self.conn.rollback()
+            raise
+
     def get_all_contracts(self) -> List[Tuple[str, str, str]]:
         """获取所有契约关系，返回 [(player1_qq, player2_qq, created_at), ...]"""
         cursor = self.conn.cursor()
@@ -1115,16 +1301,17 @@ class CustomCommandDAO:
         从 JSON 文件导入口令
         Returns: (成功数, 跳过数, 错误消息列表)
         """
-        import json
-        from pathlib import Path
-
         errors = []
         success_count = 0
         skip_count = 0
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
         except FileNotFoundError:
             return 0, 0, [f"文件不存在: {file_path}"]
         except json.JSONDecodeError as e:
@@ -1178,8 +1365,6 @@ class CustomCommandDAO:
         导出所有口令到 JSON 文件
         Returns: (是否成功, 消息)
         """
-        import json
-
         commands = self.get_all_commands()
         data = {
             "commands": [
@@ -1195,8 +1380,12 @@ class CustomCommandDAO:
         }
 
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
             return True, f"成功导出 {len(commands)} 条口令"
         except Exception as e:
             return False, f"导出失败: {str(e)}"
@@ -9,12 +9,17 @@ from pathlib import Path
 from datetime import datetime
 
 
+# 数据库结构版本（记录在 PRAGMA user_version 中）
+# 修改表结构、索引或内置商店道具数据时需递增，否则已有数据库启动时不会重新建表/同步道具
+SCHEMA_VERSION = 1
+
+
 class DatabaseSchema:
     """数据库结构管理类"""
 
     @staticmethod
     def create_tables(conn: sqlite3.Connection):
-        """创建所有数据库表"""
+        """创建所有数据库表（不提交，由调用方在同一事务中提交）"""
         cursor = conn.cursor()
 
         # ==================== 玩家基础信息表 ====================
@@ -465,11 +470,31 @@ class DatabaseSchema:
         )
         ''')
 
-        conn.commit()
+        # ==================== 索引 ====================
+        # 按玩家查询位置（含按标记类型过滤/分组）
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_positions_qq
+        ON player_positions(qq_id, marker_type)
+        ''')
+        # 按玩家查询首达记录
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_first_ach_qq
+        ON first_achievements(first_qq_id)
+        ''')
+        # 按玩家查询背包，以及添加/移除物品时的 (qq_id, item_id, item_type) 查找
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_inventory_qq
+        ON player_inventory(qq_id, item_id, item_type)
+        ''')
+        # 积分排行榜（ORDER BY current_score DESC LIMIT 10）直接沿索引取前 N 名
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_players_score
+        ON players(current_score)
+        ''')
 
     @staticmethod
     def initialize_shop_items(conn: sqlite3.Connection):
-        """初始化商店道具"""
+        """初始化商店道具（不提交，由调用方在同一事务中提交）"""
         cursor = conn.cursor()
 
         # (item_id, item_name, item_type, price, faction_limit, global_limit, description, player_limit)
@@ -533,13 +558,9 @@ class DatabaseSchema:
         ''', shop_items)
 
         # 更新已存在道具的描述和限购数量
-        for item in shop_items:
-            item_id, item_name, item_type, price, faction_limit, global_limit, description, player_limit = item
-            cursor.execute('''
-                UPDATE shop_items SET description = ?, player_limit = ? WHERE item_id = ?
-            ''', (description, player_limit, item_id))
-
-        conn.commit()
+        cursor.executemany('''
+            UPDATE shop_items SET description = ?, player_limit = ? WHERE item_id = ?
+        ''', [(item[6], item[7], item[0]) for item in shop_items])
 
     @staticmethod
     def clear_board(conn: sqlite3.Connection):
@@ -662,14 +683,33 @@ def init_database(db_path: str = "data/game.db") -> sqlite3.Connection:
 
     # 启用WAL模式，支持多连接同时读写
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL 模式下 NORMAL 同步即可保证一致性，减少每次提交的 fsync
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # 页缓存约 20MB（负数表示 KiB）
+    conn.execute("PRAGMA cache_size=-20000")
+    # 排序/聚合产生的临时表放在内存中
+    conn.execute("PRAGMA temp_store=MEMORY")
     # 设置busy_timeout，当数据库被锁定时等待而不是立即报错
     conn.execute("PRAGMA busy_timeout=30000")
 
-    # 创建表
-    DatabaseSchema.create_tables(conn)
+    # 结构版本一致时跳过建表、字段迁移和道具同步
+    if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        return conn
+
+    # 建表、字段迁移、道具同步和版本号写入放在同一事务中，只提交（fsync）一次
+    conn.execute("BEGIN")
+    try:
+        # 创建表
+        DatabaseSchema.create_tables(conn)
 
-    # 初始化商店道具
-    DatabaseSchema.initialize_shop_items(conn)
+        # 初始化商店道具
+        DatabaseSchema.initialize_shop_items(conn)
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
     return conn
 
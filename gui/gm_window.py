@@ -14,12 +14,17 @@ sys.path.insert(0, str(project_root))
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QTableWidget, QTableWidgetItem, QTabWidget,
-    QTextEdit, QLineEdit, QGroupBox, QGridLayout, QMessageBox,
+    QTextEdit, QPlainTextEdit, QLineEdit, QGroupBox, QGridLayout, QMessageBox,
     QHeaderView, QScrollArea, QFrame, QSplitter, QComboBox,
     QSpinBox, QCheckBox, QToolTip, QDialog, QDialogButtonBox,
-    QListWidget, QListWidgetItem, QProgressBar, QFileDialog
+    QListWidget, QListWidgetItem, QProgressBar, QFileDialog, QTableView,
+    QProgressDialog
+)
+from PySide6.QtCore import (
+    Qt, QTimer, Signal, QSize, QPoint, QRect, QObject,
+    QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+    QRunnable, QThreadPool, QThread
 )
-from PySide6.QtCore import Qt, QTimer, Signal, QSize, QPoint, QRect
 from PySide6.QtGui import QPainter, QColor, QPen, QFont, QBrush, QCursor
 
 from database.schema import init_database
@@ -27,8 +32,104 @@ from database.dao import (
     PlayerDAO, PositionDAO, ShopDAO, AchievementDAO,
     InventoryDAO, GameStateDAO, GemPoolDAO, ContractDAO, CustomCommandDAO
 )
+from database.models import Position
 from data.board_config import BOARD_DATA, COLUMN_HEIGHTS, VALID_COLUMNS
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
+import sqlite3
+
+
+# 按钮/标签样式：控件只设置 role 属性，整个窗口共用一份样式表，只解析一次
+ROLE_STYLESHEET = """
+QPushButton[role="success"] { background-color: #4CAF50; color: white; }
+QPushButton[role="info"] { background-color: #2196F3; color: white; }
+QPushButton[role="danger"] { background-color: #f44336; color: white; }
+QPushButton[role="purple"] { background-color: #9C27B0; color: white; }
+QPushButton[role="warn"] { background-color: #FF9800; color: white; }
+QPushButton[role="primary"] { background-color: #E91E63; color: white; }
+QPushButton[role="muted"] { background-color: #607D8B; color: white; }
+QPushButton[role="gold"] { background-color: #FFD700; color: black; font-weight: bold; }
+QPushButton[role="warn-strong"] { background-color: #FF9800; color: white; font-weight: bold; }
+QPushButton[role="danger-strong"] { background-color: #ff4444; color: white; font-weight: bold; }
+QLabel[role="stat"] { font-weight: bold; color: #2196F3; }
+QLabel[role="contract"] { font-weight: bold; color: #E91E63; }
+QLabel[role="contract-none"] { font-weight: bold; color: #9E9E9E; }
+"""
+
+# 排行榜前三名奖牌
+RANK_MEDALS = ("🥇", "🥈", "🥉")
+
+# 按列号直接下标取列高（无效列为 0），代替逐个位置的 dict 查找
+_COLUMN_HEIGHT_TABLE = tuple(COLUMN_HEIGHTS.get(c, 0) for c in range(max(COLUMN_HEIGHTS) + 1))
+
+
+@lru_cache(maxsize=256)
+def _parse_lockout(lockout_until: str):
+    """解析锁定时间（按字符串缓存，未变化的锁定时间不重复解析），格式错误返回 None
+
+    带时区的时间转换为本地时间并去掉时区，以便与 datetime.now() 比较。
+    """
+    try:
+        lockout_time = datetime.fromisoformat(lockout_until)
+    except (TypeError, ValueError):
+        return None
+    if lockout_time.tzinfo is not None:
+        lockout_time = lockout_time.astimezone().replace(tzinfo=None)
+    return lockout_time
+
+
+# 确认框按钮组合
+_CONFIRM_BUTTONS = QMessageBox.Yes | QMessageBox.No
+
+# 成就下拉框选项 (显示名, 成就名, 成就类型)，成就名为空的是分组标题
+_ACHIEVEMENT_ITEMS = [
+    ("--- 首达成就 ---", "", ""),
+    ("OAS游戏王", "OAS游戏王", "first_clear"),
+    ("银闪闪", "银闪闪", "first_clear"),
+    ("吉祥三宝", "吉祥三宝", "first_clear"),
+    ("一步之遥", "一步之遥", "first_clear"),
+    ("鹤立oas群", "鹤立oas群", "first_clear"),
+    ("--- 隐藏成就 ---", "", ""),
+    ("领地意识", "领地意识", "hidden"),
+    ("出门没看黄历", "出门没看黄历", "hidden"),
+    ("看我一命通关！", "看我一命通关！", "hidden"),
+    ("收集癖", "收集癖", "hidden"),
+    ("一鸣惊人", "一鸣惊人", "hidden"),
+    ("六六大顺", "六六大顺", "hidden"),
+    ("自巡航", "自巡航", "hidden"),
+    ("雪中送炭", "雪中送炭", "hidden"),
+    ("平平淡淡才是真", "平平淡淡才是真", "hidden"),
+    ("善恶有报", "善恶有报", "hidden"),
+    ("天机算不尽", "天机算不尽", "hidden"),
+    ("主持人的猜忌", "主持人的猜忌", "hidden"),
+    ("--- 检定成就 ---", "", ""),
+    ("数学大王", "数学大王", "hidden"),
+    ("数学0蛋", "数学0蛋", "hidden"),
+    ("哭哭做题家", "哭哭做题家", "hidden"),
+    ("进去吧你！", "进去吧你！", "hidden"),
+    ("--- 对决成就 ---", "", ""),
+    ("狙神", "狙神", "hidden"),
+    ("尸体", "尸体", "hidden"),
+    ("虚晃一枪", "虚晃一枪", "hidden"),
+    ("--- 遭遇成就 ---", "", ""),
+    ("荒野大镖客", "荒野大镖客", "hidden"),
+    ("荒野大窝囊", "荒野大窝囊", "hidden"),
+    ("飙马野郎", "飙马野郎", "normal"),
+    ("--- 契约成就 ---", "", ""),
+    ("产品金婚", "产品金婚", "hidden"),
+    ("--- 陷阱成就 ---", "", ""),
+    ("悲伤的小画家", "悲伤的小画家", "hidden"),
+    ("switch", "switch", "hidden"),
+    ("时管大师", "时管大师", "hidden"),
+    ("讨厌您来", "讨厌您来", "hidden"),
+    ("万物皆可钓", "万物皆可钓", "hidden"),
+    ("厄运儿", "厄运儿", "hidden"),
+    ("--- 其他成就 ---", "", ""),
+    ("你，审核不通过。", "你，审核不通过。", "hidden"),
+]
 
 
 class BoardWidget(QWidget):
@@ -37,15 +138,37 @@ class BoardWidget(QWidget):
     # 信号：点击了某个玩家的棋子
     player_clicked = Signal(str)  # 发送qq_id
 
+    # 绘制用画刷/画笔，定义为类属性，重绘时直接复用
+    CELL_BRUSHES = {
+        "E": QBrush(QColor(173, 216, 230)),  # 浅蓝色 - 遭遇
+        "I": QBrush(QColor(144, 238, 144)),  # 浅绿色 - 道具
+        "T": QBrush(QColor(255, 182, 193)),  # 浅红色 - 陷阱
+    }
+    EMPTY_CELL_BRUSH = QBrush(Qt.white)
+    PERM_BRUSH = QBrush(QColor(30, 144, 255))
+    PERM_PEN = QPen(QColor(0, 0, 139), 1)
+    TEMP_BRUSH = QBrush(QColor(255, 140, 0))
+    TEMP_PEN = QPen(QColor(200, 100, 0), 1)
+    # gem_type -> (画刷, 画笔, 是否宝石形状)
+    GEM_STYLES = {
+        'red_gem': (QBrush(QColor(255, 0, 0)), QPen(QColor(139, 0, 0), 2), True),
+        'blue_gem': (QBrush(QColor(0, 100, 255)), QPen(QColor(0, 0, 139), 2), True),
+        'red_pool': (QBrush(QColor(255, 100, 100, 180)), QPen(QColor(139, 0, 0), 1), False),
+        'blue_pool': (QBrush(QColor(100, 100, 255, 180)), QPen(QColor(0, 0, 139), 1), False),
+    }
+    HINT_PEN = QPen(QColor(100, 100, 100))
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(1200, 600)
         self.setMouseTracking(True)  # 启用鼠标追踪
 
         self.players_positions = {}  # {qq_id: [(column, position, marker_type), ...]}
+        self._markers_by_cell = {}  # {(column, position): [(qq_id, marker_type), ...]}，绘制/悬浮时按格子直接查找
         self.player_info = {}  # {qq_id: {'nickname': ..., 'faction': ...}}
         self.cell_contents = {}  # 从BOARD_DATA加载
         self.gem_pools = []  # 宝石池沼列表
+        self._gems_by_cell = {}  # {(column, position): [gem, ...]}
 
         # 绘制参数
         self.cell_width = 65
@@ -66,8 +189,13 @@ class BoardWidget(QWidget):
                 self.cell_contents[(column, position)] = (cell_type, name)
 
     def update_positions(self, positions_dict: dict):
-        """更新玩家位置"""
+        """更新玩家位置，并按格子建立索引"""
         self.players_positions = positions_dict
+        markers_by_cell = {}
+        for qq_id, positions in positions_dict.items():
+            for col, pos, marker_type in positions:
+                markers_by_cell.setdefault((col, pos), []).append((qq_id, marker_type))
+        self._markers_by_cell = markers_by_cell
         self.update()
 
     def update_player_info(self, player_info: dict):
@@ -75,8 +203,12 @@ class BoardWidget(QWidget):
         self.player_info = player_info
 
     def update_gem_pools(self, gem_pools: list):
-        """更新宝石池沼位置"""
+        """更新宝石池沼位置，并按格子建立索引"""
         self.gem_pools = gem_pools
+        gems_by_cell = {}
+        for gem in gem_pools:
+            gems_by_cell.setdefault((gem.get('column_number'), gem.get('position')), []).append(gem)
+        self._gems_by_cell = gems_by_cell
         self.update()
 
     def _get_cell_rect(self, column: int, position: int) -> QRect:
@@ -88,16 +220,14 @@ class BoardWidget(QWidget):
     def _get_players_at_position(self, column: int, position: int) -> list:
         """获取指定位置的所有玩家"""
         players = []
-        for qq_id, positions in self.players_positions.items():
-            for col, pos, marker_type in positions:
-                if col == column and pos == position:
-                    info = self.player_info.get(qq_id, {})
-                    players.append({
-                        'qq_id': qq_id,
-                        'nickname': info.get('nickname', qq_id),
-                        'faction': info.get('faction', '未知'),
-                        'marker_type': marker_type
-                    })
+        for qq_id, marker_type in self._markers_by_cell.get((column, position), ()):
+            info = self.player_info.get(qq_id, {})
+            players.append({
+                'qq_id': qq_id,
+                'nickname': info.get('nickname', qq_id),
+                'faction': info.get('faction', '未知'),
+                'marker_type': marker_type
+            })
         return players
 
     def mouseMoveEvent(self, event):
@@ -162,14 +292,7 @@ class BoardWidget(QWidget):
 
                 # 根据内容类型设置颜色
                 cell_type, cell_name = self.cell_contents.get((col_num, pos), (None, ""))
-                if cell_type == "E":
-                    painter.setBrush(QBrush(QColor(173, 216, 230)))  # 浅蓝色 - 遭遇
-                elif cell_type == "I":
-                    painter.setBrush(QBrush(QColor(144, 238, 144)))  # 浅绿色 - 道具
-                elif cell_type == "T":
-                    painter.setBrush(QBrush(QColor(255, 182, 193)))  # 浅红色 - 陷阱
-                else:
-                    painter.setBrush(QBrush(Qt.white))
+                painter.setBrush(self.CELL_BRUSHES.get(cell_type, self.EMPTY_CELL_BRUSH))
 
                 painter.drawRect(x, y, self.cell_width, self.cell_height)
 
@@ -192,15 +315,13 @@ class BoardWidget(QWidget):
         temp_players = []
         perm_players = []
 
-        for qq_id, positions in self.players_positions.items():
-            for col, pos, marker_type in positions:
-                if col == column and pos == position:
-                    info = self.player_info.get(qq_id, {})
-                    player_data = {'qq_id': qq_id, 'nickname': info.get('nickname', qq_id[:4])}
-                    if marker_type == 'temp':
-                        temp_players.append(player_data)
-                    else:
-                        perm_players.append(player_data)
+        for qq_id, marker_type in self._markers_by_cell.get((column, position), ()):
+            info = self.player_info.get(qq_id, {})
+            player_data = {'qq_id': qq_id, 'nickname': info.get('nickname', qq_id[:4])}
+            if marker_type == 'temp':
+                temp_players.append(player_data)
+            else:
+                perm_players.append(player_data)
 
         marker_size = 14
 
@@ -211,8 +332,8 @@ class BoardWidget(QWidget):
                 offset_y = y + height - marker_size - 2
 
                 # 绘制蓝色圆形
-                painter.setBrush(QBrush(QColor(30, 144, 255)))
-                painter.setPen(QPen(QColor(0, 0, 139), 1))
+                painter.setBrush(self.PERM_BRUSH)
+                painter.setPen(self.PERM_PEN)
                 painter.drawEllipse(offset_x, offset_y, marker_size, marker_size)
 
                 # 显示昵称首字
@@ -228,8 +349,8 @@ class BoardWidget(QWidget):
                 offset_y = y + 2
 
                 # 绘制橙色方形
-                painter.setBrush(QBrush(QColor(255, 140, 0)))
-                painter.setPen(QPen(QColor(200, 100, 0), 1))
+                painter.setBrush(self.TEMP_BRUSH)
+                painter.setPen(self.TEMP_PEN)
                 painter.drawRect(offset_x, offset_y, marker_size, marker_size)
 
                 # 显示昵称首字
@@ -240,33 +361,25 @@ class BoardWidget(QWidget):
 
     def _draw_gems(self, painter, column, position, x, y, width, height):
         """绘制宝石和池沼"""
-        gems_at_pos = [g for g in self.gem_pools
-                      if g.get('column_number') == column and g.get('position') == position]
+        gems_at_pos = self._gems_by_cell.get((column, position))
 
         if not gems_at_pos:
             return
 
         gem_size = 10
         for i, gem in enumerate(gems_at_pos[:2]):
-            gem_type = gem.get('gem_type', '')
+            style = self.GEM_STYLES.get(gem.get('gem_type', ''))
+            if style is None:
+                continue
+            brush, pen, is_gem = style
             offset_x = x + 2 + i * (gem_size + 2)
             offset_y = y + height // 2 - gem_size // 2
 
-            if gem_type == 'red_gem':
-                painter.setBrush(QBrush(QColor(255, 0, 0)))
-                painter.setPen(QPen(QColor(139, 0, 0), 2))
+            painter.setBrush(brush)
+            painter.setPen(pen)
+            if is_gem:
                 self._draw_diamond(painter, offset_x, offset_y, gem_size)
-            elif gem_type == 'blue_gem':
-                painter.setBrush(QBrush(QColor(0, 100, 255)))
-                painter.setPen(QPen(QColor(0, 0, 139), 2))
-                self._draw_diamond(painter, offset_x, offset_y, gem_size)
-            elif gem_type == 'red_pool':
-                painter.setBrush(QBrush(QColor(255, 100, 100, 180)))
-                painter.setPen(QPen(QColor(139, 0, 0), 1))
-                painter.drawEllipse(offset_x, offset_y, gem_size, gem_size)
-            elif gem_type == 'blue_pool':
-                painter.setBrush(QBrush(QColor(100, 100, 255, 180)))
-                painter.setPen(QPen(QColor(0, 0, 139), 1))
+            else:
                 painter.drawEllipse(offset_x, offset_y, gem_size, gem_size)
 
     def _draw_diamond(self, painter, x, y, size):
@@ -291,14 +404,10 @@ class BoardWidget(QWidget):
         painter.drawText(legend_x, legend_y, "【图例】")
 
         # 内容类型
-        items = [
-            (QColor(173, 216, 230), "遭遇", 25),
-            (QColor(144, 238, 144), "道具", 45),
-            (QColor(255, 182, 193), "陷阱", 65),
-        ]
+        items = [("E", "遭遇", 25), ("I", "道具", 45), ("T", "陷阱", 65)]
 
-        for color, text, offset in items:
-            painter.setBrush(QBrush(color))
+        for cell_type, text, offset in items:
+            painter.setBrush(self.CELL_BRUSHES[cell_type])
             painter.setPen(QPen(Qt.black, 1))
             painter.drawRect(legend_x, legend_y + offset, 18, 14)
             painter.drawText(legend_x + 22, legend_y + offset + 12, text)
@@ -306,53 +415,265 @@ class BoardWidget(QWidget):
         # 标记类型
         painter.drawText(legend_x, legend_y + 100, "【标记】")
 
-        painter.setBrush(QBrush(QColor(255, 140, 0)))
+        painter.setBrush(self.TEMP_BRUSH)
         painter.drawRect(legend_x, legend_y + 115, 14, 14)
         painter.drawText(legend_x + 18, legend_y + 127, "临时")
 
-        painter.setBrush(QBrush(QColor(30, 144, 255)))
+        painter.setBrush(self.PERM_BRUSH)
         painter.drawEllipse(legend_x, legend_y + 135, 14, 14)
         painter.drawText(legend_x + 18, legend_y + 147, "永久")
 
         # 宝石池沼
         painter.drawText(legend_x, legend_y + 175, "【宝石/池沼】")
 
-        painter.setBrush(QBrush(QColor(255, 0, 0)))
+        painter.setBrush(self.GEM_STYLES['red_gem'][0])
         self._draw_diamond(painter, legend_x, legend_y + 190, 12)
         painter.drawText(legend_x + 16, legend_y + 200, "红宝石")
 
-        painter.setBrush(QBrush(QColor(0, 100, 255)))
+        painter.setBrush(self.GEM_STYLES['blue_gem'][0])
         self._draw_diamond(painter, legend_x, legend_y + 210, 12)
         painter.drawText(legend_x + 16, legend_y + 220, "蓝宝石")
 
-        painter.setBrush(QBrush(QColor(255, 100, 100, 180)))
+        painter.setBrush(self.GEM_STYLES['red_pool'][0])
         painter.drawEllipse(legend_x, legend_y + 230, 12, 12)
         painter.drawText(legend_x + 16, legend_y + 240, "红池沼")
 
-        painter.setBrush(QBrush(QColor(100, 100, 255, 180)))
+        painter.setBrush(self.GEM_STYLES['blue_pool'][0])
         painter.drawEllipse(legend_x, legend_y + 250, 12, 12)
         painter.drawText(legend_x + 16, legend_y + 260, "蓝池沼")
 
         # 操作提示
-        painter.setPen(QPen(QColor(100, 100, 100)))
+        painter.setPen(self.HINT_PEN)
         painter.setFont(QFont("Microsoft YaHei", 8))
         painter.drawText(legend_x, legend_y + 290, "💡 悬浮棋子查看玩家")
         painter.drawText(legend_x, legend_y + 305, "💡 点击棋子跳转管理")
 
 
+class TextTableModel(QAbstractTableModel):
+    """只读文本表格模型，每行是一个显示文本元组，子类定义 HEADERS"""
+
+    HEADERS = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows: list):
+        """替换全部行，行数不变的部分只对有变化的行发出 dataChanged 以保留当前选中"""
+        old_rows = self._rows
+        old_count = len(old_rows)
+        new_count = len(rows)
+
+        if new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._rows = rows
+            self.endInsertRows()
+        elif new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self._rows = rows
+            self.endRemoveRows()
+        else:
+            self._rows = rows
+
+        # 只通知内容变化的行范围，数据未变时视图不重绘、代理模型不重新筛选
+        changed = [i for i in range(min(old_count, new_count)) if old_rows[i] != rows[i]]
+        if changed:
+            self.dataChanged.emit(
+                self.index(changed[0], 0), self.index(changed[-1], len(self.HEADERS) - 1)
+            )
+
+
+class PlayerTableModel(TextTableModel):
+    """玩家列表数据模型（配合 QSortFilterProxyModel 进行筛选）
+
+    行: (qq_id, nickname, faction, current, total, topped, status)
+    """
+
+    HEADERS = ["QQ号", "昵称", "阵营", "当前积分", "总积分", "登顶列数", "状态"]
+    STATUS_COLUMN = 6
+    LOCKED_COLOR = QColor(244, 67, 54)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if (role == Qt.ForegroundRole and index.isValid()
+                and index.column() == self.STATUS_COLUMN
+                and self._rows[index.row()][self.STATUS_COLUMN].startswith("🔒")):
+            return self.LOCKED_COLOR
+        return super().data(index, role)
+
+
+class ShopTableModel(TextTableModel):
+    """商店道具表格数据模型"""
+
+    HEADERS = ["ID", "名称", "类型", "价格", "阵营", "全局限制", "已售", "已解锁"]
+
+
+@dataclass
+class RefreshSnapshot:
+    """一次刷新周期内共享的数据，避免各刷新函数重复查询"""
+    players: List[sqlite3.Row]  # PlayerDAO.get_all_player_rows 的只读行
+    positions_by_player: Dict[str, List[Position]]  # 所有类型的标记
+    lockouts_by_player: Dict[str, str]  # 仅包含设置了锁定时间的玩家
+    topped_by_player: Dict[str, int]  # 已登顶列数
+
+
+class StatsFetcherSignals(QObject):
+    """统计查询结果信号（QRunnable 不是 QObject，需单独承载信号）"""
+    finished = Signal(dict)
+    failed = Signal(str)
+
+
+class StatsFetcher(QRunnable):
+    """在线程池中执行游戏统计查询，避免聚合查询阻塞界面"""
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self.signals = StatsFetcherSignals()
+
+    def run(self):
+        # 工作线程使用独立连接，不与界面线程共享连接
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(total_score), 0) FROM players")
+            total_players, total_score = cursor.fetchone()
+
+            cursor.execute("""
+                SELECT COUNT(*) FROM game_state g
+                JOIN players p ON p.qq_id = g.qq_id
+                WHERE g.current_round_active = 1
+            """)
+            active_count = cursor.fetchone()[0]
+
+            # 已登顶：永久标记到达列顶的列数 >= 3
+            topped_count = len(PositionDAO(conn).get_topped_counts(COLUMN_HEIGHTS, min_topped=3))
+
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM player_inventory),
+                       (SELECT COUNT(*) FROM player_achievements)
+            """)
+            item_count, ach_count = cursor.fetchone()
+
+            cursor.execute("""
+                SELECT nickname, current_score FROM players
+                ORDER BY current_score DESC LIMIT 10
+            """)
+            ranking = [tuple(row) for row in cursor.fetchall()]
+        except Exception as e:
+            # 查询失败（如数据库被锁）也要通知界面线程，否则之后不会再发起统计查询
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            conn.close()
+
+        self.signals.finished.emit({
+            "stats": {
+                "总玩家数": total_players,
+                "进行中玩家": active_count,
+                "已登顶玩家": topped_count,
+                "总积分发放": total_score,
+                "道具总数": item_count,
+                "成就总数": ach_count,
+            },
+            "ranking": ranking,
+        })
+
+
+class DbOpWorker(QObject):
+    """在后台线程中执行耗时的数据库操作（备份、清盘、重置等）
+
+    op(conn, report_progress) 在工作线程中以独立连接执行，report_progress(0-100) 可选调用。
+    """
+    progress = Signal(int)
+    finished = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, db_path: str, op, message: str):
+        super().__init__()
+        self.db_path = db_path
+        self.op = op
+        self.message = message
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            self.op(conn, self.progress.emit)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            conn.close()
+        self.finished.emit(self.message)
+
+
 class GMWindow(QMainWindow):
     """GM管理主窗口"""
 
+    # 常用写操作 SQL（固定文本，便于 sqlite3 语句缓存复用）
+    _SQL_SET_CURRENT_SCORE = "UPDATE players SET current_score = ? WHERE qq_id = ?"
+    _SQL_SET_TOTAL_SCORE = "UPDATE players SET total_score = ? WHERE qq_id = ?"
+    _SQL_SET_BOTH_SCORES = "UPDATE players SET current_score = ?, total_score = ? WHERE qq_id = ?"
+    _SQL_ADD_CURRENT_SCORE = "UPDATE players SET current_score = current_score + ? WHERE qq_id = ?"
+    _SQL_ADD_TOTAL_SCORE = "UPDATE players SET total_score = total_score + ? WHERE qq_id = ?"
+    _SQL_ADD_BOTH_SCORES = (
+        "UPDATE players SET current_score = current_score + ?, total_score = total_score + ? WHERE qq_id = ?"
+    )
+    _SQL_CLEAR_MARKERS = "DELETE FROM player_positions WHERE qq_id = ?"
+    _SQL_ADD_MARKER = (
+        "INSERT OR REPLACE INTO player_positions (qq_id, column_number, position, marker_type) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    _SQL_ADD_GEM = "INSERT INTO gem_pools (owner_qq, gem_type, column_number, position) VALUES (?, ?, ?, ?)"
+    _SQL_REMOVE_MARKER = (
+        "DELETE FROM player_positions WHERE qq_id = ? AND column_number = ? AND marker_type = ?"
+    )
+    _SQL_FIRST_ACHIEVEMENTS = (
+        "SELECT f.column_number, f.first_qq_id, p.nickname FROM first_achievements f "
+        "LEFT JOIN players p ON f.first_qq_id = p.qq_id ORDER BY f.column_number"
+    )
+
+    # 自动刷新每隔多少次（每次 2 秒）刷新全部选项卡
+    FULL_REFRESH_TICKS = 15
+
     def __init__(self, db_path: str = "data/game.db"):
         super().__init__()
         self.setWindowTitle("贪骰无厌 2.0 - GM管理界面")
         self.setGeometry(50, 50, 1500, 900)
+        self.setStyleSheet(ROLE_STYLESHEET)
 
         # 保存数据库路径
         self.db_path = db_path
 
         # 初始化数据库
         self.db_conn = init_database(db_path)
+        self._cursor = self.db_conn.cursor()  # 界面线程读写共用的游标
+        self._game_engine = None  # 游戏引擎实例，首次使用时创建
+        self._nickname_cache = {}  # {qq_id: 昵称}，refresh_players 时整体更新
+
+        # 批量写入模式：连续添加标记/宝石时先缓存，停止操作200ms后合并为一个事务提交
+        self._pending_writes = []  # [(sql, params, 日志), ...]
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(200)
+        self._write_timer.timeout.connect(self._flush_writes)
         self.player_dao = PlayerDAO(self.db_conn)
         self.position_dao = PositionDAO(self.db_conn)
         self.shop_dao = ShopDAO(self.db_conn)
@@ -363,18 +684,54 @@ class GMWindow(QMainWindow):
         self.contract_dao = ContractDAO(self.db_conn)
         self.custom_cmd_dao = CustomCommandDAO(self.db_conn)
 
+        # 口令列表缓存（None 表示需要从数据库重新加载）
+        self._commands_cache = None
+        # 口令表格每行上次显示的内容 {command_id: 显示文本元组}，未变化的行跳过重绘
+        self._cmd_row_cache = {}
+
         # 当前选中的玩家
         self.selected_qq_id = None
 
         # Tab组件引用
         self.tabs = None
 
+        # 待合并执行的刷新项，同一事件循环内的多次刷新只执行一次
+        self._pending_refresh = set()
+
+        # 延迟创建的选项卡中被刷新/日志函数引用的控件，创建前为 None
+        self.gem_list_display = None
+        self.first_achievement_display = None
+        self.shop_table = None
+        self.stats_labels = None
+        self.rank_list = None
+        self.log_display = None
+        self._pending_logs = []  # 系统管理选项卡创建前产生的日志
+        # 玩家管理选项卡中的道具/成就下拉框在首次切换到该选项卡时才填充
+        self._item_combo_inited = False
+        self._achievement_combo_inited = False
+        self._stats_fetching = False  # 统计查询是否正在后台执行
+        self._map_filter_entries = []  # 地图玩家筛选下拉框当前的 (qq_id, nickname) 列表
+
+        # 后台数据库操作（同一时间只执行一个）
+        self._db_op_thread = None
+        self._db_op_worker = None
+        self._db_op_dialog = None
+        self._db_op_done = None
+
+        # 玩家搜索防抖：连续输入只在停止150ms后筛选一次
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._filter_players)
+
         # 初始化UI
         self._init_ui()
 
-        # 定时刷新
+        # 定时刷新：每次只刷新当前可见的选项卡，每 FULL_REFRESH_TICKS 次做一次全量刷新
+        self._refresh_ticks = 0
+        self._last_db_generation = None  # 上次自动刷新时的数据库版本，未变化时跳过刷新
         self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_all)
+        self.refresh_timer.timeout.connect(self._auto_refresh)
         self.refresh_timer.start(2000)
 
     def _init_ui(self):
@@ -395,27 +752,62 @@ class GMWindow(QMainWindow):
         self.players_tab = self._create_players_tab()
         self.tabs.addTab(self.players_tab, "👥 玩家管理")
 
-        # 全局控制选项卡
-        self.control_tab = self._create_control_tab()
-        self.tabs.addTab(self.control_tab, "🌍 全局控制")
-
-        # 商店管理选项卡
-        self.shop_tab = self._create_shop_tab()
-        self.tabs.addTab(self.shop_tab, "🛒 商店管理")
-
-        # 口令管理选项卡
-        self.command_tab = self._create_command_tab()
-        self.tabs.addTab(self.command_tab, "📣 口令管理")
+        # 其余选项卡先放占位控件，首次切换到时再创建
+        # {index: (属性名, 创建函数, 创建后的刷新函数)}
+        self._lazy_tabs = {}
+        for attr, title, builder, refresher in [
+            ("control_tab", "🌍 全局控制", self._create_control_tab, self._refresh_control_tab),
+            ("shop_tab", "🛒 商店管理", self._create_shop_tab, self.refresh_shop),
+            ("command_tab", "📣 口令管理", self._create_command_tab, None),  # 创建时已加载口令
+            ("system_tab", "⚙️ 系统管理", self._create_system_tab, self.refresh_stats),
+        ]:
+            setattr(self, attr, None)
+            index = self.tabs.addTab(QWidget(), title)
+            self._lazy_tabs[index] = (attr, builder, refresher)
 
-        # 系统管理选项卡
-        self.system_tab = self._create_system_tab()
-        self.tabs.addTab(self.system_tab, "⚙️ 系统管理")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         main_layout.addWidget(self.tabs)
 
         # 刷新数据
         self.refresh_all()
 
+    def _on_tab_changed(self, index: int):
+        """切换选项卡时创建尚未构建的选项卡，已构建的选项卡立即刷新"""
+        if self.tabs.widget(index) is self.players_tab:
+            self._ensure_player_combos()
+
+        lazy = self._lazy_tabs.pop(index, None)
+        if lazy is None:
+            # 隐藏期间自动刷新会跳过该选项卡，切换回来时补一次
+            self._refresh_visible_tab()
+            return
+
+        attr, builder, refresher = lazy
+        widget = builder()
+        setattr(self, attr, widget)
+
+        title = self.tabs.tabText(index)
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, title)
+            self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+
+        if refresher:
+            refresher()
+
+    def _ensure_player_combos(self):
+        """首次进入玩家管理选项卡时填充道具和成就下拉框"""
+        if not self._item_combo_inited:
+            self._init_item_combo()
+            self._item_combo_inited = True
+        if not self._achievement_combo_inited:
+            self._init_achievement_combo()
+            self._achievement_combo_inited = True
+
     def _create_map_tab(self) -> QWidget:
         """创建地图视图选项卡"""
         widget = QWidget()
@@ -457,8 +849,8 @@ class GMWindow(QMainWindow):
         self.tabs.setCurrentIndex(1)  # 切换到玩家管理tab
 
         # 在玩家列表中选中该玩家
-        for i in range(self.players_table.rowCount()):
-            if self.players_table.item(i, 0).text() == qq_id:
+        for i in range(self.player_proxy.rowCount()):
+            if self.player_proxy.index(i, 0).data() == qq_id:
                 self.players_table.selectRow(i)
                 break
 
@@ -478,7 +870,7 @@ class GMWindow(QMainWindow):
         search_layout.addWidget(QLabel("搜索:"))
         self.player_search = QLineEdit()
         self.player_search.setPlaceholderText("输入QQ号或昵称...")
-        self.player_search.textChanged.connect(self._filter_players)
+        self.player_search.textChanged.connect(lambda _: self._filter_timer.start())
         search_layout.addWidget(self.player_search)
         left_layout.addLayout(search_layout)
 
@@ -510,17 +902,17 @@ class GMWindow(QMainWindow):
         register_btn_layout = QHBoxLayout()
         register_btn = QPushButton("注册玩家")
         register_btn.clicked.connect(self._register_player)
-        register_btn.setStyleSheet("background-color: #4CAF50; color: white;")
+        register_btn.setProperty("role", "success")
         register_btn_layout.addWidget(register_btn)
 
         import_csv_btn = QPushButton("导入CSV")
         import_csv_btn.clicked.connect(self._import_players_csv)
-        import_csv_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        import_csv_btn.setProperty("role", "info")
         register_btn_layout.addWidget(import_csv_btn)
 
         delete_btn = QPushButton("删除玩家")
         delete_btn.clicked.connect(self._delete_player)
-        delete_btn.setStyleSheet("background-color: #f44336; color: white;")
+        delete_btn.setProperty("role", "danger")
         register_btn_layout.addWidget(delete_btn)
 
         register_layout.addLayout(register_btn_layout, 4, 0, 1, 2)
@@ -528,15 +920,18 @@ class GMWindow(QMainWindow):
         register_group.setLayout(register_layout)
         left_layout.addWidget(register_group)
 
-        # 玩家列表
-        self.players_table = QTableWidget()
-        self.players_table.setColumnCount(7)
-        self.players_table.setHorizontalHeaderLabels(
-            ["QQ号", "昵称", "阵营", "当前积分", "总积分", "登顶列数", "状态"]
-        )
+        # 玩家列表（模型 + 筛选代理）
+        self.player_model = PlayerTableModel(self)
+        self.player_proxy = QSortFilterProxyModel(self)
+        self.player_proxy.setSourceModel(self.player_model)
+        self.player_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.player_proxy.setFilterKeyColumn(-1)
+
+        self.players_table = QTableView()
+        self.players_table.setModel(self.player_proxy)
         self.players_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.players_table.itemSelectionChanged.connect(self._on_player_selected)
-        self.players_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.players_table.selectionModel().selectionChanged.connect(self._on_player_selected)
+        self.players_table.setSelectionBehavior(QTableView.SelectRows)
 
         left_layout.addWidget(self.players_table)
 
@@ -554,7 +949,7 @@ class GMWindow(QMainWindow):
         progress_group = QGroupBox("📊 玩家进度")
         progress_layout = QVBoxLayout()
 
-        self.progress_display = QTextEdit()
+        self.progress_display = QPlainTextEdit()
         self.progress_display.setReadOnly(True)
         self.progress_display.setMaximumHeight(150)
         progress_layout.addWidget(self.progress_display)
@@ -566,7 +961,7 @@ class GMWindow(QMainWindow):
         detail_group = QGroupBox("📋 详细信息")
         detail_layout = QVBoxLayout()
 
-        self.player_detail = QTextEdit()
+        self.player_detail = QPlainTextEdit()
         self.player_detail.setReadOnly(True)
         self.player_detail.setMaximumHeight(200)
         detail_layout.addWidget(self.player_detail)
@@ -585,7 +980,7 @@ class GMWindow(QMainWindow):
 
         modify_faction_btn = QPushButton("修改阵营")
         modify_faction_btn.clicked.connect(self._modify_faction)
-        modify_faction_btn.setStyleSheet("background-color: #9C27B0; color: white;")
+        modify_faction_btn.setProperty("role", "purple")
         faction_layout.addWidget(modify_faction_btn)
 
         faction_group.setLayout(faction_layout)
@@ -606,14 +1001,14 @@ class GMWindow(QMainWindow):
         score_layout.addWidget(self.score_type_combo, 1, 1)
 
         btn_row = QHBoxLayout()
-        for text, color, func in [
-            ("增加", "#4CAF50", self._add_score),
-            ("设置", "#2196F3", self._set_score),
-            ("重置", "#f44336", self._reset_score)
+        for text, role, func in [
+            ("增加", "success", self._add_score),
+            ("设置", "info", self._set_score),
+            ("重置", "danger", self._reset_score)
         ]:
             btn = QPushButton(text)
             btn.clicked.connect(func)
-            btn.setStyleSheet(f"background-color: {color}; color: white;")
+            btn.setProperty("role", role)
             btn_row.addWidget(btn)
         score_layout.addLayout(btn_row, 2, 0, 1, 2)
 
@@ -623,7 +1018,7 @@ class GMWindow(QMainWindow):
             btn_text = f"+{amount}" if amount > 0 else str(amount)
             btn = QPushButton(btn_text)
             btn.clicked.connect(lambda checked, a=amount: self._quick_add_score(a))
-            btn.setStyleSheet(f"background-color: {'#4CAF50' if amount > 0 else '#FF9800'}; color: white;")
+            btn.setProperty("role", "success" if amount > 0 else "warn")
             quick_btns.addWidget(btn)
         score_layout.addLayout(quick_btns, 3, 0, 1, 2)
 
@@ -637,7 +1032,6 @@ class GMWindow(QMainWindow):
         item_layout.addWidget(QLabel("道具:"), 0, 0)
         self.item_combo = QComboBox()
         self.item_combo.setMinimumWidth(200)
-        self._init_item_combo()
         item_layout.addWidget(self.item_combo, 0, 1)
 
         item_layout.addWidget(QLabel("自定义:"), 1, 0)
@@ -659,12 +1053,12 @@ class GMWindow(QMainWindow):
         item_btn_layout = QHBoxLayout()
         give_item_btn = QPushButton("派发道具")
         give_item_btn.clicked.connect(self._give_item)
-        give_item_btn.setStyleSheet("background-color: #9C27B0; color: white;")
+        give_item_btn.setProperty("role", "purple")
         item_btn_layout.addWidget(give_item_btn)
 
         remove_item_btn = QPushButton("删除道具")
         remove_item_btn.clicked.connect(self._remove_item)
-        remove_item_btn.setStyleSheet("background-color: #f44336; color: white;")
+        remove_item_btn.setProperty("role", "danger")
         item_btn_layout.addWidget(remove_item_btn)
 
         item_layout.addLayout(item_btn_layout, 4, 0, 1, 2)
@@ -679,7 +1073,6 @@ class GMWindow(QMainWindow):
         achievement_layout.addWidget(QLabel("成就:"), 0, 0)
         self.achievement_combo = QComboBox()
         self.achievement_combo.setMinimumWidth(200)
-        self._init_achievement_combo()
         achievement_layout.addWidget(self.achievement_combo, 0, 1)
 
         achievement_layout.addWidget(QLabel("自定义:"), 1, 0)
@@ -690,12 +1083,12 @@ class GMWindow(QMainWindow):
         achievement_btn_layout = QHBoxLayout()
         give_achievement_btn = QPushButton("派发成就")
         give_achievement_btn.clicked.connect(self._give_achievement)
-        give_achievement_btn.setStyleSheet("background-color: #FF9800; color: white;")
+        give_achievement_btn.setProperty("role", "warn")
         achievement_btn_layout.addWidget(give_achievement_btn)
 
         remove_achievement_btn = QPushButton("删除成就")
         remove_achievement_btn.clicked.connect(self._remove_achievement)
-        remove_achievement_btn.setStyleSheet("background-color: #f44336; color: white;")
+        remove_achievement_btn.setProperty("role", "danger")
         achievement_btn_layout.addWidget(remove_achievement_btn)
 
         achievement_layout.addLayout(achievement_btn_layout, 2, 0, 1, 2)
@@ -730,12 +1123,12 @@ class GMWindow(QMainWindow):
 
         self.clear_temp_markers_btn = QPushButton("清除临时标记")
         self.clear_temp_markers_btn.clicked.connect(self._clear_temp_markers)
-        self.clear_temp_markers_btn.setStyleSheet("background-color: #f44336; color: white;")
+        self.clear_temp_markers_btn.setProperty("role", "danger")
         round_layout.addWidget(self.clear_temp_markers_btn, 1, 0)
 
         self.clear_all_markers_btn = QPushButton("清除所有标记")
         self.clear_all_markers_btn.clicked.connect(self._clear_all_markers)
-        self.clear_all_markers_btn.setStyleSheet("background-color: #f44336; color: white;")
+        self.clear_all_markers_btn.setProperty("role", "danger")
         round_layout.addWidget(self.clear_all_markers_btn, 1, 1)
 
         round_group.setLayout(round_layout)
@@ -764,14 +1157,19 @@ class GMWindow(QMainWindow):
 
         add_marker_btn = QPushButton("添加标记")
         add_marker_btn.clicked.connect(self._add_marker)
-        add_marker_btn.setStyleSheet("background-color: #4CAF50; color: white;")
+        add_marker_btn.setProperty("role", "success")
         position_layout.addWidget(add_marker_btn, 3, 0)
 
         remove_marker_btn = QPushButton("移除标记")
         remove_marker_btn.clicked.connect(self._remove_marker)
-        remove_marker_btn.setStyleSheet("background-color: #f44336; color: white;")
+        remove_marker_btn.setProperty("role", "danger")
         position_layout.addWidget(remove_marker_btn, 3, 1)
 
+        self.batch_write_check = QCheckBox("批量写入（连续添加标记/宝石时合并提交）")
+        # 关闭批量模式时立即提交已缓存的写操作
+        self.batch_write_check.toggled.connect(lambda checked: None if checked else self._flush_writes())
+        position_layout.addWidget(self.batch_write_check, 4, 0, 1, 2)
+
         position_group.setLayout(position_layout)
         right_scroll_layout.addWidget(position_group)
 
@@ -787,7 +1185,7 @@ class GMWindow(QMainWindow):
 
         direct_top_btn = QPushButton("🎖️ 直接登顶")
         direct_top_btn.clicked.connect(self._direct_top_column)
-        direct_top_btn.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold;")
+        direct_top_btn.setProperty("role", "gold")
         badge_layout.addWidget(direct_top_btn, 1, 0, 1, 2)
 
         badge_info = QLabel("⚠️ 该操作会触发首达检查和12小时禁止")
@@ -837,7 +1235,7 @@ class GMWindow(QMainWindow):
         # 当前契约显示
         contract_layout.addWidget(QLabel("当前契约:"), 0, 0)
         self.contract_display = QLabel("无")
-        self.contract_display.setStyleSheet("font-weight: bold; color: #E91E63;")
+        self.contract_display.setProperty("role", "contract")
         contract_layout.addWidget(self.contract_display, 0, 1)
 
         # 设置契约对象
@@ -848,12 +1246,12 @@ class GMWindow(QMainWindow):
 
         set_contract_btn = QPushButton("💍 建立契约")
         set_contract_btn.clicked.connect(self._set_contract)
-        set_contract_btn.setStyleSheet("background-color: #E91E63; color: white;")
+        set_contract_btn.setProperty("role", "primary")
         contract_layout.addWidget(set_contract_btn, 2, 0)
 
         remove_contract_btn = QPushButton("💔 解除契约")
         remove_contract_btn.clicked.connect(self._remove_contract)
-        remove_contract_btn.setStyleSheet("background-color: #607D8B; color: white;")
+        remove_contract_btn.setProperty("role", "muted")
         contract_layout.addWidget(remove_contract_btn, 2, 1)
 
         contract_group.setLayout(contract_layout)
@@ -863,7 +1261,7 @@ class GMWindow(QMainWindow):
         status_group = QGroupBox("📊 当前状态")
         status_layout = QVBoxLayout()
 
-        self.control_status_display = QTextEdit()
+        self.control_status_display = QPlainTextEdit()
         self.control_status_display.setReadOnly(True)
         self.control_status_display.setMaximumHeight(150)
         status_layout.addWidget(self.control_status_display)
@@ -919,12 +1317,12 @@ class GMWindow(QMainWindow):
 
         add_gem_btn = QPushButton("添加宝石/池沼")
         add_gem_btn.clicked.connect(self._add_gem)
-        add_gem_btn.setStyleSheet("background-color: #E91E63; color: white;")
+        add_gem_btn.setProperty("role", "primary")
         gem_layout.addWidget(add_gem_btn, 3, 0, 1, 2)
 
         clear_gems_btn = QPushButton("清除所有宝石/池沼")
         clear_gems_btn.clicked.connect(self._clear_all_gems)
-        clear_gems_btn.setStyleSheet("background-color: #607D8B; color: white;")
+        clear_gems_btn.setProperty("role", "muted")
         gem_layout.addWidget(clear_gems_btn, 4, 0, 1, 2)
 
         gem_group.setLayout(gem_layout)
@@ -934,7 +1332,7 @@ class GMWindow(QMainWindow):
         gem_list_group = QGroupBox("📋 当前宝石/池沼")
         gem_list_layout = QVBoxLayout()
 
-        self.gem_list_display = QTextEdit()
+        self.gem_list_display = QPlainTextEdit()
         self.gem_list_display.setReadOnly(True)
         gem_list_layout.addWidget(self.gem_list_display)
 
@@ -964,7 +1362,7 @@ class GMWindow(QMainWindow):
 
         batch_score_btn = QPushButton("发放")
         batch_score_btn.clicked.connect(self._batch_add_score)
-        batch_score_btn.setStyleSheet("background-color: #4CAF50; color: white;")
+        batch_score_btn.setProperty("role", "success")
         batch_score_layout.addWidget(batch_score_btn)
         batch_layout.addLayout(batch_score_layout)
 
@@ -983,7 +1381,7 @@ class GMWindow(QMainWindow):
         first_group = QGroupBox("🏆 首达记录")
         first_layout = QVBoxLayout()
 
-        self.first_achievement_display = QTextEdit()
+        self.first_achievement_display = QPlainTextEdit()
         self.first_achievement_display.setReadOnly(True)
         first_layout.addWidget(self.first_achievement_display)
 
@@ -1000,12 +1398,12 @@ class GMWindow(QMainWindow):
 
         reload_custom_cmd_btn = QPushButton("重新加载自定义命令")
         reload_custom_cmd_btn.clicked.connect(self._reload_custom_commands)
-        reload_custom_cmd_btn.setStyleSheet("background-color: #FF9800; color: white;")
+        reload_custom_cmd_btn.setProperty("role", "warn")
         reload_layout.addWidget(reload_custom_cmd_btn)
 
         reload_modules_btn = QPushButton("重新加载游戏模块")
         reload_modules_btn.clicked.connect(self._reload_game_modules)
-        reload_modules_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        reload_modules_btn.setProperty("role", "info")
         reload_layout.addWidget(reload_modules_btn)
 
         reload_info = QLabel("提示: 修改代码后点击重载，无需重启程序")
@@ -1048,12 +1446,14 @@ class GMWindow(QMainWindow):
         layout.addLayout(toolbar)
 
         # 商店表格
-        self.shop_table = QTableWidget()
-        self.shop_table.setColumnCount(8)
-        self.shop_table.setHorizontalHeaderLabels(
-            ["ID", "名称", "类型", "价格", "阵营", "全局限制", "已售", "已解锁"]
-        )
-        self.shop_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.shop_model = ShopTableModel(self)
+        self.shop_table = QTableView()
+        self.shop_table.setModel(self.shop_model)
+        self.shop_table.setSelectionBehavior(QTableView.SelectRows)
+        shop_header = self.shop_table.horizontalHeader()
+        for col, width in enumerate([60, 200, 100, 80, 100, 90, 80, 80]):
+            shop_header.setSectionResizeMode(col, QHeaderView.Fixed)
+            self.shop_table.setColumnWidth(col, width)
 
         layout.addWidget(self.shop_table)
 
@@ -1069,11 +1469,11 @@ class GMWindow(QMainWindow):
 
         add_cmd_btn = QPushButton("➕ 添加口令")
         add_cmd_btn.clicked.connect(self._add_command_dialog)
-        add_cmd_btn.setStyleSheet("background-color: #4CAF50; color: white;")
+        add_cmd_btn.setProperty("role", "success")
         toolbar.addWidget(add_cmd_btn)
 
         refresh_cmd_btn = QPushButton("🔄 刷新列表")
-        refresh_cmd_btn.clicked.connect(self._refresh_commands)
+        refresh_cmd_btn.clicked.connect(self._reload_commands)
         toolbar.addWidget(refresh_cmd_btn)
 
         toolbar.addStretch()
@@ -1099,12 +1499,11 @@ class GMWindow(QMainWindow):
         self.command_table.setHorizontalHeaderLabels(
             ["ID", "关键词", "回复消息", "积分奖励", "每人限制", "启用", "操作"]
         )
-        self.command_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.command_table.setColumnWidth(0, 50)
-        self.command_table.setColumnWidth(3, 80)
-        self.command_table.setColumnWidth(4, 80)
-        self.command_table.setColumnWidth(5, 60)
-        self.command_table.setColumnWidth(6, 150)
+        # 使用固定列宽，避免 Stretch 模式在每次插入时测量所有单元格内容
+        command_header = self.command_table.horizontalHeader()
+        for col, width in enumerate([50, 150, 300, 80, 80, 60, 150]):
+            command_header.setSectionResizeMode(col, QHeaderView.Fixed)
+            self.command_table.setColumnWidth(col, width)
 
         layout.addWidget(self.command_table)
 
@@ -1113,57 +1512,133 @@ class GMWindow(QMainWindow):
 
         return widget
 
-    def _refresh_commands(self):
-        """刷新口令列表"""
-        commands = self.custom_cmd_dao.get_all_commands()
-        self.command_table.setRowCount(len(commands))
-
-        for row, cmd in enumerate(commands):
-            # ID
-            self.command_table.setItem(row, 0, QTableWidgetItem(str(cmd.command_id)))
-
-            # 关键词
-            self.command_table.setItem(row, 1, QTableWidgetItem(cmd.keyword))
-
-            # 回复消息（截断显示）
-            response_display = cmd.response[:30] + "..." if len(cmd.response) > 30 else cmd.response
-            self.command_table.setItem(row, 2, QTableWidgetItem(response_display))
-
-            # 积分奖励
-            self.command_table.setItem(row, 3, QTableWidgetItem(str(cmd.score_reward)))
+    def _reload_commands(self):
+        """丢弃缓存并从数据库重新加载口令列表"""
+        self._commands_cache = None
+        self._refresh_commands()
 
-            # 每人限制
-            limit_text = "无限" if cmd.per_player_limit == 0 else str(cmd.per_player_limit)
-            self.command_table.setItem(row, 4, QTableWidgetItem(limit_text))
+    def _refresh_commands(self):
+        """刷新口令列表（优先使用缓存）"""
+        if self._commands_cache is None:
+            self._commands_cache = self.custom_cmd_dao.get_all_commands()
+        commands = self._commands_cache
+
+        # 批量填充期间暂停重绘/排序/信号，结束后一次性恢复
+        table = self.command_table
+        sorting_enabled = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        table.blockSignals(True)
+        try:
+            table.setRowCount(len(commands))
+            for row, cmd in enumerate(commands):
+                self._set_command_row(row, cmd)
+        finally:
+            table.blockSignals(False)
+            table.setSortingEnabled(sorting_enabled)
+            table.setUpdatesEnabled(True)
+
+    def _find_command_row(self, command_id: int) -> int:
+        """查找口令在缓存中的行号，找不到返回-1"""
+        if self._commands_cache is None:
+            return -1
+        for row, cmd in enumerate(self._commands_cache):
+            if cmd.command_id == command_id:
+                return row
+        return -1
+
+    def _update_command_cache(self, cmd):
+        """用单条口令更新缓存和表格对应行（不存在则追加）"""
+        if self._commands_cache is None:
+            self._refresh_commands()
+            return
 
-            # 启用状态
-            status_text = "✓" if cmd.enabled else "✗"
-            status_item = QTableWidgetItem(status_text)
-            status_item.setTextAlignment(Qt.AlignCenter)
-            self.command_table.setItem(row, 5, status_item)
+        row = self._find_command_row(cmd.command_id)
+        if row < 0:
+            row = len(self._commands_cache)
+            self._commands_cache.append(cmd)
+            self.command_table.insertRow(row)
+        else:
+            self._commands_cache[row] = cmd
+        self._set_command_row(row, cmd)
+
+    def _set_command_row(self, row: int, cmd):
+        """填充口令表格的一行（与上次显示内容相同则跳过，变化时复用已有单元格）"""
+        table = self.command_table
+
+        # 回复消息截断显示，每人限制0表示无限
+        response_display = cmd.response[:30] + "..." if len(cmd.response) > 30 else cmd.response
+        limit_text = "无限" if cmd.per_player_limit == 0 else str(cmd.per_player_limit)
+        display = (
+            str(cmd.command_id),
+            cmd.keyword,
+            response_display,
+            str(cmd.score_reward),
+            limit_text,
+            "✓" if cmd.enabled else "✗",
+        )
 
-            # 操作按钮
+        id_item = table.item(row, 0)
+        if (id_item is not None and id_item.text() == display[0]
+                and self._cmd_row_cache.get(cmd.command_id) == display):
+            return
+        self._cmd_row_cache[cmd.command_id] = display
+
+        # ID / 关键词 / 回复消息 / 积分奖励 / 每人限制 / 启用状态
+        for col, text in enumerate(display):
+            item = table.item(row, col)
+            if item is None:
+                item = QTableWidgetItem(text)
+                if col == 5:
+                    item.setTextAlignment(Qt.AlignCenter)
+                table.setItem(row, col, item)
+            elif item.text() != text:
+                item.setText(text)
+
+        # 操作按钮
+        ops_widget = table.cellWidget(row, 6)
+        if ops_widget is None:
             ops_widget = QWidget()
             ops_layout = QHBoxLayout(ops_widget)
             ops_layout.setContentsMargins(2, 2, 2, 2)
 
+            # 按钮通过 cmd_id 属性分发到共享的处理函数，避免每行创建闭包
             edit_btn = QPushButton("编辑")
+            edit_btn.setObjectName("edit")
             edit_btn.setFixedWidth(45)
-            edit_btn.clicked.connect(lambda checked, cid=cmd.command_id: self._edit_command_dialog(cid))
+            edit_btn.clicked.connect(self._on_command_edit_clicked)
             ops_layout.addWidget(edit_btn)
 
-            toggle_btn = QPushButton("禁用" if cmd.enabled else "启用")
+            toggle_btn = QPushButton()
+            toggle_btn.setObjectName("toggle")
             toggle_btn.setFixedWidth(45)
-            toggle_btn.clicked.connect(lambda checked, cid=cmd.command_id: self._toggle_command(cid))
+            toggle_btn.clicked.connect(self._on_command_toggle_clicked)
             ops_layout.addWidget(toggle_btn)
 
             del_btn = QPushButton("删除")
+            del_btn.setObjectName("delete")
             del_btn.setFixedWidth(45)
-            del_btn.setStyleSheet("background-color: #f44336; color: white;")
-            del_btn.clicked.connect(lambda checked, cid=cmd.command_id: self._delete_command(cid))
+            del_btn.setProperty("role", "danger")
+            del_btn.clicked.connect(self._on_command_delete_clicked)
             ops_layout.addWidget(del_btn)
 
-            self.command_table.setCellWidget(row, 6, ops_widget)
+            table.setCellWidget(row, 6, ops_widget)
+
+        for btn in ops_widget.findChildren(QPushButton):
+            btn.setProperty("cmd_id", cmd.command_id)
+        ops_widget.findChild(QPushButton, "toggle").setText("禁用" if cmd.enabled else "启用")
+
+    def _on_command_edit_clicked(self):
+        """口令表格“编辑”按钮"""
+        self._edit_command_dialog(self.sender().property("cmd_id"))
+
+    def _on_command_toggle_clicked(self):
+        """口令表格“启用/禁用”按钮"""
+        self._toggle_command(self.sender().property("cmd_id"))
+
+    def _on_command_delete_clicked(self):
+        """口令表格“删除”按钮"""
+        self._delete_command(self.sender().property("cmd_id"))
 
     def _add_command_dialog(self):
         """添加口令对话框"""
@@ -1232,14 +1707,20 @@ class GMWindow(QMainWindow):
             success, msg = self.custom_cmd_dao.add_command(keyword, response, score, limit)
             if success:
                 QMessageBox.information(self, "成功", msg)
-                self._refresh_commands()
+                new_cmd = self.custom_cmd_dao.get_command_by_keyword(keyword)
+                if new_cmd:
+                    self._update_command_cache(new_cmd)
                 self._log(f"添加口令: {keyword}")
             else:
                 QMessageBox.warning(self, "错误", msg)
 
     def _edit_command_dialog(self, command_id: int):
         """编辑口令对话框"""
-        cmd = self.custom_cmd_dao.get_command_by_id(command_id)
+        row = self._find_command_row(command_id)
+        if row >= 0:
+            cmd = self._commands_cache[row]
+        else:
+            cmd = self.custom_cmd_dao.get_command_by_id(command_id)
         if not cmd:
             QMessageBox.warning(self, "错误", "口令不存在")
             return
@@ -1309,7 +1790,11 @@ class GMWindow(QMainWindow):
             success, msg = self.custom_cmd_dao.update_command(command_id, keyword, response, score, limit)
             if success:
                 QMessageBox.information(self, "成功", msg)
-                self._refresh_commands()
+                cmd.keyword = keyword
+                cmd.response = response
+                cmd.score_reward = score
+                cmd.per_player_limit = limit
+                self._update_command_cache(cmd)
                 self._log(f"编辑口令: {keyword}")
             else:
                 QMessageBox.warning(self, "错误", msg)
@@ -1319,21 +1804,26 @@ class GMWindow(QMainWindow):
         success, new_state = self.custom_cmd_dao.toggle_command(command_id)
         if success:
             status = "启用" if new_state else "禁用"
-            self._refresh_commands()
+            row = self._find_command_row(command_id)
+            if row >= 0:
+                cmd = self._commands_cache[row]
+                cmd.enabled = new_state
+                self._set_command_row(row, cmd)
+            else:
+                self._reload_commands()
             self._log(f"口令ID {command_id} 已{status}")
         else:
             QMessageBox.warning(self, "错误", "操作失败")
 
     def _delete_command(self, command_id: int):
         """删除口令"""
-        reply = QMessageBox.question(
-            self, "确认删除",
-            "确定要删除这个口令吗？\n删除后使用记录也会被清除。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-        if reply == QMessageBox.Yes:
+        if self._confirm("确认删除", "确定要删除这个口令吗？\n删除后使用记录也会被清除。"):
             if self.custom_cmd_dao.delete_command(command_id):
-                self._refresh_commands()
+                row = self._find_command_row(command_id)
+                self._cmd_row_cache.pop(command_id, None)
+                if row >= 0:
+                    self._commands_cache.pop(row)
+                    self.command_table.removeRow(row)
                 self._log(f"删除口令ID: {command_id}")
             else:
                 QMessageBox.warning(self, "错误", "删除失败")
@@ -1347,22 +1837,18 @@ class GMWindow(QMainWindow):
             QMessageBox.warning(self, "错误", f"配置文件不存在:\n{config_path}")
             return
 
-        reply = QMessageBox.question(
-            self, "确认导入",
-            f"从以下文件导入口令:\n{config_path}\n\n已存在的口令会被更新，新口令会被添加。",
-            QMessageBox.Yes | QMessageBox.No
-        )
-        if reply == QMessageBox.Yes:
+        if self._confirm("确认导入", f"从以下文件导入口令:\n{config_path}\n\n已存在的口令会被更新，新口令会被添加。"):
             success, skip, errors = self.custom_cmd_dao.import_from_json(str(config_path))
-            self._refresh_commands()
+            self._reload_commands()
 
-            msg = f"导入完成！\n新增: {success} 条\n更新/跳过: {skip} 条"
+            msg_parts = [f"导入完成！\n新增: {success} 条\n更新/跳过: {skip} 条"]
             if errors:
-                msg += f"\n\n错误:\n" + "\n".join(errors[:5])
+                msg_parts.append("\n\n错误:\n")
+                msg_parts.append("\n".join(errors[:5]))
                 if len(errors) > 5:
-                    msg += f"\n... 还有 {len(errors) - 5} 条错误"
+                    msg_parts.append(f"\n... 还有 {len(errors) - 5} 条错误")
 
-            QMessageBox.information(self, "导入结果", msg)
+            QMessageBox.information(self, "导入结果", "".join(msg_parts))
             self._log(f"导入口令: 新增 {success}, 跳过 {skip}")
 
     def _export_commands(self):
@@ -1404,7 +1890,7 @@ class GMWindow(QMainWindow):
             col = (i % 2) * 2
             stats_layout.addWidget(QLabel(f"{item}:"), row, col)
             label = QLabel(default)
-            label.setStyleSheet("font-weight: bold; color: #2196F3;")
+            label.setProperty("role", "stat")
             self.stats_labels[item] = label
             stats_layout.addWidget(label, row, col + 1)
 
@@ -1430,12 +1916,12 @@ class GMWindow(QMainWindow):
 
         clear_board_btn = QPushButton("🧹 清除棋盘 (保留玩家和积分)")
         clear_board_btn.clicked.connect(self._clear_board)
-        clear_board_btn.setStyleSheet("background-color: #FF9800; color: white; font-weight: bold;")
+        clear_board_btn.setProperty("role", "warn-strong")
         ops_layout.addWidget(clear_board_btn)
 
         reset_btn = QPushButton("🗑️ 重置游戏 (清除所有数据)")
         reset_btn.clicked.connect(self._reset_game)
-        reset_btn.setStyleSheet("background-color: #ff4444; color: white; font-weight: bold;")
+        reset_btn.setProperty("role", "danger-strong")
         ops_layout.addWidget(reset_btn)
 
         backup_btn = QPushButton("💾 备份数据库")
@@ -1449,9 +1935,13 @@ class GMWindow(QMainWindow):
         log_group = QGroupBox("📝 操作日志")
         log_layout = QVBoxLayout()
 
-        self.log_display = QTextEdit()
+        self.log_display = QPlainTextEdit()
         self.log_display.setReadOnly(True)
         self.log_display.setMaximumHeight(200)
+        self.log_display.setMaximumBlockCount(1000)  # 只保留最近1000行日志
+        for line in self._pending_logs:
+            self.log_display.appendPlainText(line)
+        self._pending_logs.clear()
         log_layout.addWidget(self.log_display)
 
         log_group.setLayout(log_layout)
@@ -1472,13 +1962,12 @@ class GMWindow(QMainWindow):
 
     def _on_player_selected(self):
         """玩家选中事件"""
-        selected_items = self.players_table.selectedItems()
-        if not selected_items:
+        selected_rows = self.players_table.selectionModel().selectedRows()
+        if not selected_rows:
             self.selected_qq_id = None
             return
 
-        row = selected_items[0].row()
-        qq_id = self.players_table.item(row, 0).text()
+        qq_id = selected_rows[0].data()
         self.selected_qq_id = qq_id
 
         self._show_player_detail(qq_id)
@@ -1499,15 +1988,8 @@ class GMWindow(QMainWindow):
             self.modify_faction_combo.setCurrentIndex(0)  # 未选择
 
     def _filter_players(self):
-        """筛选玩家"""
-        search_text = self.player_search.text().lower()
-        for i in range(self.players_table.rowCount()):
-            qq_id = self.players_table.item(i, 0).text().lower()
-            nickname = self.players_table.item(i, 1).text().lower()
-            if search_text in qq_id or search_text in nickname:
-                self.players_table.showRow(i)
-            else:
-                self.players_table.hideRow(i)
+        """筛选玩家（由代理模型在 C++ 侧完成匹配）"""
+        self.player_proxy.setFilterFixedString(self.player_search.text())
 
     def _register_player(self):
         """手动注册玩家"""
@@ -1535,15 +2017,13 @@ class GMWindow(QMainWindow):
             QMessageBox.warning(self, "错误", f"玩家 {qq_id} ({existing.nickname}) 已存在")
             return
 
-        # 注册玩家
-        player = self.player_dao.create_player(qq_id, nickname)
+        # 注册玩家（阵营和初始积分一并写入）
+        player = self.player_dao.create_player(
+            qq_id, nickname,
+            faction=faction if faction and faction != "未选择" else None,
+            initial_score=initial_score
+        )
         if player:
-            # 设置阵营
-            if faction and faction != "未选择":
-                self.player_dao.update_faction(qq_id, faction)
-            # 设置初始积分
-            if initial_score > 0:
-                self.player_dao.add_score(qq_id, initial_score)
             faction_text = faction if faction != "未选择" else "未选择"
             QMessageBox.information(self, "成功", f"已注册玩家: {nickname} ({qq_id})\n阵营: {faction_text}\n初始积分: {initial_score}")
             self.register_qq_input.clear()
@@ -1566,15 +2046,10 @@ class GMWindow(QMainWindow):
             return
 
         # 确认删除
-        reply = QMessageBox.question(
-            self,
+        if self._confirm(
             "确认删除",
-            f"确定要删除玩家 {player.nickname} ({player.qq_id}) 吗？\n\n此操作将删除该玩家的所有数据，包括:\n- 积分和成就\n- 背包物品\n- 位置标记\n- 契约关系\n\n此操作不可撤销！",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-
-        if reply == QMessageBox.Yes:
+            f"确定要删除玩家 {player.nickname} ({player.qq_id}) 吗？\n\n此操作将删除该玩家的所有数据，包括:\n- 积分和成就\n- 背包物品\n- 位置标记\n- 契约关系\n\n此操作不可撤销！"
+        ):
             success, error_msg = self.player_dao.delete_player(self.selected_qq_id)
             if success:
                 QMessageBox.information(self, "成功", f"已删除玩家: {player.nickname} ({player.qq_id})")
@@ -1602,39 +2077,43 @@ class GMWindow(QMainWindow):
             return
 
         import csv
+        import re
+        score_pattern = re.compile(r'[+-]?\d+')
+        valid_factions = {"收养人", "Aeonreth"}
         success_count = 0
         skip_count = 0
         error_count = 0
         errors = []
+        new_players = []  # [(qq_id, nickname, faction, initial_score), ...]
+        # 一次性取出已有QQ号；本次收集的QQ号也加入其中，用于文件内去重
+        known_ids = set(self.player_dao.get_all_qq_ids())
 
         def process_row(row, row_num):
-            """处理单行数据"""
-            nonlocal success_count, skip_count, error_count
+            """解析单行数据，合法的新玩家加入待插入列表"""
+            nonlocal skip_count, error_count
 
             if len(row) < 2:
                 error_count += 1
                 errors.append(f"第{row_num}行: 列数不足")
                 return
 
-            qq_id = str(row[0]).strip()
-            nickname = str(row[1]).strip()
-            faction = None
-            initial_score = 0
+            # csv.reader 产出的已是字符串，只需 strip
+            qq_id = row[0].strip()
+            nickname = row[1].strip()
+            faction_val = row[2].strip() if len(row) >= 3 else ""
+            score_text = row[3].strip() if len(row) >= 4 else ""
 
             # 解析可选的第三列阵营
-            if len(row) >= 3 and row[2].strip():
-                faction_val = row[2].strip()
-                if faction_val in ["收养人", "Aeonreth"]:
-                    faction = faction_val
+            faction = faction_val if faction_val in valid_factions else None
 
             # 解析可选的第四列积分
-            if len(row) >= 4 and row[3].strip():
-                try:
-                    initial_score = int(row[3].strip())
-                except ValueError:
+            initial_score = 0
+            if score_text:
+                if not score_pattern.fullmatch(score_text):
                     error_count += 1
                     errors.append(f"第{row_num}行: 积分格式错误 ({row[3]})")
                     return
+                initial_score = int(score_text)
 
             if not qq_id or not nickname:
                 error_count += 1
@@ -1646,21 +2125,12 @@ class GMWindow(QMainWindow):
                 errors.append(f"第{row_num}行: QQ号不是数字 ({qq_id})")
                 return
 
-            existing = self.player_dao.get_player(qq_id)
-            if existing:
+            if qq_id in known_ids:
                 skip_count += 1
                 return
 
-            try:
-                self.player_dao.create_player(qq_id, nickname)
-                if faction:
-                    self.player_dao.update_faction(qq_id, faction)
-                if initial_score > 0:
-                    self.player_dao.add_score(qq_id, initial_score)
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                errors.append(f"第{row_num}行: {str(e)}")
+            known_ids.add(qq_id)
+            new_players.append((qq_id, nickname, faction, initial_score))
 
         # 尝试多种编码
         encodings = ['utf-8-sig', 'utf-8', 'gb2312', 'gbk', 'gb18030']
@@ -1696,14 +2166,20 @@ class GMWindow(QMainWindow):
             for row_num, row in enumerate(reader, start=2):
                 process_row(row, row_num)
 
+            # 单个事务批量写入
+            if new_players:
+                success_count = self.player_dao.bulk_create_players(new_players)
+                skip_count += len(new_players) - success_count
+
             # 显示结果
-            msg = f"导入完成!\n\n成功: {success_count} 个\n跳过(已存在): {skip_count} 个\n失败: {error_count} 个"
+            msg_parts = [f"导入完成!\n\n成功: {success_count} 个\n跳过(已存在): {skip_count} 个\n失败: {error_count} 个"]
             if errors:
-                msg += f"\n\n错误详情:\n" + "\n".join(errors[:10])
+                msg_parts.append("\n\n错误详情:\n")
+                msg_parts.append("\n".join(errors[:10]))
                 if len(errors) > 10:
-                    msg += f"\n... 还有 {len(errors) - 10} 个错误"
+                    msg_parts.append(f"\n... 还有 {len(errors) - 10} 个错误")
 
-            QMessageBox.information(self, "导入结果", msg)
+            QMessageBox.information(self, "导入结果", "".join(msg_parts))
             self.refresh_players()
 
         except Exception as e:
@@ -1728,7 +2204,7 @@ class GMWindow(QMainWindow):
             partner = self.player_dao.get_player(partner_qq)
             partner_info = f"\n契约对象: {partner.nickname if partner else partner_qq}"
 
-        detail_text = f"""=== 基本信息 ===
+        parts = [f"""=== 基本信息 ===
 QQ号: {player.qq_id}
 昵称: {player.nickname}
 阵营: {player.faction or '未选择'}
@@ -1736,84 +2212,90 @@ QQ号: {player.qq_id}
 历史总积分: {player.total_score}{partner_info}
 
 === 背包物品 ({len(inventory)}) ===
-"""
+"""]
         if inventory:
             for item in inventory:
-                detail_text += f"• {item.item_name} x{item.quantity}\n"
+                parts.append(f"• {item.item_name} x{item.quantity}\n")
         else:
-            detail_text += "背包为空\n"
+            parts.append("背包为空\n")
 
-        detail_text += f"\n=== 成就 ({len(achievements)}) ===\n"
+        parts.append(f"\n=== 成就 ({len(achievements)}) ===\n")
         for ach in achievements:
-            detail_text += f"• {ach.achievement_name} ({ach.achievement_type})\n"
+            parts.append(f"• {ach.achievement_name} ({ach.achievement_type})\n")
 
         # 状态信息
         if state:
-            detail_text += f"\n=== 游戏状态 ===\n"
-            detail_text += f"轮次进行中: {'是' if state.current_round_active else '否'}\n"
-            detail_text += f"跳过回合数: {state.skipped_rounds}\n"
-            if state.lockout_until:
-                try:
-                    lockout_time = datetime.fromisoformat(state.lockout_until)
-                    if datetime.now() < lockout_time:
-                        remaining = lockout_time - datetime.now()
-                        detail_text += f"锁定剩余: {int(remaining.total_seconds()//3600)}小时\n"
-                except:
-                    pass
-
-        self.player_detail.setText(detail_text)
+            parts.append("\n=== 游戏状态 ===\n")
+            parts.append(f"轮次进行中: {'是' if state.current_round_active else '否'}\n")
+            parts.append(f"跳过回合数: {state.skipped_rounds}\n")
+            lockout_time = _parse_lockout(state.lockout_until) if state.lockout_until else None
+            if lockout_time:
+                now = datetime.now()
+                if now < lockout_time:
+                    remaining = lockout_time - now
+                    parts.append(f"锁定剩余: {int(remaining.total_seconds()//3600)}小时\n")
+
+        self.player_detail.setPlainText("".join(parts))
 
     def _show_player_progress(self, qq_id: str):
         """显示玩家进度"""
         positions = self.position_dao.get_positions(qq_id)
         state = self.state_dao.get_state(qq_id)
-
-        temp_positions = [p for p in positions if p.marker_type == 'temp']
-        perm_positions = [p for p in positions if p.marker_type == 'permanent']
-
-        progress_text = "=== 当前进度 ===\n\n"
+        heights = _COLUMN_HEIGHT_TABLE
+        max_column = len(heights) - 1
+
+        # 一次遍历完成分类、取列高和登顶统计（get_positions 已按列号排序，分类后仍保持有序）
+        temp_positions, perm_positions, topped_count = [], [], 0
+        for p in positions:
+            col = p.column_number
+            height = heights[col] if 0 <= col <= max_column else 0
+            if p.marker_type == 'temp':
+                temp_positions.append((p, height))
+            elif p.marker_type == 'permanent':
+                perm_positions.append((p, height))
+                if p.position >= height:
+                    topped_count += 1
+
+        parts = ["=== 当前进度 ===\n\n"]
 
         # 临时标记
-        progress_text += f"🟠 临时标记 ({len(temp_positions)}):\n"
+        parts.append(f"🟠 临时标记 ({len(temp_positions)}):\n")
         if temp_positions:
-            for pos in sorted(temp_positions, key=lambda x: x.column_number):
-                height = COLUMN_HEIGHTS.get(pos.column_number, 0)
+            for pos, height in temp_positions:
                 percent = int((pos.position / height) * 100) if height > 0 else 0
-                progress_text += f"  列{pos.column_number}: 第{pos.position}格/{height} ({percent}%)\n"
+                parts.append(f"  列{pos.column_number}: 第{pos.position}格/{height} ({percent}%)\n")
         else:
-            progress_text += "  无\n"
+            parts.append("  无\n")
 
         # 永久标记
-        progress_text += f"\n🔵 永久标记 ({len(perm_positions)}):\n"
+        parts.append(f"\n🔵 永久标记 ({len(perm_positions)}):\n")
         if perm_positions:
-            for pos in sorted(perm_positions, key=lambda x: x.column_number):
-                height = COLUMN_HEIGHTS.get(pos.column_number, 0)
+            for pos, height in perm_positions:
                 is_topped = pos.position >= height
                 status = "✅ 已登顶" if is_topped else f"第{pos.position}格/{height}"
-                progress_text += f"  列{pos.column_number}: {status}\n"
+                parts.append(f"  列{pos.column_number}: {status}\n")
         else:
-            progress_text += "  无\n"
+            parts.append("  无\n")
 
         # 登顶统计
-        topped_count = len([p for p in perm_positions if p.position >= COLUMN_HEIGHTS.get(p.column_number, 0)])
-        progress_text += f"\n🏆 登顶列数: {topped_count}/3\n"
+        parts.append(f"\n🏆 登顶列数: {topped_count}/3\n")
 
         if topped_count >= 3:
-            progress_text += "🎉 已达成胜利条件！\n"
+            parts.append("🎉 已达成胜利条件！\n")
 
-        self.progress_display.setText(progress_text)
+        self.progress_display.setPlainText("".join(parts))
 
     def _update_control_status(self, qq_id: str):
         """更新控制面板状态显示"""
         player = self.player_dao.get_player(qq_id)
         state = self.state_dao.get_state(qq_id)
-        positions = self.position_dao.get_positions(qq_id)
+        counts = self.position_dao.count_by_type(qq_id)
 
         if not player:
-            self.control_status_display.setText("玩家不存在")
+            self.control_status_display.setPlainText("玩家不存在")
             return
 
-        status_text = f"""玩家: {player.nickname} ({qq_id})
+        parts = [f"""玩家: {player.nickname} ({qq_id})
 阵营: {player.faction or '未选择'}
 积分: {player.current_score}
 
@@ -1823,30 +2305,23 @@ QQ号: {player.qq_id}
 已用临时标记: {state.temp_markers_used}
 跳过回合数: {state.skipped_rounds}
 
-=== 锁定状态 ==="""
+=== 锁定状态 ==="""]
 
-        if state.lockout_until:
-            try:
-                lockout_time = datetime.fromisoformat(state.lockout_until)
-                if datetime.now() < lockout_time:
-                    remaining = lockout_time - datetime.now()
-                    hours = int(remaining.total_seconds() // 3600)
-                    mins = int((remaining.total_seconds() % 3600) // 60)
-                    status_text += f"\n🔒 锁定中，剩余 {hours}小时{mins}分钟"
-                else:
-                    status_text += "\n🔓 未锁定"
-            except:
-                status_text += "\n🔓 未锁定"
+        now = datetime.now()
+        lockout_time = _parse_lockout(state.lockout_until) if state.lockout_until else None
+        if lockout_time and now < lockout_time:
+            remaining = lockout_time - now
+            hours = int(remaining.total_seconds() // 3600)
+            mins = int((remaining.total_seconds() % 3600) // 60)
+            parts.append(f"\n🔒 锁定中，剩余 {hours}小时{mins}分钟")
         else:
-            status_text += "\n🔓 未锁定"
+            parts.append("\n🔓 未锁定")
 
-        status_text += f"\n\n=== 位置信息 ===\n"
-        temp_pos = [p for p in positions if p.marker_type == 'temp']
-        perm_pos = [p for p in positions if p.marker_type == 'permanent']
-        status_text += f"临时标记: {len(temp_pos)}个\n"
-        status_text += f"永久标记: {len(perm_pos)}个\n"
+        parts.append("\n\n=== 位置信息 ===\n")
+        parts.append(f"临时标记: {counts.get('temp', 0)}个\n")
+        parts.append(f"永久标记: {counts.get('permanent', 0)}个\n")
 
-        self.control_status_display.setText(status_text)
+        self.control_status_display.setPlainText("".join(parts))
 
     def _update_lockout_display(self, state):
         """更新锁定状态显示"""
@@ -1871,8 +2346,7 @@ QQ号: {player.qq_id}
 
         self.player_dao.update_faction(self.selected_qq_id, faction)
         QMessageBox.information(self, "成功", f"已将 {player.nickname} 的阵营修改为: {faction or '未选择'}")
-        self.refresh_players()
-        self._show_player_detail(self.selected_qq_id)
+        self._schedule_refresh({'players', 'detail'})
 
     # ==================== 积分操作 ====================
 
@@ -1905,8 +2379,7 @@ QQ号: {player.qq_id}
         if not self.selected_qq_id:
             QMessageBox.warning(self, "警告", "请先选择一个玩家")
             return
-        reply = QMessageBox.question(self, "确认", "确定要重置积分吗？")
-        if reply == QMessageBox.Yes:
+        if self._confirm("确认", "确定要重置积分吗？"):
             self._modify_score(0, is_add=False)
 
     def _quick_add_score(self, amount: int):
@@ -1917,38 +2390,32 @@ QQ号: {player.qq_id}
         self._modify_score(amount, is_add=True)
 
     def _modify_score(self, amount: int, is_add: bool = True):
-        """修改积分核心方法"""
-        player = self.player_dao.get_player(self.selected_qq_id)
-        if not player:
-            return
-
+        """修改积分核心方法（增加时在 SQL 中累加，无需先读取玩家）"""
+        qq_id = self.selected_qq_id
         score_type = self.score_type_combo.currentText()
-        cursor = self.db_conn.cursor()
 
         try:
-            if score_type == "当前积分":
-                new_score = player.current_score + amount if is_add else amount
-                cursor.execute("UPDATE players SET current_score = ? WHERE qq_id = ?",
-                             (new_score, self.selected_qq_id))
-            elif score_type == "总积分":
-                new_score = player.total_score + amount if is_add else amount
-                cursor.execute("UPDATE players SET total_score = ? WHERE qq_id = ?",
-                             (new_score, self.selected_qq_id))
-            else:
-                new_current = player.current_score + amount if is_add else amount
-                new_total = player.total_score + amount if is_add else amount
-                cursor.execute("UPDATE players SET current_score = ?, total_score = ? WHERE qq_id = ?",
-                             (new_current, new_total, self.selected_qq_id))
+            # with 块结束时提交，出错时自动回滚
+            with self.db_conn:
+                if score_type == "当前积分":
+                    sql = self._SQL_ADD_CURRENT_SCORE if is_add else self._SQL_SET_CURRENT_SCORE
+                    self._cursor.execute(sql, (amount, qq_id))
+                elif score_type == "总积分":
+                    sql = self._SQL_ADD_TOTAL_SCORE if is_add else self._SQL_SET_TOTAL_SCORE
+                    self._cursor.execute(sql, (amount, qq_id))
+                else:
+                    sql = self._SQL_ADD_BOTH_SCORES if is_add else self._SQL_SET_BOTH_SCORES
+                    self._cursor.execute(sql, (amount, amount, qq_id))
 
-            self.db_conn.commit()
-            self._log(f"修改 {player.nickname} 积分: {'+' if is_add else '='}{amount}")
+            if self._cursor.rowcount == 0:
+                return  # 玩家不存在
 
-            self.refresh_players()
-            self._show_player_detail(self.selected_qq_id)
+            self._log(f"修改 {self._nickname(qq_id)} 积分: {'+' if is_add else '='}{amount}")
+
+            self._schedule_refresh({'players', 'detail'})
             self.score_input.clear()
 
         except Exception as e:
-            self.db_conn.rollback()
             QMessageBox.critical(self, "错误", f"修改失败: {str(e)}")
 
     # ==================== 道具操作 ====================
@@ -1977,11 +2444,9 @@ QQ号: {player.qq_id}
         quantity = self.item_quantity_input.value()
 
         try:
-            for _ in range(quantity):
-                self.inventory_dao.add_item(self.selected_qq_id, item_id, item_name, item_type)
+            self.inventory_dao.add_item(self.selected_qq_id, item_id, item_name, item_type, quantity)
 
-            player = self.player_dao.get_player(self.selected_qq_id)
-            self._log(f"向 {player.nickname} 派发 {quantity}个 [{item_name}]")
+            self._log(f"向 {self._nickname(self.selected_qq_id)} 派发 {quantity}个 [{item_name}]")
             QMessageBox.information(self, "成功", f"已派发 {quantity}个 [{item_name}]")
             # 清空自定义输入
             self.custom_item_input.clear()
@@ -2016,9 +2481,8 @@ QQ号: {player.qq_id}
                 else:
                     break
 
-            player = self.player_dao.get_player(self.selected_qq_id)
             if removed > 0:
-                self._log(f"从 {player.nickname} 删除 {removed}个 [{item_name}]")
+                self._log(f"从 {self._nickname(self.selected_qq_id)} 删除 {removed}个 [{item_name}]")
                 QMessageBox.information(self, "成功", f"已删除 {removed}个 [{item_name}]")
                 self.custom_item_input.clear()
             else:
@@ -2029,67 +2493,36 @@ QQ号: {player.qq_id}
 
     def _init_item_combo(self):
         """初始化道具下拉框"""
-        self.item_combo.clear()
         items = self.shop_dao.get_all_items()
-        for item in items:
-            display_name = f"{item.item_name} ({item.faction_limit or '通用'})"
-            self.item_combo.addItem(display_name, (item.item_id, item.item_name, item.item_type))
+        combo = self.item_combo
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        try:
+            combo.clear()
+            for item in items:
+                display_name = f"{item.item_name} ({item.faction_limit or '通用'})"
+                combo.addItem(display_name, (item.item_id, item.item_name, item.item_type))
+        finally:
+            combo.setUpdatesEnabled(True)
+            combo.blockSignals(False)
 
     # ==================== 成就操作 ====================
 
     def _init_achievement_combo(self):
         """初始化成就下拉框"""
-        achievements = [
-            ("--- 首达成就 ---", "", ""),
-            ("OAS游戏王", "OAS游戏王", "first_clear"),
-            ("银闪闪", "银闪闪", "first_clear"),
-            ("吉祥三宝", "吉祥三宝", "first_clear"),
-            ("一步之遥", "一步之遥", "first_clear"),
-            ("鹤立oas群", "鹤立oas群", "first_clear"),
-            ("--- 隐藏成就 ---", "", ""),
-            ("领地意识", "领地意识", "hidden"),
-            ("出门没看黄历", "出门没看黄历", "hidden"),
-            ("看我一命通关！", "看我一命通关！", "hidden"),
-            ("收集癖", "收集癖", "hidden"),
-            ("一鸣惊人", "一鸣惊人", "hidden"),
-            ("六六大顺", "六六大顺", "hidden"),
-            ("自巡航", "自巡航", "hidden"),
-            ("雪中送炭", "雪中送炭", "hidden"),
-            ("平平淡淡才是真", "平平淡淡才是真", "hidden"),
-            ("善恶有报", "善恶有报", "hidden"),
-            ("天机算不尽", "天机算不尽", "hidden"),
-            ("主持人的猜忌", "主持人的猜忌", "hidden"),
-            ("--- 检定成就 ---", "", ""),
-            ("数学大王", "数学大王", "hidden"),
-            ("数学0蛋", "数学0蛋", "hidden"),
-            ("哭哭做题家", "哭哭做题家", "hidden"),
-            ("进去吧你！", "进去吧你！", "hidden"),
-            ("--- 对决成就 ---", "", ""),
-            ("狙神", "狙神", "hidden"),
-            ("尸体", "尸体", "hidden"),
-            ("虚晃一枪", "虚晃一枪", "hidden"),
-            ("--- 遭遇成就 ---", "", ""),
-            ("荒野大镖客", "荒野大镖客", "hidden"),
-            ("荒野大窝囊", "荒野大窝囊", "hidden"),
-            ("飙马野郎", "飙马野郎", "normal"),
-            ("--- 契约成就 ---", "", ""),
-            ("产品金婚", "产品金婚", "hidden"),
-            ("--- 陷阱成就 ---", "", ""),
-            ("悲伤的小画家", "悲伤的小画家", "hidden"),
-            ("switch", "switch", "hidden"),
-            ("时管大师", "时管大师", "hidden"),
-            ("讨厌您来", "讨厌您来", "hidden"),
-            ("万物皆可钓", "万物皆可钓", "hidden"),
-            ("厄运儿", "厄运儿", "hidden"),
-            ("--- 其他成就 ---", "", ""),
-            ("你，审核不通过。", "你，审核不通过。", "hidden"),
-        ]
-
-        for display_name, ach_name, ach_type in achievements:
-            if ach_name:
-                self.achievement_combo.addItem(display_name, (ach_name, ach_type))
-            else:
-                self.achievement_combo.addItem(display_name, None)
+        combo = self.achievement_combo
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        try:
+            combo.clear()
+            for display_name, ach_name, ach_type in _ACHIEVEMENT_ITEMS:
+                if ach_name:
+                    combo.addItem(display_name, (ach_name, ach_type))
+                else:
+                    combo.addItem(display_name, None)
+        finally:
+            combo.setUpdatesEnabled(True)
+            combo.blockSignals(False)
 
     def _give_achievement(self):
         """派发成就"""
@@ -2117,8 +2550,7 @@ QQ号: {player.qq_id}
                 QMessageBox.warning(self, "警告", f"该玩家已拥有成就【{achievement_name}】")
                 return
 
-            player = self.player_dao.get_player(self.selected_qq_id)
-            self._log(f"向 {player.nickname} 派发成就【{achievement_name}】")
+            self._log(f"向 {self._nickname(self.selected_qq_id)} 派发成就【{achievement_name}】")
             QMessageBox.information(self, "成功", f"已派发成就【{achievement_name}】")
 
             self.achievement_name_input.clear()
@@ -2150,8 +2582,7 @@ QQ号: {player.qq_id}
                 QMessageBox.warning(self, "警告", f"该玩家没有成就【{achievement_name}】")
                 return
 
-            player = self.player_dao.get_player(self.selected_qq_id)
-            self._log(f"从 {player.nickname} 删除成就【{achievement_name}】")
+            self._log(f"从 {self._nickname(self.selected_qq_id)} 删除成就【{achievement_name}】")
             QMessageBox.information(self, "成功", f"已删除成就【{achievement_name}】")
             self.achievement_name_input.clear()
 
@@ -2167,15 +2598,10 @@ QQ号: {player.qq_id}
             return
 
         qq_id = self.selected_qq_id
-        state = self.state_dao.get_state(qq_id)
-        state.current_round_active = True
-        state.can_start_new_round = False
-        self.state_dao.update_state(state)
+        self.state_dao.set_fields(qq_id, current_round_active=True, can_start_new_round=False)
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"强制开始 {player.nickname} 的轮次")
-        self._update_control_status(qq_id)
-        self.refresh_map()
+        self._log(f"强制开始 {self._nickname(qq_id)} 的轮次")
+        self._schedule_refresh({'control', 'map'})
 
     def _force_end_round(self):
         """强制结束轮次"""
@@ -2184,18 +2610,16 @@ QQ号: {player.qq_id}
             return
 
         qq_id = self.selected_qq_id
-        state = self.state_dao.get_state(qq_id)
-        state.current_round_active = False
-        state.can_start_new_round = True
-        state.temp_markers_used = 0
-        self.state_dao.update_state(state)
+        self.state_dao.set_fields(
+            qq_id, current_round_active=False, can_start_new_round=True, temp_markers_used=0
+        )
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"强制结束 {player.nickname} 的轮次")
+        self._log(f"强制结束 {self._nickname(qq_id)} 的轮次")
         self._update_control_status(qq_id)
 
     def _clear_temp_markers(self):
         """清除临时标记"""
+        self._flush_writes()
         if not self.selected_qq_id:
             QMessageBox.warning(self, "警告", "请先选择一个玩家")
             return
@@ -2203,13 +2627,12 @@ QQ号: {player.qq_id}
         qq_id = self.selected_qq_id
         self.position_dao.clear_temp_positions(qq_id)
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"清除 {player.nickname} 的所有临时标记")
-        self._update_control_status(qq_id)
-        self.refresh_map()
+        self._log(f"清除 {self._nickname(qq_id)} 的所有临时标记")
+        self._schedule_refresh({'control', 'map'})
 
     def _clear_all_markers(self):
         """清除所有标记"""
+        self._flush_writes()
         if not self.selected_qq_id:
             QMessageBox.warning(self, "警告", "请先选择一个玩家")
             return
@@ -2220,14 +2643,11 @@ QQ号: {player.qq_id}
         if reply != QMessageBox.Yes:
             return
 
-        cursor = self.db_conn.cursor()
-        cursor.execute("DELETE FROM player_positions WHERE qq_id = ?", (qq_id,))
-        self.db_conn.commit()
+        with self.db_conn:
+            self._cursor.execute(self._SQL_CLEAR_MARKERS, (qq_id,))
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"清除 {player.nickname} 的所有标记")
-        self._update_control_status(qq_id)
-        self.refresh_map()
+        self._log(f"清除 {self._nickname(qq_id)} 的所有标记")
+        self._schedule_refresh({'control', 'map'})
 
     def _add_marker(self):
         """添加标记"""
@@ -2246,15 +2666,18 @@ QQ号: {player.qq_id}
             QMessageBox.warning(self, "警告", f"列{column}最大位置为{max_height}")
             return
 
-        self.position_dao.add_or_update_position(qq_id, column, position, marker_type)
+        message = f"为 {self._nickname(qq_id)} 添加{marker_type}标记: 列{column}第{position}格"
+        if self.batch_write_check.isChecked():
+            self._queue_write(self._SQL_ADD_MARKER, (qq_id, column, position, marker_type), message)
+            return
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"为 {player.nickname} 添加{marker_type}标记: 列{column}第{position}格")
-        self._update_control_status(qq_id)
-        self.refresh_map()
+        self.position_dao.add_or_update_position(qq_id, column, position, marker_type)
+        self._schedule_refresh({'control', 'map'})
+        self._log(message)
 
     def _remove_marker(self):
         """移除标记"""
+        self._flush_writes()
         if not self.selected_qq_id:
             QMessageBox.warning(self, "警告", "请先选择一个玩家")
             return
@@ -2263,17 +2686,11 @@ QQ号: {player.qq_id}
         column = self.position_column_input.value()
         marker_type = 'temp' if self.position_type_combo.currentIndex() == 0 else 'permanent'
 
-        cursor = self.db_conn.cursor()
-        cursor.execute(
-            "DELETE FROM player_positions WHERE qq_id = ? AND column_number = ? AND marker_type = ?",
-            (qq_id, column, marker_type)
-        )
-        self.db_conn.commit()
+        with self.db_conn:
+            self._cursor.execute(self._SQL_REMOVE_MARKER, (qq_id, column, marker_type))
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"移除 {player.nickname} 在列{column}的{marker_type}标记")
-        self._update_control_status(qq_id)
-        self.refresh_map()
+        self._log(f"移除 {self._nickname(qq_id)} 在列{column}的{marker_type}标记")
+        self._schedule_refresh({'control', 'map'})
 
     def _direct_top_column(self):
         """使用协会特制徽章直接登顶"""
@@ -2296,21 +2713,18 @@ QQ号: {player.qq_id}
             return
 
         player = self.player_dao.get_player(qq_id)
-        reply = QMessageBox.question(
-            self, "确认",
+        if not self._confirm(
+            "确认",
             f"确定要让 {player.nickname} 直接登顶列{column}吗？\n\n"
             f"⚠️ 这将触发：\n"
             f"• 基础登顶奖励(+10积分)\n"
             f"• 首达检查（如果是全图首达则+20积分并锁定12小时）\n"
             f"• 胜利检查（如果达成3列登顶）"
-        )
-        if reply != QMessageBox.Yes:
+        ):
             return
 
         # 调用游戏引擎的直接登顶方法
-        from engine.game_engine import GameEngine
-        engine = GameEngine(self.db_conn)
-        result_msg = engine._direct_top_column(qq_id, column)
+        result_msg = self._get_game_engine()._direct_top_column(qq_id, column)
 
         self._log(f"使用协会特制徽章让 {player.nickname} 直接登顶列{column}")
 
@@ -2320,10 +2734,7 @@ QQ号: {player.qq_id}
         else:
             QMessageBox.information(self, "登顶成功", f"🎉 {player.nickname} 已登顶列{column}！")
 
-        self._update_control_status(qq_id)
-        self._show_player_progress(qq_id)
-        self.refresh_map()
-        self.refresh_players()
+        self._schedule_refresh({'control', 'progress', 'map', 'players'})
 
     def _lock_player(self):
         """锁定玩家"""
@@ -2335,14 +2746,10 @@ QQ号: {player.qq_id}
         hours = self.lockout_hours_input.value()
         lockout_time = datetime.now() + timedelta(hours=hours)
 
-        state = self.state_dao.get_state(qq_id)
-        state.lockout_until = lockout_time.isoformat()
-        self.state_dao.update_state(state)
+        self.state_dao.set_fields(qq_id, lockout_until=lockout_time.isoformat())
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"锁定 {player.nickname} {hours}小时")
-        self._update_control_status(qq_id)
-        self.refresh_players()
+        self._log(f"锁定 {self._nickname(qq_id)} {hours}小时")
+        self._schedule_refresh({'control', 'players'})
 
     def _unlock_player(self):
         """解锁玩家"""
@@ -2351,14 +2758,10 @@ QQ号: {player.qq_id}
             return
 
         qq_id = self.selected_qq_id
-        state = self.state_dao.get_state(qq_id)
-        state.lockout_until = None
-        self.state_dao.update_state(state)
+        self.state_dao.set_fields(qq_id, lockout_until=None)
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"解锁 {player.nickname}")
-        self._update_control_status(qq_id)
-        self.refresh_players()
+        self._log(f"解锁 {self._nickname(qq_id)}")
+        self._schedule_refresh({'control', 'players'})
 
     def _set_skip_rounds(self):
         """设置跳过回合"""
@@ -2369,12 +2772,9 @@ QQ号: {player.qq_id}
         qq_id = self.selected_qq_id
         skip_rounds = self.skip_rounds_input.value()
 
-        state = self.state_dao.get_state(qq_id)
-        state.skipped_rounds = skip_rounds
-        self.state_dao.update_state(state)
+        self.state_dao.set_fields(qq_id, skipped_rounds=skip_rounds)
 
-        player = self.player_dao.get_player(qq_id)
-        self._log(f"设置 {player.nickname} 跳过{skip_rounds}回合")
+        self._log(f"设置 {self._nickname(qq_id)} 跳过{skip_rounds}回合")
         self._update_control_status(qq_id)
 
     def _add_gem(self):
@@ -2385,25 +2785,30 @@ QQ号: {player.qq_id}
         gem_types = ['red_gem', 'blue_gem', 'red_pool', 'blue_pool']
         gem_type = gem_types[gem_type_index]
 
-        self.gem_dao.add_gem('GM', gem_type, column, position)
+        message = f"在列{column}第{position}格添加{self.gem_type_combo.currentText()}"
+        if self.batch_write_check.isChecked():
+            self._queue_write(self._SQL_ADD_GEM, ('GM', gem_type, column, position), message)
+            return
 
-        self._log(f"在列{column}第{position}格添加{self.gem_type_combo.currentText()}")
+        self.gem_dao.create_gem('GM', gem_type, column, position)
         self.refresh_map()
         self._refresh_gem_list()
+        self._log(message)
 
     def _clear_all_gems(self):
         """清除所有宝石池沼"""
-        reply = QMessageBox.question(self, "确认", "确定要清除所有宝石和池沼吗？")
-        if reply == QMessageBox.Yes:
-            cursor = self.db_conn.cursor()
-            cursor.execute("UPDATE gem_pools SET is_active = 0")
-            self.db_conn.commit()
+        self._flush_writes()
+        if self._confirm("确认", "确定要清除所有宝石和池沼吗？"):
+            with self.db_conn:
+                self._cursor.execute("UPDATE gem_pools SET is_active = 0")
             self._log("清除所有宝石和池沼")
             self.refresh_map()
             self._refresh_gem_list()
 
     def _refresh_gem_list(self):
         """刷新宝石池沼列表"""
+        if self.gem_list_display is None:
+            return
         gems = self.gem_dao.get_all_active_gems()
 
         gem_type_names = {
@@ -2414,7 +2819,7 @@ QQ号: {player.qq_id}
         }
 
         if not gems:
-            self.gem_list_display.setText("当前没有活跃的宝石/池沼")
+            self._set_text_if_changed(self.gem_list_display, "当前没有活跃的宝石/池沼")
             return
 
         text = f"共 {len(gems)} 个活跃的宝石/池沼:\n\n"
@@ -2425,21 +2830,27 @@ QQ号: {player.qq_id}
             type_name = gem_type_names.get(gem_type, gem_type)
             text += f"  列{col} 第{pos}格: {type_name}\n"
 
-        self.gem_list_display.setText(text)
+        self._set_text_if_changed(self.gem_list_display, text)
+
+    @staticmethod
+    def _set_text_if_changed(display, text: str):
+        """内容不变时不调用 setPlainText，避免自动刷新时重新排版并重置滚动位置"""
+        if display.toPlainText() != text:
+            display.setPlainText(text)
+
+    def _refresh_control_tab(self):
+        """刷新全局控制选项卡"""
+        self._refresh_gem_list()
+        self._refresh_first_achievements()
 
     def _refresh_first_achievements(self):
         """刷新首达记录"""
-        cursor = self.db_conn.cursor()
-        cursor.execute('''
-            SELECT f.column_number, f.first_qq_id, p.nickname
-            FROM first_achievements f
-            LEFT JOIN players p ON f.first_qq_id = p.qq_id
-            ORDER BY f.column_number
-        ''')
-        records = cursor.fetchall()
+        if self.first_achievement_display is None:
+            return
+        records = self._cursor.execute(self._SQL_FIRST_ACHIEVEMENTS).fetchall()
 
         if not records:
-            self.first_achievement_display.setText("暂无首达记录")
+            self._set_text_if_changed(self.first_achievement_display, "暂无首达记录")
             return
 
         text = f"共 {len(records)} 个首达记录:\n\n"
@@ -2455,44 +2866,102 @@ QQ号: {player.qq_id}
         if unachieved:
             text += f"\n未首达的列: {', '.join(map(str, unachieved))}"
 
-        self.first_achievement_display.setText(text)
+        self._set_text_if_changed(self.first_achievement_display, text)
 
     def _batch_add_score(self):
         """批量发放积分"""
         amount = self.batch_score_input.value()
-        players = self.player_dao.get_all_players()
+        player_count = self.db_conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
 
-        if not players:
+        if not player_count:
             QMessageBox.warning(self, "警告", "没有玩家")
             return
 
-        reply = QMessageBox.question(
-            self, "确认",
-            f"确定要给所有{len(players)}位玩家发放{amount}积分吗？"
-        )
-        if reply != QMessageBox.Yes:
+        if not self._confirm("确认", f"确定要给所有{player_count}位玩家发放{amount}积分吗？"):
             return
 
-        for player in players:
-            self.player_dao.add_score(player.qq_id, amount)
+        # 单条 UPDATE 全员发放（总积分只累计正数，与 add_score 一致）
+        with self.db_conn:
+            self.db_conn.execute('''
+                UPDATE players
+                SET current_score = current_score + ?,
+                    total_score = total_score + ?,
+                    last_active = CURRENT_TIMESTAMP
+            ''', (amount, amount if amount > 0 else 0))
 
         self._log(f"全员发放积分: {amount}")
         self.refresh_players()
-        QMessageBox.information(self, "成功", f"已向{len(players)}位玩家发放{amount}积分")
+        QMessageBox.information(self, "成功", f"已向{player_count}位玩家发放{amount}积分")
 
     def _clear_all_lockouts(self):
         """解除所有玩家锁定"""
-        reply = QMessageBox.question(self, "确认", "确定要解除所有玩家的锁定吗？")
-        if reply != QMessageBox.Yes:
+        if not self._confirm("确认", "确定要解除所有玩家的锁定吗？"):
             return
 
-        cursor = self.db_conn.cursor()
-        cursor.execute("UPDATE game_state SET lockout_until = NULL")
-        self.db_conn.commit()
+        with self.db_conn:
+            self._cursor.execute("UPDATE game_state SET lockout_until = NULL")
 
         self._log("解除所有玩家锁定")
         self.refresh_players()
 
+    def _queue_write(self, sql: str, params: tuple, message: str):
+        """批量写入模式下缓存一条写操作，停止操作200ms后统一提交（日志在提交成功后输出）"""
+        self._pending_writes.append((sql, params, message))
+        self._write_timer.start()
+
+    def _flush_writes(self):
+        """将缓存的写操作在一个事务中提交（相邻的同一语句合并为 executemany）"""
+        self._write_timer.stop()
+        if not self._pending_writes:
+            return
+
+        writes = self._pending_writes
+        self._pending_writes = []
+        try:
+            with self.db_conn:
+                for sql, group in groupby(writes, key=lambda w: w[0]):
+                    self._cursor.executemany(sql, [params for _, params, _ in group])
+        except Exception as e:
+            # 放回队列头部，下次提交时按原顺序重试
+            self._pending_writes = writes + self._pending_writes
+            self._log(f"批量写入失败，{len(writes)} 条记录保留待重试: {str(e)}")
+            QMessageBox.critical(self, "错误", f"批量写入失败: {str(e)}\n{len(writes)} 条记录已保留，将在下次提交时重试")
+            return
+
+        for _, _, message in writes:
+            self._log(message)
+        self._log(f"批量写入 {len(writes)} 条记录")
+        self._refresh_gem_list()
+        self._schedule_refresh({'control', 'map'})
+
+    def closeEvent(self, event):
+        """关闭窗口前提交尚未写入的批量操作"""
+        self._flush_writes()
+        if self._pending_writes and not self._confirm(
+            "确认", f"还有 {len(self._pending_writes)} 条批量写入未能提交，关闭后将丢失。确定要关闭吗？"
+        ):
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    def _nickname(self, qq_id: str) -> str:
+        """获取玩家昵称（优先使用缓存），玩家不存在时返回QQ号"""
+        nickname = self._nickname_cache.get(qq_id)
+        if nickname is None:
+            player = self.player_dao.get_player(qq_id)
+            nickname = player.nickname if player else qq_id
+            if player:
+                self._nickname_cache[qq_id] = nickname
+        return nickname
+
+    def _get_game_engine(self):
+        """获取游戏引擎实例（首次调用时创建并复用）"""
+        if self._game_engine is None:
+            # 延迟导入：引擎初始化会导入口令配置，且热重载后需使用新模块
+            from engine.game_engine import GameEngine
+            self._game_engine = GameEngine(self.db_conn)
+        return self._game_engine
+
     # ==================== 热重载操作 ====================
 
     def _reload_custom_commands(self):
@@ -2533,6 +3002,8 @@ QQ号: {player.qq_id}
 
             importlib.reload(engine.game_engine)
             modules_to_reload.append("game_engine")
+            # 丢弃旧引擎实例，下次使用时用新代码重新创建
+            self._game_engine = None
 
             self._log(f"已重新加载模块: {', '.join(modules_to_reload)}")
             QMessageBox.information(
@@ -2561,46 +3032,41 @@ QQ号: {player.qq_id}
             return
 
         qq_id = self.selected_qq_id
-        player = self.player_dao.get_player(qq_id)
-        target_player = self.player_dao.get_player(target_qq)
+        # 一次查询双方昵称及现有契约对象
+        context = self.contract_dao.load_contract_context(qq_id, target_qq)
+        if qq_id not in context or target_qq not in context:
+            QMessageBox.warning(self, "警告", "玩家不存在")
+            return
+        nickname, existing_partner, existing_name = context[qq_id]
+        target_nickname, target_partner, target_partner_name = context[target_qq]
 
         # 检查是否已有契约
-        existing_partner = self.contract_dao.get_contract_partner(qq_id)
         if existing_partner:
-            existing_name = self.player_dao.get_player(existing_partner)
-            existing_name = existing_name.nickname if existing_name else existing_partner
-            reply = QMessageBox.question(
-                self, "确认",
-                f"{player.nickname} 已与 {existing_name} 建立契约。\n是否解除旧契约并与 {target_player.nickname} 建立新契约？"
-            )
-            if reply != QMessageBox.Yes:
+            if not self._confirm(
+                "确认",
+                f"{nickname} 已与 {existing_name or existing_partner} 建立契约。\n是否解除旧契约并与 {target_nickname} 建立新契约？"
+            ):
                 return
-            # 解除旧契约
-            self.contract_dao.remove_contract(qq_id)
-
-        # 检查目标是否已有契约
-        target_partner = self.contract_dao.get_contract_partner(target_qq)
-        if target_partner:
-            target_partner_name = self.player_dao.get_player(target_partner)
-            target_partner_name = target_partner_name.nickname if target_partner_name else target_partner
-            reply = QMessageBox.question(
-                self, "确认",
-                f"{target_player.nickname} 已与 {target_partner_name} 建立契约。\n是否解除对方旧契约？"
-            )
-            if reply != QMessageBox.Yes:
+
+        # 检查目标是否已有契约（与自己的契约已在上面确认过）
+        if target_partner and target_partner != qq_id:
+            if not self._confirm(
+                "确认",
+                f"{target_nickname} 已与 {target_partner_name or target_partner} 建立契约。\n是否解除对方旧契约？"
+            ):
                 return
-            # 解除目标的旧契约
-            self.contract_dao.remove_contract(target_qq)
 
-        # 建立新契约
-        success, msg = self.contract_dao.create_contract(qq_id, target_qq)
-        if success:
-            self._log(f"建立契约: {player.nickname} ↔ {target_player.nickname}")
-            QMessageBox.information(self, "成功", f"💍 {player.nickname} 与 {target_player.nickname} 建立了契约！")
-            self._update_contract_display(qq_id)
-            self._show_player_detail(qq_id)
-        else:
-            QMessageBox.warning(self, "失败", msg)
+        # 解除双方旧契约并建立新契约（单个事务）
+        try:
+            self.contract_dao.replace_contract(qq_id, target_qq)
+        except Exception as e:
+            QMessageBox.warning(self, "失败", f"契约建立失败: {str(e)}")
+            return
+
+        self._log(f"建立契约: {nickname} ↔ {target_nickname}")
+        QMessageBox.information(self, "成功", f"💍 {nickname} 与 {target_nickname} 建立了契约！")
+        self._update_contract_display(qq_id)
+        self._show_player_detail(qq_id)
 
     def _remove_contract(self):
         """解除契约"""
@@ -2619,11 +3085,7 @@ QQ号: {player.qq_id}
         partner = self.player_dao.get_player(partner_qq)
         partner_name = partner.nickname if partner else partner_qq
 
-        reply = QMessageBox.question(
-            self, "确认",
-            f"确定要解除 {player.nickname} 与 {partner_name} 的契约吗？"
-        )
-        if reply != QMessageBox.Yes:
+        if not self._confirm("确认", f"确定要解除 {player.nickname} 与 {partner_name} 的契约吗？"):
             return
 
         if self.contract_dao.remove_contract(qq_id):
@@ -2641,48 +3103,123 @@ QQ号: {player.qq_id}
             partner = self.player_dao.get_player(partner_qq)
             partner_name = partner.nickname if partner else partner_qq
             self.contract_display.setText(f"{partner_name}")
-            self.contract_display.setStyleSheet("font-weight: bold; color: #E91E63;")
+            role = "contract"
         else:
             self.contract_display.setText("无")
-            self.contract_display.setStyleSheet("font-weight: bold; color: #9E9E9E;")
+            role = "contract-none"
+
+        # 角色变化后需要重新 polish 才会应用对应样式
+        if self.contract_display.property("role") != role:
+            self.contract_display.setProperty("role", role)
+            self.contract_display.style().unpolish(self.contract_display)
+            self.contract_display.style().polish(self.contract_display)
 
     def _refresh_contract_combo(self, exclude_qq: str = None):
         """刷新契约对象下拉框"""
-        self.contract_target_combo.clear()
-        self.contract_target_combo.addItem("-- 选择玩家 --", None)
-
         players = self.player_dao.get_all_players()
-        for player in players:
-            if player.qq_id != exclude_qq:
-                self.contract_target_combo.addItem(
-                    f"{player.nickname} ({player.qq_id})",
-                    player.qq_id
-                )
+        combo = self.contract_target_combo
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        try:
+            combo.clear()
+            combo.addItem("-- 选择玩家 --", None)
+            for player in players:
+                if player.qq_id != exclude_qq:
+                    combo.addItem(f"{player.nickname} ({player.qq_id})", player.qq_id)
+        finally:
+            combo.setUpdatesEnabled(True)
+            combo.blockSignals(False)
 
     # ==================== 商店操作 ====================
 
     def _unlock_all_items(self):
         """解锁所有道具"""
-        reply = QMessageBox.question(self, "确认", "确定要解锁所有道具吗？")
-        if reply == QMessageBox.Yes:
-            cursor = self.db_conn.cursor()
-            cursor.execute("UPDATE shop_items SET unlocked = 1")
-            self.db_conn.commit()
+        if self._confirm("确认", "确定要解锁所有道具吗？"):
+            with self.db_conn:
+                self._cursor.execute("UPDATE shop_items SET unlocked = 1")
             self._log("解锁所有道具")
             self.refresh_shop()
 
     def _reset_shop_sold(self):
         """重置销售数量"""
-        reply = QMessageBox.question(self, "确认", "确定要重置所有道具的销售数量吗？")
-        if reply == QMessageBox.Yes:
-            cursor = self.db_conn.cursor()
-            cursor.execute("UPDATE shop_items SET global_sold = 0")
-            self.db_conn.commit()
+        if self._confirm("确认", "确定要重置所有道具的销售数量吗？"):
+            with self.db_conn:
+                self._cursor.execute("UPDATE shop_items SET global_sold = 0")
             self._log("重置商店销售数量")
             self.refresh_shop()
 
     # ==================== 系统操作 ====================
 
+    def _run_db_op(self, label: str, op, message: str, on_done=None):
+        """在后台线程执行数据库操作，期间显示进度对话框
+
+        Args:
+            label: 进度对话框文字
+            op: op(conn, report_progress)，在工作线程中执行
+            message: 成功后的提示信息
+            on_done: 成功后在界面线程中调用
+        """
+        if self._db_op_thread is not None:
+            QMessageBox.warning(self, "警告", "有数据库操作正在进行，请稍候")
+            return
+
+        # 操作期间暂停自动刷新，避免显示中间状态
+        self.refresh_timer.stop()
+
+        self._db_op_dialog = QProgressDialog(label, None, 0, 0, self)
+        self._db_op_dialog.setWindowTitle("请稍候")
+        self._db_op_dialog.setWindowModality(Qt.WindowModal)
+        self._db_op_dialog.setMinimumDuration(0)
+        self._db_op_dialog.show()
+        self._db_op_done = on_done
+
+        thread = QThread(self)
+        worker = DbOpWorker(self.db_path, op, message)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        # 连接到窗口方法，信号以队列方式回到界面线程
+        worker.progress.connect(self._on_db_op_progress)
+        worker.finished.connect(self._on_db_op_finished)
+        worker.failed.connect(self._on_db_op_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._db_op_thread = thread
+        self._db_op_worker = worker
+        thread.start()
+
+    def _end_db_op(self):
+        """结束后台数据库操作，恢复界面状态"""
+        self._db_op_dialog.close()
+        self._db_op_dialog = None
+        self._db_op_thread = None
+        self._db_op_worker = None
+        self.refresh_timer.start(2000)
+
+    def _on_db_op_progress(self, value: int):
+        """更新后台操作进度"""
+        if self._db_op_dialog is not None:
+            self._db_op_dialog.setMaximum(100)
+            self._db_op_dialog.setValue(value)
+
+    def _on_db_op_finished(self, message: str):
+        """后台操作成功"""
+        on_done = self._db_op_done
+        self._db_op_done = None
+        self._end_db_op()
+        self._log(message)
+        if on_done:
+            on_done()
+        QMessageBox.information(self, "成功", message)
+
+    def _on_db_op_failed(self, error: str):
+        """后台操作失败"""
+        self._db_op_done = None
+        self._end_db_op()
+        QMessageBox.critical(self, "错误", f"操作失败: {error}")
+
     def _clear_board(self):
         """清除棋盘（保留玩家和积分）"""
         reply = QMessageBox.warning(
@@ -2693,10 +3230,12 @@ QQ号: {player.qq_id}
 
         if reply == QMessageBox.Yes:
             from database.schema import DatabaseSchema
-            DatabaseSchema.clear_board(self.db_conn)
-            self._log("棋盘已清除（保留玩家和积分）")
-            QMessageBox.information(self, "成功", "棋盘已清除，玩家信息和积分已保留")
-            self.refresh_all()
+            self._run_db_op(
+                "正在清除棋盘...",
+                lambda conn, report: DatabaseSchema.clear_board(conn),
+                "棋盘已清除（保留玩家和积分）",
+                on_done=self.refresh_all
+            )
 
     def _reset_game(self):
         """重置游戏"""
@@ -2708,96 +3247,191 @@ QQ号: {player.qq_id}
 
         if reply == QMessageBox.Yes:
             from database.schema import DatabaseSchema
-            DatabaseSchema.reset_game(self.db_conn)
-            self._log("游戏已重置")
-            QMessageBox.information(self, "成功", "游戏已重置")
-            self.refresh_all()
+            self._run_db_op(
+                "正在重置游戏...",
+                lambda conn, report: DatabaseSchema.reset_game(conn),
+                "游戏已重置",
+                on_done=self.refresh_all
+            )
 
     def _backup_database(self):
         """备份数据库（使用 SQLite 备份 API，确保数据完整）"""
-        import sqlite3
         from pathlib import Path
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         db_dir = Path(self.db_path).parent
         backup_path = db_dir / f"game_backup_{timestamp}.db"
 
-        try:
-            # 使用 SQLite 备份 API（比直接复制文件更安全）
+        def backup(conn, report):
+            # 使用 SQLite 备份 API（比直接复制文件更安全），分批复制并上报进度
             backup_conn = sqlite3.connect(str(backup_path))
-            self.db_conn.backup(backup_conn)
-            backup_conn.close()
+            try:
+                conn.backup(
+                    backup_conn, pages=256,
+                    progress=lambda status, remaining, total:
+                        report(100 * (total - remaining) // total if total else 100)
+                )
+            finally:
+                backup_conn.close()
 
-            self._log(f"数据库已备份: {backup_path}")
-            QMessageBox.information(self, "成功", f"数据库已备份到:\n{backup_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"备份失败: {str(e)}")
+        self._run_db_op("正在备份数据库...", backup, f"数据库已备份: {backup_path}")
+
+    def _confirm(self, title: str, msg: str) -> bool:
+        """弹出是/否确认框，默认选中“否”"""
+        return QMessageBox.question(
+            self, title, msg, _CONFIRM_BUTTONS, QMessageBox.No
+        ) == QMessageBox.Yes
 
     def _log(self, message: str):
         """记录日志"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_text = f"[{timestamp}] {message}\n"
-        self.log_display.insertPlainText(log_text)
+        line = f"[{timestamp}] {message}"
+        if self.log_display is None:
+            self._pending_logs.append(line)
+            return
+        self.log_display.appendPlainText(line)
         self.log_display.verticalScrollBar().setValue(
             self.log_display.verticalScrollBar().maximum()
         )
 
     # ==================== 刷新函数 ====================
 
+    def _schedule_refresh(self, keys):
+        """登记需要刷新的部分，在下一次事件循环中统一执行
+
+        keys: 'map' / 'players' / 'control' / 'detail' / 'progress' 的集合
+        """
+        if not self._pending_refresh:
+            QTimer.singleShot(0, self._flush_refresh)
+        self._pending_refresh.update(keys)
+
+    def _flush_refresh(self):
+        """执行合并后的刷新，每项只执行一次"""
+        keys = self._pending_refresh
+        self._pending_refresh = set()
+
+        if 'players' in keys or 'map' in keys:
+            snapshot = self._collect_refresh_snapshot()
+            if 'players' in keys:
+                self.refresh_players(snapshot)
+            if 'map' in keys:
+                self.refresh_map(snapshot)
+
+        qq_id = self.selected_qq_id
+        if not qq_id:
+            return
+        if 'control' in keys:
+            self._update_control_status(qq_id)
+        if 'detail' in keys:
+            self._show_player_detail(qq_id)
+        if 'progress' in keys:
+            self._show_player_progress(qq_id)
+
+    def _collect_refresh_snapshot(self) -> RefreshSnapshot:
+        """一次查询玩家、位置和状态，供本轮各刷新函数共用"""
+        return RefreshSnapshot(
+            players=self.player_dao.get_all_player_rows(),
+            positions_by_player=self.position_dao.get_all_positions_on_map(),
+            lockouts_by_player=self.state_dao.get_all_lockouts(),
+            topped_by_player=self.position_dao.get_topped_counts(COLUMN_HEIGHTS),
+        )
+
+    def _auto_refresh(self):
+        """定时刷新：隐藏的选项卡不刷新，切换到时再刷新；数据库未变化时跳过"""
+        self._refresh_ticks += 1
+        if self._refresh_ticks >= self.FULL_REFRESH_TICKS:
+            # 定期全量刷新，保证昵称缓存、锁定剩余时间等不会长期过期
+            self._refresh_ticks = 0
+            self._last_db_generation = self._db_generation()
+            self.refresh_all()
+            return
+
+        generation = self._db_generation()
+        if generation == self._last_db_generation:
+            return
+        self._last_db_generation = generation
+        self._refresh_visible_tab()
+
+    def _db_generation(self) -> tuple:
+        """数据库版本标识
+
+        data_version 在其他连接（bot 进程、后台线程）提交后变化，
+        total_changes 记录本连接的修改，二者都不变说明数据库没有写入。
+        """
+        data_version = self._cursor.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.db_conn.total_changes
+
+    def _refresh_visible_tab(self):
+        """只刷新当前可见选项卡的内容"""
+        current = self.tabs.currentWidget()
+        if current is self.map_tab:
+            snapshot = self._collect_refresh_snapshot()
+            self.refresh_map(snapshot)
+            self._refresh_map_player_filter(snapshot)
+        elif current is self.players_tab:
+            self.refresh_players()
+            if self.selected_qq_id:
+                self._update_control_status(self.selected_qq_id)
+        elif current is self.control_tab:
+            self._refresh_control_tab()
+        elif current is self.shop_tab:
+            self.refresh_shop()
+        elif current is self.system_tab:
+            self.refresh_stats()
+
     def refresh_all(self):
         """刷新所有数据"""
-        self.refresh_players()
-        self.refresh_map()
+        snapshot = self._collect_refresh_snapshot()
+        self.refresh_players(snapshot)
+        self.refresh_map(snapshot)
         self.refresh_shop()
         self.refresh_stats()
         # 注意：不在自动刷新中刷新道具下拉框，避免用户选择时被重置
-        # 道具列表在初始化时已填充，无需每次刷新
-        self._refresh_map_player_filter()
+        # 道具列表在首次进入玩家管理选项卡时填充，无需每次刷新
+        self._refresh_map_player_filter(snapshot)
         self._refresh_gem_list()
         self._refresh_first_achievements()
 
         if self.selected_qq_id:
             self._update_control_status(self.selected_qq_id)
 
-    def refresh_players(self):
+    def refresh_players(self, snapshot: Optional[RefreshSnapshot] = None):
         """刷新玩家列表"""
-        players = self.player_dao.get_all_players()
+        if snapshot is None:
+            snapshot = self._collect_refresh_snapshot()
+        players = snapshot.players
+        self._nickname_cache = {p['qq_id']: p['nickname'] for p in players}
+        # 登顶列数和锁定时间来自批量查询，避免每个玩家单独查询
+        topped_by_player = snapshot.topped_by_player
+        now = datetime.now()
+
+        # 锁定状态只为设置了锁定时间的少数玩家生成（过期与否按解析后的时间判断），其余玩家统一为"正常"
+        status_by_player = {}
+        for qq_id, lockout_until in snapshot.lockouts_by_player.items():
+            lockout_time = _parse_lockout(lockout_until)
+            if lockout_time and now < lockout_time:
+                status_by_player[qq_id] = f"🔒 {int((lockout_time - now).total_seconds() // 3600)}h"
+
+        rows = [
+            (
+                player['qq_id'],
+                player['nickname'],
+                player['faction'] or "未选择",
+                str(player['current_score']),
+                str(player['total_score']),
+                f"{topped_by_player.get(player['qq_id'], 0)}/3",
+                status_by_player.get(player['qq_id'], "正常"),
+            )
+            for player in players
+        ]
 
-        self.players_table.setRowCount(len(players))
-
-        for i, player in enumerate(players):
-            self.players_table.setItem(i, 0, QTableWidgetItem(player.qq_id))
-            self.players_table.setItem(i, 1, QTableWidgetItem(player.nickname))
-            self.players_table.setItem(i, 2, QTableWidgetItem(player.faction or "未选择"))
-            self.players_table.setItem(i, 3, QTableWidgetItem(str(player.current_score)))
-            self.players_table.setItem(i, 4, QTableWidgetItem(str(player.total_score)))
-
-            # 获取登顶列数
-            positions = self.position_dao.get_positions(player.qq_id, 'permanent')
-            topped = sum(1 for p in positions if p.position >= COLUMN_HEIGHTS.get(p.column_number, 0))
-            self.players_table.setItem(i, 5, QTableWidgetItem(f"{topped}/3"))
-
-            # 获取状态
-            state = self.state_dao.get_state(player.qq_id)
-            status = "正常"
-            if state and state.lockout_until:
-                try:
-                    lockout_time = datetime.fromisoformat(state.lockout_until)
-                    if datetime.now() < lockout_time:
-                        remaining = lockout_time - datetime.now()
-                        hours = int(remaining.total_seconds() // 3600)
-                        status = f"🔒 {hours}h"
-                except:
-                    pass
-
-            status_item = QTableWidgetItem(status)
-            if status.startswith("🔒"):
-                status_item.setForeground(QColor(244, 67, 54))
-            self.players_table.setItem(i, 6, status_item)
-
-    def refresh_map(self):
+        self.player_model.set_rows(rows)
+
+    def refresh_map(self, snapshot: Optional[RefreshSnapshot] = None):
         """刷新地图"""
-        all_positions = self.position_dao.get_all_positions_on_map()
+        if snapshot is None:
+            snapshot = self._collect_refresh_snapshot()
+        all_positions = snapshot.positions_by_player
 
         positions_dict = {}
         for qq_id, positions in all_positions.items():
@@ -2808,10 +3442,10 @@ QQ号: {player.qq_id}
 
         # 更新玩家信息
         player_info = {}
-        for player in self.player_dao.get_all_players():
-            player_info[player.qq_id] = {
-                'nickname': player.nickname,
-                'faction': player.faction or '未知'
+        for player in snapshot.players:
+            player_info[player['qq_id']] = {
+                'nickname': player['nickname'],
+                'faction': player['faction'] or '未知'
             }
 
         self.board_widget.update_player_info(player_info)
@@ -2823,76 +3457,74 @@ QQ号: {player.qq_id}
 
     def refresh_shop(self):
         """刷新商店"""
+        if self.shop_table is None:
+            return
         items = self.shop_dao.get_all_items()
 
-        self.shop_table.setRowCount(len(items))
-
-        for i, item in enumerate(items):
-            self.shop_table.setItem(i, 0, QTableWidgetItem(str(item.item_id)))
-            self.shop_table.setItem(i, 1, QTableWidgetItem(item.item_name))
-            self.shop_table.setItem(i, 2, QTableWidgetItem(item.item_type))
-            self.shop_table.setItem(i, 3, QTableWidgetItem(str(item.price)))
-            self.shop_table.setItem(i, 4, QTableWidgetItem(item.faction_limit or "通用"))
-            self.shop_table.setItem(i, 5, QTableWidgetItem(
-                str(item.global_limit) if item.global_limit > 0 else "∞"
-            ))
-            self.shop_table.setItem(i, 6, QTableWidgetItem(str(item.global_sold)))
-            self.shop_table.setItem(i, 7, QTableWidgetItem("✅" if item.unlocked else "❌"))
+        self.shop_model.set_rows([
+            (
+                str(item.item_id),
+                item.item_name,
+                item.item_type,
+                str(item.price),
+                item.faction_limit or "通用",
+                str(item.global_limit) if item.global_limit > 0 else "∞",
+                str(item.global_sold),
+                "✅" if item.unlocked else "❌",
+            )
+            for item in items
+        ])
 
     def refresh_stats(self):
-        """刷新统计"""
-        players = self.player_dao.get_all_players()
+        """刷新统计（在线程池中查询，结果通过 _on_stats_fetched 回到界面线程）"""
+        if self.stats_labels is None or self._stats_fetching:
+            return
+        self._stats_fetching = True
+        fetcher = StatsFetcher(self.db_path)
+        fetcher.signals.finished.connect(self._on_stats_fetched)
+        fetcher.signals.failed.connect(self._on_stats_fetch_failed)
+        QThreadPool.globalInstance().start(fetcher)
+
+    def _on_stats_fetch_failed(self, error: str):
+        """统计查询失败：记录错误并保留上次显示的数据，下次刷新时重试"""
+        self._log(f"统计刷新失败: {error}")
+        self._stats_fetching = False
+
+    def _on_stats_fetched(self, result: dict):
+        """更新统计标签和排行榜"""
+        self._stats_fetching = False
+        for key, value in result["stats"].items():
+            self.stats_labels[key].setText(str(value))
 
-        total_players = len(players)
-        total_score = sum(p.total_score for p in players)
-
-        # 统计进行中玩家
-        active_count = 0
-        topped_count = 0
-        for p in players:
-            state = self.state_dao.get_state(p.qq_id)
-            if state and state.current_round_active:
-                active_count += 1
-
-            positions = self.position_dao.get_positions(p.qq_id, 'permanent')
-            topped = sum(1 for pos in positions if pos.position >= COLUMN_HEIGHTS.get(pos.column_number, 0))
-            if topped >= 3:
-                topped_count += 1
-
-        # 统计道具和成就
-        cursor = self.db_conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM player_inventory")
-        item_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM player_achievements")
-        ach_count = cursor.fetchone()[0]
-
-        self.stats_labels["总玩家数"].setText(str(total_players))
-        self.stats_labels["进行中玩家"].setText(str(active_count))
-        self.stats_labels["已登顶玩家"].setText(str(topped_count))
-        self.stats_labels["总积分发放"].setText(str(total_score))
-        self.stats_labels["道具总数"].setText(str(item_count))
-        self.stats_labels["成就总数"].setText(str(ach_count))
-
-        # 刷新排行榜
+        items = [
+            f"{RANK_MEDALS[i] if i < len(RANK_MEDALS) else f'{i+1}.'} {nickname}: {score}分"
+            for i, (nickname, score) in enumerate(result["ranking"])
+        ]
+        self.rank_list.setUpdatesEnabled(False)
         self.rank_list.clear()
-        sorted_players = sorted(players, key=lambda x: x.current_score, reverse=True)[:10]
-        for i, p in enumerate(sorted_players):
-            medal = ["🥇", "🥈", "🥉"][i] if i < 3 else f"{i+1}."
-            self.rank_list.addItem(f"{medal} {p.nickname}: {p.current_score}分")
-
-    def _refresh_map_player_filter(self):
-        """刷新地图玩家筛选下拉框"""
-        current_data = self.map_player_filter.currentData()
-        self.map_player_filter.clear()
-        self.map_player_filter.addItem("显示全部", None)
-
-        players = self.player_dao.get_all_players()
-        for player in players:
-            self.map_player_filter.addItem(
-                f"{player.nickname}",
-                player.qq_id
-            )
+        self.rank_list.addItems(items)
+        self.rank_list.setUpdatesEnabled(True)
+
+    def _refresh_map_player_filter(self, snapshot: Optional[RefreshSnapshot] = None):
+        """刷新地图玩家筛选下拉框（玩家列表未变化时不重建）"""
+        players = snapshot.players if snapshot else self.player_dao.get_all_player_rows()
+        entries = [(player['qq_id'], player['nickname']) for player in players]
+        if entries == self._map_filter_entries:
+            return
+        self._map_filter_entries = entries
+
+        combo = self.map_player_filter
+        current_data = combo.currentData()
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        combo.clear()
+        combo.addItem("显示全部", None)
+        for qq_id, nickname in entries:
+            combo.addItem(f"{nickname}", qq_id)
+        # 重建后恢复原来的选择
+        combo.setCurrentIndex(max(combo.findData(current_data), 0))
+        combo.setUpdatesEnabled(True)
+        combo.blockSignals(False)
 
 
 def main():
@@ -8,14 +8,21 @@ import random
 import sys
 import io
 import os
-from typing import List, Dict, Tuple, Optional, Set
+import time
+import atexit
+import hashlib
+import multiprocessing
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Iterator
 from dataclasses import dataclass, field
+from functools import lru_cache
 from collections import defaultdict
-from itertools import combinations
+from itertools import accumulate, combinations, combinations_with_replacement
+from math import factorial
 import statistics
 
-# Fix Windows console encoding
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+# Fix Windows console encoding（进程池子进程不输出，无需重新包装）
+if multiprocessing.current_process().name == "MainProcess":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 # 尝试导入matplotlib并设置后端
 MATPLOTLIB_AVAILABLE = False
@@ -39,6 +46,7 @@ COLUMN_HEIGHTS = {
 }
 
 VALID_COLUMNS = list(range(3, 19))
+_VALID_COLUMN_MASK = sum(1 << col for col in VALID_COLUMNS)  # 第 col 位表示该列合法
 WIN_CONDITION = 3  # 改为1列测试
 COST_PER_ROLL = 10
 
@@ -194,9 +202,87 @@ ITEM_VALUES = {
 }
 
 
+def _build_cell_effects() -> Dict[Tuple[int, int], Tuple[str, int, str, object]]:
+    """把棋盘格子和对应效果展开成 {(列, 位置): (类型, ID, 名称, 效果)}，效果已按类型查好默认值"""
+    table = {}
+    for column, cells in BOARD_DATA.items():
+        for position, (cell_type, cell_id, cell_name) in enumerate(cells, start=1):
+            if cell_type == "E":
+                effect = ENCOUNTER_EFFECTS.get(cell_id, (0, 0, 0, "未知遭遇"))
+            elif cell_type == "T":
+                effect = TRAP_EFFECTS.get(cell_id, (0, 0, 0, 0, "未知陷阱"))
+            elif cell_type == "I":
+                effect = ITEM_VALUES.get(cell_id, 10)
+            else:
+                effect = None
+            table[(column, position)] = (cell_type, cell_id, cell_name, effect)
+    return table
+
+
+# process_cell_effect 每次访问格子只需一次查找
+_CELL_EFFECTS = _build_cell_effects()
+
+
+def _build_column_cell_scores() -> Dict[int, Tuple[Tuple[str, int], ...]]:
+    """单列模拟用：{列: 按位置排列的 (类型, 基础积分)}，只含列高以内的格子，无已知效果的格子类型为空串"""
+    table = {}
+    for column, cells in BOARD_DATA.items():
+        scores = []
+        for cell_type, cell_id, cell_name in cells[:COLUMN_HEIGHTS[column]]:
+            if cell_type == "E" and cell_id in ENCOUNTER_EFFECTS:
+                scores.append(("E", ENCOUNTER_EFFECTS[cell_id][0]))
+            elif cell_type == "T" and cell_id in TRAP_EFFECTS:
+                scores.append(("T", TRAP_EFFECTS[cell_id][0]))
+            elif cell_type == "I" and cell_id in ITEM_VALUES:
+                scores.append(("I", ITEM_VALUES[cell_id]))
+            else:
+                scores.append(("", 0))
+        table[column] = tuple(scores)
+    return table
+
+
+_COLUMN_CELL_SCORES = _build_column_cell_scores()
+
+# 单列模拟的运气修正: {运气: {格子类型: (正积分倍率, 负积分倍率)}}
+_CELL_LUCK_MULTS = {
+    "best": {"E": (2.0, 0.2), "T": (2.0, 0.2), "I": (1.5, 1.5), "": (1.0, 1.0)},
+    "worst": {"E": (0.3, 2.0), "T": (0.3, 2.0), "I": (0.5, 0.5), "": (1.0, 1.0)},
+    "normal": {"E": (1.0, 1.0), "T": (1.0, 1.0), "I": (1.0, 1.0), "": (1.0, 1.0)},
+}
+# 多列模拟的运气修正：道具与遭遇、陷阱同样按正负积分修正
+_MULTI_COLUMN_LUCK_MULTS = {
+    "best": {"E": (2.0, 0.2), "T": (2.0, 0.2), "I": (2.0, 0.2), "": (1.0, 1.0)},
+    "worst": {"E": (0.3, 2.0), "T": (0.3, 2.0), "I": (0.3, 2.0), "": (1.0, 1.0)},
+    "normal": {"E": (1.0, 1.0), "T": (1.0, 1.0), "I": (1.0, 1.0), "": (1.0, 1.0)},
+}
+
+
+def _build_cell_scores_by_luck(luck_mults: Dict[str, Dict[str, Tuple[float, float]]]
+                               ) -> Dict[str, Dict[int, Tuple[Tuple[str, int], ...]]]:
+    """{运气: {列: 按位置排列的 (类型, 已按运气修正的积分)}}，运行时触发格子只需一次查表"""
+    tables = {}
+    for luck, mults in luck_mults.items():
+        tables[luck] = {
+            column: tuple(
+                (cell_type, int(base * (mults[cell_type][0] if base > 0 else mults[cell_type][1])))
+                for cell_type, base in cells
+            )
+            for column, cells in _COLUMN_CELL_SCORES.items()
+        }
+    return tables
+
+
+_CELL_SCORE_BY_LUCK = _build_cell_scores_by_luck(_CELL_LUCK_MULTS)
+_MULTI_COLUMN_CELL_SCORE_BY_LUCK = _build_cell_scores_by_luck(_MULTI_COLUMN_LUCK_MULTS)
+
+
 # ==================== 数据结构 ====================
 
-@dataclass
+# Python 3.10+ 使用 __slots__ 数据类：属性按固定偏移访问，实例不带 __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class SimulationResult:
     """单次模拟结果"""
     total_cost: int = 0
@@ -211,13 +297,16 @@ class SimulationResult:
     score_from_events: int = 0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PlayerState:
     """玩家状态"""
     permanent_positions: Dict[int, int] = field(default_factory=dict)
     temp_positions: Dict[int, int] = field(default_factory=dict)
     topped_columns: Set[int] = field(default_factory=set)
-    visited_cells: Dict[int, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    # 已访问格子：按列号下标的位掩码，第 position-1 位表示该格已访问
+    visited_masks: List[int] = field(default_factory=lambda: [0] * (max(COLUMN_HEIGHTS) + 1))
+    # 可移动列位掩码：合法且未登顶的列置位，登顶时同步清除
+    valid_mask: int = _VALID_COLUMN_MASK
 
     total_cost: int = 0
     total_rolls: int = 0
@@ -239,28 +328,132 @@ class PlayerState:
 
 # ==================== 游戏逻辑 ====================
 
+# 模拟专用随机数生成器，热路径直接调用其绑定方法，省去 random 模块的属性查找
+_RNG = random.Random()
+_random = _RNG.random
+_uniform = _RNG.uniform
+_choices = _RNG.choices
+
+# 预先批量生成的骰子点数，roll_dice 按顺序切片取用，用完再整批补充
+_DIE_FACES = range(1, 7)
+_DICE_BUFFER_SIZE = 6 * 4096
+_dice_buffer: List[int] = []
+_dice_index = 0
+
+
+def reset_dice_buffer():
+    """丢弃已生成的骰子点数（重新设置随机种子后调用，保证结果只由种子决定）"""
+    global _dice_buffer, _dice_index
+    _dice_buffer = []
+    _dice_index = 0
+
+
+def seed_simulation(seed=None):
+    """设置模拟随机种子并丢弃已生成的骰子，之后的模拟结果只由种子决定"""
+    _RNG.seed(seed)
+    reset_dice_buffer()
+
+
 def roll_dice(count: int = 6) -> List[int]:
     """投掷骰子"""
-    return [random.randint(1, 6) for _ in range(count)]
+    global _dice_buffer, _dice_index
+    start = _dice_index
+    if start + count > len(_dice_buffer):
+        _dice_buffer = _choices(_DIE_FACES, k=max(_DICE_BUFFER_SIZE, count))
+        start = 0
+    _dice_index = start + count
+    return _dice_buffer[start:start + count]
+
+
+# 6 颗骰子分成两组各 3 颗的 10 种分法：固定第 0 颗所在的一组，另一组为其补集
+_DICE_SPLITS = tuple(c for c in combinations(range(6), 3) if c[0] == 0)
 
 
 def get_possible_sums(dice: List[int]) -> List[Tuple[int, int]]:
     """获取所有可能的两组和"""
-    from itertools import combinations
-
     if len(dice) != 6:
         return []
 
+    total = sum(dice)
     possible = set()
-    for indices in combinations(range(6), 3):
-        group1 = [dice[i] for i in indices]
-        group2 = [dice[i] for i in range(6) if i not in indices]
-        sum1, sum2 = sum(group1), sum(group2)
-        possible.add((min(sum1, sum2), max(sum1, sum2)))
+    for a, b, c in _DICE_SPLITS:
+        sum1 = dice[a] + dice[b] + dice[c]
+        sum2 = total - sum1
+        possible.add((sum1, sum2) if sum1 <= sum2 else (sum2, sum1))
 
     return list(possible)
 
 
+def _build_roll_outcomes() -> Tuple[Tuple[Tuple[Tuple[int, int], ...], ...], Tuple[int, ...]]:
+    """枚举 6 颗骰子不计顺序的全部 462 种点数组合
+
+    返回 (各组合的全部两组和, 累计权重)，权重为该组合在 6^6 种有序结果中出现的次数。
+    按累计权重抽一个组合与真实投 6 颗骰子再分组的结果同分布。
+    """
+    outcomes = []
+    weights = []
+    for dice in combinations_with_replacement(range(1, 7), 6):
+        count = factorial(6)
+        for face in set(dice):
+            count //= factorial(dice.count(face))
+        outcomes.append(tuple(sorted(get_possible_sums(list(dice)))))
+        weights.append(count)
+    return tuple(outcomes), tuple(accumulate(weights))
+
+
+_ROLL_SPLIT_SUMS, _ROLL_CUM_WEIGHTS = _build_roll_outcomes()
+_ROLL_BUFFER_SIZE = 4096  # 按组合抽样投骰结果时每批抽取的次数
+_ROLL_OUTCOME_IDS = range(len(_ROLL_SPLIT_SUMS))
+
+
+@lru_cache(maxsize=None)
+def _best_advances_table(live_columns: FrozenSet[int]) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """攻略 live_columns 时每种点数组合的最优移动，按 _ROLL_SPLIT_SUMS 下标排列
+
+    每项为 ((列, 前进格数), ...)，选对目标列总贡献最大的分组（并列取第一个）；没有有效移动时为空。
+    """
+    table = []
+    for possible_sums in _ROLL_SPLIT_SUMS:
+        best_pair = None
+        best_total = 0
+        for sum1, sum2 in possible_sums:
+            total_advance = (sum1 in live_columns) + (sum2 in live_columns)
+            if total_advance > best_total:
+                best_total = total_advance
+                best_pair = (sum1, sum2)
+
+        advances = {}
+        if best_pair:
+            for s in best_pair:
+                if s in live_columns:
+                    advances[s] = advances.get(s, 0) + 1
+        table.append(tuple(advances.items()))
+    return tuple(table)
+
+
+def _build_advance_odds() -> Dict[int, Tuple[float, float]]:
+    """单列攻略时每列每次投骰的前进概率: {列: (至少前进1格的概率, 前进2格的概率)}"""
+    total = _ROLL_CUM_WEIGHTS[-1]
+    odds = {}
+    for col in VALID_COLUMNS:
+        any_count = 0
+        two_count = 0
+        prev = 0
+        for sums, cum in zip(_ROLL_SPLIT_SUMS, _ROLL_CUM_WEIGHTS):
+            weight = cum - prev
+            prev = cum
+            best = max((sum1 == col) + (sum2 == col) for sum1, sum2 in sums)
+            if best:
+                any_count += weight
+                if best == 2:
+                    two_count += weight
+        odds[col] = (any_count / total, two_count / total)
+    return odds
+
+
+_ADVANCE_ODDS = _build_advance_odds()
+
+
 def get_cell_at_position(column: int, position: int) -> Optional[Tuple[str, int, str]]:
     """获取指定位置的格子信息"""
     if column not in BOARD_DATA:
@@ -271,57 +464,54 @@ def get_cell_at_position(column: int, position: int) -> Optional[Tuple[str, int,
     return None
 
 
-def process_cell_effect(state: PlayerState, column: int, position: int, luck: str = "normal") -> Tuple[int, int, str]:
+# 运气系数表，按运气编号索引: (好事倍率, 坏事倍率, 暂停概率, 失败概率增加倍率)
+LUCK_BEST, LUCK_WORST, LUCK_NORMAL = 0, 1, 2
+_LUCK_TABLE = (
+    (2.0, 0.2, 0.1, 0.3),  # 最佳: 好事翻倍, 坏事减少80%, 暂停概率很低, 失败概率增加很少
+    (0.3, 2.0, 0.9, 2.0),  # 最差: 好事减少70%, 坏事翻倍, 暂停概率很高, 失败概率增加翻倍
+    (1.0, 1.0, 0.5, 1.0),  # 普通
+)
+_LUCK_INDEX = {"best": LUCK_BEST, "worst": LUCK_WORST, "normal": LUCK_NORMAL}
+
+
+def process_cell_effect(state: PlayerState, column: int, position: int,
+                        luck_idx: int = LUCK_NORMAL) -> Tuple[int, int, str]:
     """
     处理格子效果
-    luck: "best" = 最佳运气, "worst" = 最差运气, "normal" = 普通运气
+    luck_idx: 运气编号 LUCK_BEST / LUCK_WORST / LUCK_NORMAL
     返回: (积分变化, 位置变化, 效果描述)
     """
-    cell = get_cell_at_position(column, position)
+    cell = _CELL_EFFECTS.get((column, position))
     if cell is None:
         return 0, 0, ""
 
-    cell_type, cell_id, cell_name = cell
+    cell_type, cell_id, cell_name, effect = cell
 
     # 检查是否已访问过
-    if position in state.visited_cells[column]:
+    mask = 1 << (position - 1)
+    visited_masks = state.visited_masks
+    if visited_masks[column] & mask:
         return 0, 0, ""
 
-    state.visited_cells[column].add(position)
-
-    # 运气系数
-    if luck == "best":
-        luck_mult = 2.0      # 好事翻倍
-        bad_luck_mult = 0.2  # 坏事减少80%
-        skip_chance = 0.1    # 暂停概率很低
-        fail_mult = 0.3      # 失败概率增加很少
-    elif luck == "worst":
-        luck_mult = 0.3      # 好事减少70%
-        bad_luck_mult = 2.0  # 坏事翻倍
-        skip_chance = 0.9    # 暂停概率很高
-        fail_mult = 2.0      # 失败概率增加翻倍
-    else:
-        luck_mult = 1.0
-        bad_luck_mult = 1.0
-        skip_chance = 0.5
-        fail_mult = 1.0
+    visited_masks[column] |= mask
+
+    luck_mult, bad_luck_mult, skip_chance, fail_mult = _LUCK_TABLE[luck_idx]
 
     if cell_type == "E":
         # 遭遇
         state.encounters_triggered += 1
-        effect = ENCOUNTER_EFFECTS.get(cell_id, (0, 0, 0, "未知遭遇"))
         score_change, pos_change, skip_rounds, desc = effect
 
         # 应用运气
         if score_change > 0:
-            score_change = int(score_change * luck_mult * random.uniform(0.8, 1.2))
+            score_change = int(score_change * luck_mult * _uniform(0.8, 1.2))
         elif score_change < 0:
-            score_change = int(score_change * bad_luck_mult * random.uniform(0.8, 1.2))
+            score_change = int(score_change * bad_luck_mult * _uniform(0.8, 1.2))
 
         if pos_change < 0:
             pos_change = int(pos_change * bad_luck_mult)
 
-        if skip_rounds > 0 and random.random() < skip_chance:
+        if skip_rounds > 0 and _random() < skip_chance:
             state.skip_rounds += skip_rounds
 
         state.score_from_events += score_change
@@ -330,7 +520,6 @@ def process_cell_effect(state: PlayerState, column: int, position: int, luck: st
     elif cell_type == "T":
         # 陷阱
         state.traps_triggered += 1
-        effect = TRAP_EFFECTS.get(cell_id, (0, 0, 0, 0, "未知陷阱"))
         score_change, pos_change, skip_rounds, fail_increase, desc = effect
 
         # 特殊处理 LUCKY DAY (ID 20) - 这是正面陷阱
@@ -355,7 +544,7 @@ def process_cell_effect(state: PlayerState, column: int, position: int, luck: st
     elif cell_type == "I":
         # 道具
         state.items_collected += 1
-        value = ITEM_VALUES.get(cell_id, 10)
+        value = effect
         # 道具价值转换为等效积分
         equiv_score = int(value * 0.5 * luck_mult)
         state.bonus_score += equiv_score
@@ -364,45 +553,62 @@ def process_cell_effect(state: PlayerState, column: int, position: int, luck: st
     return 0, 0, ""
 
 
+# 选列评分用的按列号下标查找表
+# 列优先加分：中间列出现概率高，优先推进
+_COL_BONUS = tuple(10 if col in (10, 11) else 5 if col in (7, 8, 9, 12, 13, 14) else 0
+                   for col in range(max(COLUMN_HEIGHTS) + 1))
+# 进度分：_PROGRESS_SCORES[col][pos] 为当前位置 pos 时前进一格的进度分 (pos + 1) / 高度 * 30
+_PROGRESS_SCORES = tuple(
+    tuple((pos + 1) / COLUMN_HEIGHTS[col] * 30 for pos in range(COLUMN_HEIGHTS[col]))
+    if col in COLUMN_HEIGHTS else ()
+    for col in range(max(COLUMN_HEIGHTS) + 1)
+)
+
+
 def choose_best_sums(possible_sums: List[Tuple[int, int]],
                      state: PlayerState,
                      temp_markers_used: int) -> Optional[Tuple[int, int]]:
     """选择最优的组合"""
     best_choice = None
     best_score = -1
+    # 循环内反复用到的属性提前取到局部变量
+    temp_positions = state.temp_positions
+    permanent_positions = state.permanent_positions
+    valid_mask = state.valid_mask
 
     for sum1, sum2 in possible_sums:
+        # 两列都不可移动的组合直接跳过
+        if not ((1 << sum1) | (1 << sum2)) & valid_mask:
+            continue
+
         score = 0
         valid_moves = []
         local_temp_used = temp_markers_used
 
-        for col in [sum1, sum2]:
-            if col not in VALID_COLUMNS:
-                continue
-            if col in state.topped_columns:
+        for col in (sum1, sum2):
+            if not (1 << col) & valid_mask:
                 continue
 
             can_move = False
-            if col in state.temp_positions:
+            if col in temp_positions:
                 can_move = True
                 score += 100
             elif local_temp_used < 3:
-                if col in state.permanent_positions:
+                if col in permanent_positions:
                     score += 50
                 can_move = True
                 local_temp_used += 1
 
             if can_move:
                 valid_moves.append(col)
-                current_pos = state.temp_positions.get(col, state.permanent_positions.get(col, 0))
-                height = COLUMN_HEIGHTS[col]
-                progress = (current_pos + 1) / height
-                score += progress * 30
-
-                if col in [10, 11]:
-                    score += 10
-                elif col in [7, 8, 9, 12, 13, 14]:
-                    score += 5
+                current_pos = temp_positions.get(col, permanent_positions.get(col, 0))
+                progress_scores = _PROGRESS_SCORES[col]
+                if current_pos < len(progress_scores):
+                    score += progress_scores[current_pos]
+                else:
+                    # 超时强制结束时位置可能超过列高，不在表内
+                    score += (current_pos + 1) / COLUMN_HEIGHTS[col] * 30
+                score += _COL_BONUS[col]
 
         if valid_moves and score > best_score:
             best_score = score
@@ -411,7 +617,11 @@ def choose_best_sums(possible_sums: List[Tuple[int, int]],
     return best_choice
 
 
-def simulate_one_roll(state: PlayerState, temp_markers_used: int, luck: str = "normal") -> Tuple[bool, int, List[int], int]:
+# 投骰失败时返回的空移动列表（共用同一个对象，不每次新建）
+_NO_MOVES: Tuple[int, ...] = ()
+
+
+def simulate_one_roll(state: PlayerState, temp_markers_used: int, luck_idx: int = LUCK_NORMAL) -> Tuple[bool, int, List[int], int]:
     """
     模拟一次投骰
     返回: (是否成功, 使用的临时标记数, 移动的列, 事件积分变化)
@@ -423,53 +633,50 @@ def simulate_one_roll(state: PlayerState, temp_markers_used: int, luck: str = "n
 
     if choice is None:
         # 检查是否因为额外失败概率导致失败
-        if state.extra_fail_chance > 0 and random.random() < state.extra_fail_chance:
+        if state.extra_fail_chance > 0 and _random() < state.extra_fail_chance:
             state.extra_fail_chance = 0  # 重置
-            return False, temp_markers_used, [], 0
 
-        if temp_markers_used >= 3 or len(state.temp_positions) >= 3:
-            return False, temp_markers_used, [], 0
-        if len(state.temp_positions) > 0:
-            return False, temp_markers_used, [], 0
-        return False, temp_markers_used, [], 0
+        return False, temp_markers_used, _NO_MOVES, 0
 
     moved_columns = []
     event_score = 0
     sum1, sum2 = choice
+    temp_positions = state.temp_positions
+    temp_count = len(temp_positions)  # 只在新增临时标记时更新，不再反复取字典长度
 
-    for col in [sum1, sum2]:
-        if col not in VALID_COLUMNS:
-            continue
-        if col in state.topped_columns:
+    valid_mask = state.valid_mask
+    for col in (sum1, sum2):
+        if not (1 << col) & valid_mask:
             continue
 
-        if col in state.temp_positions:
-            old_pos = state.temp_positions[col]
+        if col in temp_positions:
+            old_pos = temp_positions[col]
             new_pos = old_pos + 1
-            state.temp_positions[col] = new_pos
+            temp_positions[col] = new_pos
             moved_columns.append(col)
 
             # 处理格子效果
-            score_change, pos_change, _ = process_cell_effect(state, col, new_pos, luck)
+            score_change, pos_change, _ = process_cell_effect(state, col, new_pos, luck_idx)
             event_score += score_change
 
             # 应用位置变化
             if pos_change != 0:
-                state.temp_positions[col] = max(1, new_pos + pos_change)
+                temp_positions[col] = max(1, new_pos + pos_change)
 
-        elif temp_markers_used < 3 and len(state.temp_positions) < 3:
+        elif temp_markers_used < 3 and temp_count < 3:
             start_pos = state.permanent_positions.get(col, 0)
             new_pos = start_pos + 1
-            state.temp_positions[col] = new_pos
+            temp_positions[col] = new_pos
             temp_markers_used += 1
+            temp_count += 1
             moved_columns.append(col)
 
             # 处理格子效果
-            score_change, pos_change, _ = process_cell_effect(state, col, new_pos, luck)
+            score_change, pos_change, _ = process_cell_effect(state, col, new_pos, luck_idx)
             event_score += score_change
 
             if pos_change != 0:
-                state.temp_positions[col] = max(1, new_pos + pos_change)
+                temp_positions[col] = max(1, new_pos + pos_change)
 
     return True, temp_markers_used, moved_columns, event_score
 
@@ -495,18 +702,18 @@ def should_continue(state: PlayerState, rolls_this_round: int,
 
     if temp_count >= 3:
         if total_progress >= 4:
-            return random.random() < greedy * 0.4 * (1 - fail_risk)
-        return random.random() < greedy * 0.6 * (1 - fail_risk)
+            return _random() < greedy * 0.4 * (1 - fail_risk)
+        return _random() < greedy * 0.6 * (1 - fail_risk)
     elif rolls_this_round >= 5 and total_progress >= 4:
-        return random.random() < greedy * 0.5 * (1 - fail_risk)
+        return _random() < greedy * 0.5 * (1 - fail_risk)
     elif rolls_this_round >= 7:
-        return random.random() < greedy * 0.3 * (1 - fail_risk)
+        return _random() < greedy * 0.3 * (1 - fail_risk)
 
     return True
 
 
 def simulate_one_round(state: PlayerState, greedy: float = 0.6,
-                       max_rolls_per_round: int = 50, luck: str = "normal") -> bool:
+                       max_rolls_per_round: int = 50, luck_idx: int = LUCK_NORMAL) -> bool:
     """
     模拟一轮游戏
     返回: 是否成功结束
@@ -518,7 +725,9 @@ def simulate_one_round(state: PlayerState, greedy: float = 0.6,
         return False
 
     temp_markers_used = 0
-    state.temp_positions = {}
+    # 整局复用同一个临时位置字典，每轮清空而不是新建
+    temp_positions = state.temp_positions
+    temp_positions.clear()
     rolls_this_round = 0
     round_event_score = 0
 
@@ -533,22 +742,22 @@ def simulate_one_round(state: PlayerState, greedy: float = 0.6,
         rolls_this_round += 1
 
         success, temp_markers_used, moved_columns, event_score = simulate_one_roll(
-            state, temp_markers_used, luck
+            state, temp_markers_used, luck_idx
         )
         round_event_score += event_score
 
         if not success:
-            state.temp_positions = {}
+            temp_positions.clear()
             state.failed_rounds += 1
             state.extra_fail_chance = 0  # 重置额外失败概率
             return False
 
         # 检查登顶
-        topped_this_roll = []
+        topped_this_roll = False
         for col in moved_columns:
-            if col in state.temp_positions:
-                if state.temp_positions[col] >= COLUMN_HEIGHTS[col]:
-                    topped_this_roll.append(col)
+            if temp_positions.get(col, 0) >= COLUMN_HEIGHTS[col]:
+                topped_this_roll = True
+                break
 
         # 决定是否继续
         should_stop = False
@@ -560,15 +769,16 @@ def simulate_one_round(state: PlayerState, greedy: float = 0.6,
 
         if should_stop:
             # 保存进度
-            for col, pos in state.temp_positions.items():
+            for col, pos in temp_positions.items():
                 if pos >= COLUMN_HEIGHTS[col]:
                     state.topped_columns.add(col)
+                    state.valid_mask &= ~(1 << col)
                     if col in state.permanent_positions:
                         del state.permanent_positions[col]
                 else:
                     state.permanent_positions[col] = pos
 
-            state.temp_positions = {}
+            temp_positions.clear()
             state.extra_fail_chance = 0
 
             # 应用bonus积分
@@ -579,19 +789,21 @@ def simulate_one_round(state: PlayerState, greedy: float = 0.6,
             return True
 
     # 超时强制停止
-    for col, pos in state.temp_positions.items():
+    for col, pos in temp_positions.items():
         state.permanent_positions[col] = pos
-    state.temp_positions = {}
+    temp_positions.clear()
     return True
 
 
 def simulate_one_game(greedy: float = 0.6, max_rounds: int = 500, luck: str = "normal") -> SimulationResult:
     """模拟一局完整游戏"""
     state = PlayerState()
+    # 运气字符串只在开局转换一次，热路径上按编号查表
+    luck_idx = _LUCK_INDEX[luck]
 
     for round_num in range(max_rounds):
         state.total_rounds += 1
-        simulate_one_round(state, greedy, luck=luck)
+        simulate_one_round(state, greedy, luck_idx=luck_idx)
 
         if len(state.topped_columns) >= WIN_CONDITION:
             # 计算实际消耗（减去事件获得的积分）
@@ -624,23 +836,125 @@ def simulate_one_game(greedy: float = 0.6, max_rounds: int = 500, luck: str = "n
     )
 
 
+# ==================== 多进程模拟 ====================
+
+# 局数少于该值时直接在当前进程模拟，省去进程池调度开销
+PARALLEL_MIN_GAMES = 200
+# 每完成多少局打印一次进度
+PROGRESS_INTERVAL = 1000
+# 逐局打印代价较高的循环按时间节流，至少间隔这么多秒才打印一次进度
+PROGRESS_SECONDS = 1.0
+
+_pool = None  # 进程池，首次并行模拟时创建并在多次模拟间复用
+
+
+def _get_pool():
+    """获取（必要时创建）模拟用进程池"""
+    global _pool
+    if _pool is None:
+        _pool = multiprocessing.Pool()
+        atexit.register(_pool.terminate)
+    return _pool
+
+
+def _simulate_games_worker(args: Tuple[int, float, str, int]) -> List[SimulationResult]:
+    """进程池任务：用给定种子连续模拟 n_games 局（顶层函数，便于 pickle）"""
+    n_games, greedy, luck, seed = args
+    # fork 出的子进程会继承父进程的随机状态和未用完的骰子缓冲，必须重新设置
+    seed_simulation(seed)
+    return [simulate_one_game(greedy=greedy, luck=luck) for _ in range(n_games)]
+
+
+def _simulate_luck_chunk_worker(args: Tuple[int, float, str, int]) -> Tuple[str, List[SimulationResult]]:
+    """进程池任务：同 _simulate_games_worker，结果附带运气类型以便主进程分流"""
+    return args[2], _simulate_games_worker(args)
+
+
+def _spawn_seeds(count: int) -> List[int]:
+    """派生 count 个互不相关的子种子
+
+    从模拟随机数生成器取一份 128 位熵，再与子序号一起哈希成 256 位种子（思路同 numpy 的 SeedSequence.spawn）。
+    直接用主生成器连续输出的数做种子时，相邻种子之间存在线性关系；哈希后各子进程的随机序列互相独立，
+    且调用前 seed_simulation() 即可完整复现。
+    """
+    entropy = _RNG.getrandbits(128).to_bytes(16, "little")
+    return [
+        int.from_bytes(hashlib.blake2b(entropy + i.to_bytes(8, "little"), digest_size=32).digest(), "little")
+        for i in range(count)
+    ]
+
+
+def _make_chunk_tasks(num_games: int, greedy: float, luck: str, workers: int) -> List[Tuple[int, float, str, int]]:
+    """把 num_games 局切成进程池任务，每块带一个独立种子"""
+    # 每个进程约分到 4 块，兼顾负载均衡和调度开销
+    chunk_size = max(1, num_games // (workers * 4))
+    sizes = [chunk_size] * (num_games // chunk_size)
+    if num_games % chunk_size:
+        sizes.append(num_games % chunk_size)
+    seeds = _spawn_seeds(len(sizes))
+    return [(n, greedy, luck, seed) for n, seed in zip(sizes, seeds)]
+
+
+def iter_games(num_games: int, greedy: float = 0.6, luck: str = "normal") -> Iterator[SimulationResult]:
+    """逐局产出 num_games 局游戏的模拟结果，局数较多时分块分发到多个进程
+
+    调用方边取边统计即可，不必把所有结果留在内存里。
+    各块的随机种子由当前进程的模拟随机数生成器产生，调用前 seed_simulation() 即可复现结果。
+    """
+    workers = os.cpu_count() or 1
+    if workers <= 1 or num_games < PARALLEL_MIN_GAMES:
+        # 丢弃上次模拟剩下的骰子，结果只取决于调用时的随机状态
+        reset_dice_buffer()
+        report_in = PROGRESS_INTERVAL  # 倒数计数，省去每局一次取模
+        for done in range(1, num_games + 1):
+            yield simulate_one_game(greedy=greedy, luck=luck)
+            report_in -= 1
+            if not report_in:
+                report_in = PROGRESS_INTERVAL
+                print(f"  已完成 {done} / {num_games} 局")
+        return
+
+    tasks = _make_chunk_tasks(num_games, greedy, luck, workers)
+
+    # 进度只由主进程在收到每块结果时打印
+    done = 0
+    next_report = PROGRESS_INTERVAL
+    for chunk in _get_pool().imap(_simulate_games_worker, tasks):
+        yield from chunk
+        done += len(chunk)
+        if done >= next_report:
+            print(f"  已完成 {done} / {num_games} 局")
+            next_report = (done // PROGRESS_INTERVAL + 1) * PROGRESS_INTERVAL
+
+
+def simulate_games(num_games: int, greedy: float = 0.6, luck: str = "normal") -> List[SimulationResult]:
+    """模拟 num_games 局游戏并返回全部结果"""
+    return list(iter_games(num_games, greedy=greedy, luck=luck))
+
+
+def _sorted_median(sorted_values: List[float]) -> float:
+    """已排序列表的中位数（与 statistics.median 结果一致，但不再排序）"""
+    n = len(sorted_values)
+    mid = n // 2
+    if n % 2:
+        return sorted_values[mid]
+    return (sorted_values[mid - 1] + sorted_values[mid]) / 2
+
+
+def _agg(values: List[int]) -> Tuple[float, float, int, int]:
+    """一次求出均值、中位数、最小值、最大值（fmean 走浮点累加，不经 Fraction）"""
+    sorted_values = sorted(values)
+    return statistics.fmean(values), _sorted_median(sorted_values), sorted_values[0], sorted_values[-1]
+
+
 def run_simulation(num_games: int = 500, greedy: float = 0.6, luck: str = "normal") -> Dict:
     """运行多次模拟"""
-    results = []
-    won_games = 0
-
     style = "保守" if greedy < 0.5 else ("一般" if greedy < 0.7 else "激进")
     luck_name = {"best": "最佳运气", "worst": "最差运气", "normal": "普通运气"}[luck]
     print(f"开始模拟 {num_games} 局游戏 (风格: {style}, {luck_name})...")
 
-    for i in range(num_games):
-        if (i + 1) % 1000 == 0:
-            print(f"  已完成 {i + 1} / {num_games} 局")
-
-        result = simulate_one_game(greedy=greedy, luck=luck)
-        results.append(result)
-        if result.won:
-            won_games += 1
+    results = simulate_games(num_games, greedy=greedy, luck=luck)
+    won_games = sum(1 for r in results if r.won)
 
     won_results = [r for r in results if r.won]
 
@@ -666,6 +980,14 @@ def run_simulation(num_games: int = 500, greedy: float = 0.6, luck: str = "norma
         for col in r.topped_columns:
             column_counts[col] += 1
 
+    # 每个指标只排序一次，中位数和分位数都从排好序的列表中取
+    costs_sorted = sorted(costs)
+    net_sorted = sorted(net_costs)
+    rolls_sorted = sorted(rolls)
+    rounds_sorted = sorted(rounds)
+    n_won = len(won_results)
+    rounds_mean = statistics.fmean(rounds)
+
     return {
         "style": style,
         "luck": luck_name,
@@ -674,52 +996,52 @@ def run_simulation(num_games: int = 500, greedy: float = 0.6, luck: str = "norma
         "win_rate": won_games / num_games * 100,
 
         "cost": {
-            "mean": statistics.mean(costs),
-            "median": statistics.median(costs),
-            "stdev": statistics.stdev(costs) if len(costs) > 1 else 0,
-            "min": min(costs),
-            "max": max(costs),
-            "p25": sorted(costs)[len(costs) // 4],
-            "p75": sorted(costs)[len(costs) * 3 // 4],
-            "p5": sorted(costs)[len(costs) // 20],
-            "p95": sorted(costs)[len(costs) * 19 // 20],
+            "mean": statistics.fmean(costs),
+            "median": _sorted_median(costs_sorted),
+            "stdev": statistics.stdev(costs) if n_won > 1 else 0,
+            "min": costs_sorted[0],
+            "max": costs_sorted[-1],
+            "p25": costs_sorted[n_won // 4],
+            "p75": costs_sorted[n_won * 3 // 4],
+            "p5": costs_sorted[n_won // 20],
+            "p95": costs_sorted[n_won * 19 // 20],
         },
 
         "net_cost": {
-            "mean": statistics.mean(net_costs),
-            "median": statistics.median(net_costs),
-            "min": min(net_costs),
-            "max": max(net_costs),
-            "p25": sorted(net_costs)[len(net_costs) // 4],
-            "p75": sorted(net_costs)[len(net_costs) * 3 // 4],
-            "p5": sorted(net_costs)[len(net_costs) // 20],
-            "p95": sorted(net_costs)[len(net_costs) * 19 // 20],
+            "mean": statistics.fmean(net_costs),
+            "median": _sorted_median(net_sorted),
+            "min": net_sorted[0],
+            "max": net_sorted[-1],
+            "p25": net_sorted[n_won // 4],
+            "p75": net_sorted[n_won * 3 // 4],
+            "p5": net_sorted[n_won // 20],
+            "p95": net_sorted[n_won * 19 // 20],
         },
 
         "rolls": {
-            "mean": statistics.mean(rolls),
-            "median": statistics.median(rolls),
-            "min": min(rolls),
-            "max": max(rolls),
+            "mean": statistics.fmean(rolls),
+            "median": _sorted_median(rolls_sorted),
+            "min": rolls_sorted[0],
+            "max": rolls_sorted[-1],
         },
 
         "rounds": {
-            "mean": statistics.mean(rounds),
-            "median": statistics.median(rounds),
-            "min": min(rounds),
-            "max": max(rounds),
+            "mean": rounds_mean,
+            "median": _sorted_median(rounds_sorted),
+            "min": rounds_sorted[0],
+            "max": rounds_sorted[-1],
         },
 
         "failed_rounds": {
-            "mean": statistics.mean(failed_rounds),
-            "rate": statistics.mean(failed_rounds) / statistics.mean(rounds) * 100 if rounds else 0,
+            "mean": statistics.fmean(failed_rounds),
+            "rate": statistics.fmean(failed_rounds) / rounds_mean * 100 if rounds else 0,
         },
 
         "events": {
-            "encounters_mean": statistics.mean(encounters),
-            "traps_mean": statistics.mean(traps),
-            "items_mean": statistics.mean(items),
-            "score_from_events_mean": statistics.mean(event_scores),
+            "encounters_mean": statistics.fmean(encounters),
+            "traps_mean": statistics.fmean(traps),
+            "items_mean": statistics.fmean(items),
+            "score_from_events_mean": statistics.fmean(event_scores),
             "score_from_events_min": min(event_scores),
             "score_from_events_max": max(event_scores),
         },
@@ -805,55 +1127,246 @@ def print_detailed_comparison(normal_stats: Dict, best_stats: Dict, worst_stats:
 """)
 
 
-def run_simulation_with_details(num_games: int = 10000, greedy: float = 0.6, luck: str = "normal") -> Tuple[Dict, List[SimulationResult]]:
-    """运行模拟并返回详细结果列表"""
-    results = []
-    won_games = 0
-
-    luck_name = {"best": "最佳运气", "worst": "最差运气", "normal": "普通运气"}[luck]
-    print(f"开始模拟 {num_games} 局游戏 ({luck_name})...")
+def _new_detail_metrics() -> Dict[str, List[int]]:
+    """获胜局各指标的累加列表"""
+    return {"costs": [], "net_costs": [], "event_scores": [], "rolls": [], "rounds": []}
 
-    for i in range(num_games):
-        if (i + 1) % 1000 == 0:
-            print(f"  已完成 {i + 1} / {num_games} 局")
-
-        result = simulate_one_game(greedy=greedy, luck=luck)
-        results.append(result)
-        if result.won:
-            won_games += 1
-
-    won_results = [r for r in results if r.won]
 
-    if not won_results:
-        return {"error": "没有获胜的游戏", "luck": luck_name}, results
+def _add_detail_metrics(metrics: Dict[str, List[int]], r: SimulationResult):
+    """把一局获胜结果的各指标追加到累加列表"""
+    metrics["costs"].append(r.total_cost)
+    metrics["net_costs"].append(r.total_cost - r.score_from_events)
+    metrics["event_scores"].append(r.score_from_events)
+    metrics["rolls"].append(r.total_rolls)
+    metrics["rounds"].append(r.total_rounds)
 
-    costs = [r.total_cost for r in won_results]
-    net_costs = [r.total_cost - r.score_from_events for r in won_results]
-    event_scores = [r.score_from_events for r in won_results]
-    rolls = [r.total_rolls for r in won_results]
-    rounds = [r.total_rounds for r in won_results]
 
-    stats = {
+def _build_detail_stats(luck: str, metrics: Dict[str, List[int]]) -> Dict:
+    """由累加列表生成统计数据"""
+    luck_name = {"best": "最佳运气", "worst": "最差运气", "normal": "普通运气"}[luck]
+    costs = metrics["costs"]
+    if not costs:
+        return {"error": "没有获胜的游戏", "luck": luck_name}
+
+    net_costs = metrics["net_costs"]
+    event_scores = metrics["event_scores"]
+    cost_mean, cost_median, _, _ = _agg(costs)
+    net_cost_mean, net_cost_median, _, _ = _agg(net_costs)
+    return {
         "luck": luck_name,
         "luck_key": luck,
-        "won_games": len(won_results),
+        "won_games": len(costs),
         "costs": costs,
         "net_costs": net_costs,
         "event_scores": event_scores,
-        "cost_mean": statistics.mean(costs),
-        "cost_median": statistics.median(costs),
-        "net_cost_mean": statistics.mean(net_costs),
-        "net_cost_median": statistics.median(net_costs),
-        "event_score_mean": statistics.mean(event_scores),
-        "rolls_mean": statistics.mean(rolls),
-        "rounds_mean": statistics.mean(rounds),
+        "cost_mean": cost_mean,
+        "cost_median": cost_median,
+        "net_cost_mean": net_cost_mean,
+        "net_cost_median": net_cost_median,
+        "event_score_mean": statistics.fmean(event_scores),
+        "rolls_mean": statistics.fmean(metrics["rolls"]),
+        "rounds_mean": statistics.fmean(metrics["rounds"]),
+    }
+
+
+def run_simulation_with_details(num_games: int = 10000, greedy: float = 0.6, luck: str = "normal",
+                                keep_results: bool = False) -> Tuple[Dict, List[SimulationResult]]:
+    """运行模拟并返回统计数据
+
+    结果边模拟边累加到各指标列表，读完即丢弃；只有 keep_results=True 时才保留获胜局的完整结果对象，
+    否则返回的结果列表为空。
+    """
+    luck_name = {"best": "最佳运气", "worst": "最差运气", "normal": "普通运气"}[luck]
+    print(f"开始模拟 {num_games} 局游戏 ({luck_name})...")
+
+    won_results = []
+    metrics = _new_detail_metrics()
+    for r in iter_games(num_games, greedy=greedy, luck=luck):
+        if not r.won:
+            continue
+        _add_detail_metrics(metrics, r)
+        if keep_results:
+            won_results.append(r)
+
+    return _build_detail_stats(luck, metrics), won_results
+
+
+def run_luck_scenarios(num_games: int, greedy: float = 0.6,
+                       lucks: Tuple[str, ...] = ("best", "normal", "worst")) -> Dict[str, Dict]:
+    """各运气情况各模拟 num_games 局，返回 {运气: 统计数据}
+
+    所有运气的任务块一起提交到同一个进程池，先完成的进程直接领取下一块，
+    不必等上一种运气全部跑完再开始下一种。
+    """
+    workers = os.cpu_count() or 1
+    if workers <= 1 or num_games < PARALLEL_MIN_GAMES:
+        return {luck: run_simulation_with_details(num_games, greedy=greedy, luck=luck)[0] for luck in lucks}
+
+    print(f"开始并行模拟 {len(lucks)} 种运气情况，各 {num_games} 局...")
+    tasks = []
+    for luck in lucks:
+        tasks.extend(_make_chunk_tasks(num_games, greedy, luck, workers))
+
+    metrics = {luck: _new_detail_metrics() for luck in lucks}
+    total = num_games * len(lucks)
+    done = 0
+    next_report = PROGRESS_INTERVAL
+    for luck, chunk in _get_pool().imap_unordered(_simulate_luck_chunk_worker, tasks):
+        luck_metrics = metrics[luck]
+        for r in chunk:
+            if r.won:
+                _add_detail_metrics(luck_metrics, r)
+        done += len(chunk)
+        if done >= next_report:
+            print(f"  已完成 {done} / {total} 局")
+            next_report = (done // PROGRESS_INTERVAL + 1) * PROGRESS_INTERVAL
+
+    return {luck: _build_detail_stats(luck, metrics[luck]) for luck in lucks}
+
+
+def _simulate_column_game(height: int, cell_scores: Tuple[int, ...],
+                          any_odds: float, two_odds: float) -> Tuple[int, int, int, int]:
+    """单列攻略一局直到登顶，只用局部整数变量
+
+    返回: (总消耗, 事件积分, 投骰次数, 轮次)
+    """
+    random_ = _random
+    n_cells = len(cell_scores)
+    permanent_pos = 0
+    rolls = 0
+    rounds = 0
+    event_score = 0
+
+    while True:
+        rounds += 1
+        temp_pos = permanent_pos
+        rolls_this_round = 0
+
+        while rolls_this_round < 50:
+            rolls += 1
+            rolls_this_round += 1
+
+            # 投6个骰子，玩家选择最优分组：目标列前进0、1或2格
+            # 实际游戏中：玩家选择一种分组方式，可以选择1个或2个数值前进
+            # 每个选中的数值对应的列前进1格
+            u = random_()
+            advances = 2 if u < two_odds else (1 if u < any_odds else 0)
+            if not advances:
+                break
+
+            temp_pos += advances
+            if temp_pos <= n_cells:
+                event_score += cell_scores[temp_pos - 1]
+
+            if temp_pos >= height:
+                return rolls * COST_PER_ROLL, event_score, rolls, rounds
+
+            if rolls_this_round >= 3 and random_() < 0.4:
+                break
+
+        # 停止、失败或超时都保留本轮已到达的位置
+        if temp_pos > permanent_pos:
+            permanent_pos = temp_pos
+
+
+def simulate_single_column_detailed(target_column: int, num_games: int = 3000, luck: str = "normal") -> Dict:
+    """模拟只攻略单一列直到登顶，返回详细数据"""
+    all_costs = []
+    all_net_costs = []
+    all_rolls = []
+    all_rounds = []
+    # 分组结果已在模块加载时预先算好，每次投骰只抽样目标列前进格数
+    any_odds, two_odds = _ADVANCE_ODDS[target_column]
+    cell_scores = tuple(score for _, score in _CELL_SCORE_BY_LUCK[luck][target_column])
+    height = COLUMN_HEIGHTS[target_column]
+
+    for _ in range(num_games):
+        cost, event_score, rolls, rounds = _simulate_column_game(height, cell_scores, any_odds, two_odds)
+        all_costs.append(cost)
+        all_net_costs.append(cost - event_score)
+        all_rolls.append(rolls)
+        all_rounds.append(rounds)
+
+    cost_mean, cost_median, cost_min, cost_max = _agg(all_costs)
+    # 净消耗只排序一次，中位数、最值和分位数都从中取
+    net_sorted = sorted(all_net_costs)
+    return {
+        "column": target_column,
+        "height": COLUMN_HEIGHTS[target_column],
+        "cost_mean": cost_mean,
+        "cost_median": cost_median,
+        "cost_min": cost_min,
+        "cost_max": cost_max,
+        "cost_std": statistics.stdev(all_costs) if len(all_costs) > 1 else 0,
+        "net_cost_mean": statistics.fmean(all_net_costs),
+        "net_cost_median": _sorted_median(net_sorted),
+        "net_cost_min": net_sorted[0],
+        "net_cost_max": net_sorted[-1],
+        "net_cost_p5": net_sorted[len(net_sorted) // 20],
+        "net_cost_p95": net_sorted[len(net_sorted) * 19 // 20],
+        "rolls_mean": statistics.fmean(all_rolls),
+        "rounds_mean": statistics.fmean(all_rounds),
+        "all_net_costs": all_net_costs,
+        "all_costs": all_costs,
     }
 
-    return stats, won_results
 
+def _simulate_column_worker(args: Tuple[int, int, str, int]) -> Tuple[str, int, Dict]:
+    """进程池任务：用给定种子模拟一种运气下单列攻略的 num_games 局"""
+    target_column, num_games, luck, seed = args
+    seed_simulation(seed)
+    return luck, target_column, simulate_single_column_detailed(target_column, num_games=num_games, luck=luck)
+
+
+def run_column_scenarios(num_games: int, lucks: Tuple[str, ...] = ("best", "normal", "worst"),
+                         columns: List[int] = VALID_COLUMNS) -> Dict[str, Dict[int, Dict]]:
+    """各运气下每列单独攻略各模拟 num_games 局，返回 {运气: {列: 详细数据}}
+
+    每个 (运气, 列) 组合是一个独立任务，多核时分发到共用的进程池并行运行。
+    """
+    column_data = {luck: {} for luck in lucks}
+    keys = [(luck, col) for luck in lucks for col in columns]
+    tasks = [(col, num_games, luck, seed) for (luck, col), seed in zip(keys, _spawn_seeds(len(keys)))]
+
+    if (os.cpu_count() or 1) <= 1:
+        results = map(_simulate_column_worker, tasks)
+    else:
+        results = _get_pool().imap_unordered(_simulate_column_worker, tasks)
+    for luck, col, data in results:
+        column_data[luck][col] = data
+
+    # 按传入的列顺序排列，与逐列模拟时的字典顺序一致
+    return {luck: {col: column_data[luck][col] for col in columns} for luck in lucks}
+
+
+def _cdf_points(values: List[int]):
+    """累积分布曲线的坐标: (升序排列的数值, 对应的累积百分比)，均为 numpy 数组（仅在绘图时使用）"""
+    sorted_values = np.sort(np.asarray(values))
+    n = len(sorted_values)
+    percentiles = np.arange(1, n + 1, dtype=np.float64) * (100.0 / n)
+    return sorted_values, percentiles
+
+
+def _plot_overlaid_hist(ax, series: List[Tuple[List[int], str, str]], bins: int = 30, rasterized: bool = False):
+    """在同一坐标轴叠加多组直方图 series=[(数值, 图例, 颜色)]（仅在绘图时使用）
+
+    先在各组的共同区间上用 np.histogram 分箱，再用 stairs 画出，各组箱边对齐且绘图开销与样本数无关。
+    """
+    arrays = [np.asarray(values) for values, _, _ in series]
+    lo = min(arr.min() for arr in arrays)
+    hi = max(arr.max() for arr in arrays)
+    edges = np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+    for arr, (_, label, color) in zip(arrays, series):
+        counts, _ = np.histogram(arr, bins=edges)
+        ax.stairs(counts, edges, fill=True, alpha=0.5, label=label, color=color, rasterized=rasterized)
+
+
+def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_path: str = None,
+                    dpi: int = 100):
+    """生成统计图表
 
-def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_path: str = None):
-    """生成统计图表"""
+    dpi 默认 100 供日常查看，需要高清图时传 150 或更高。
+    """
     if not MATPLOTLIB_AVAILABLE:
         print("需要安装 matplotlib: pip install matplotlib")
         return
@@ -866,8 +1379,9 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
 
     # 1. 净消耗分布直方图
     ax1 = axes[0, 0]
-    for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-        ax1.hist(data['net_costs'], bins=30, alpha=0.5, label=labels[key], color=colors[key], edgecolor='white')
+    _plot_overlaid_hist(ax1, [(data['net_costs'], labels[key], colors[key])
+                             for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]],
+                        rasterized=True)
     ax1.set_xlabel('净消耗积分')
     ax1.set_ylabel('频次')
     ax1.set_title('净消耗分布')
@@ -876,8 +1390,9 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
 
     # 2. 总消耗分布直方图
     ax2 = axes[0, 1]
-    for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-        ax2.hist(data['costs'], bins=30, alpha=0.5, label=labels[key], color=colors[key], edgecolor='white')
+    _plot_overlaid_hist(ax2, [(data['costs'], labels[key], colors[key])
+                             for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]],
+                        rasterized=True)
     ax2.set_xlabel('总消耗积分')
     ax2.set_ylabel('频次')
     ax2.set_title('总消耗分布')
@@ -885,8 +1400,9 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
 
     # 3. 事件收益分布直方图
     ax3 = axes[0, 2]
-    for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-        ax3.hist(data['event_scores'], bins=30, alpha=0.5, label=labels[key], color=colors[key], edgecolor='white')
+    _plot_overlaid_hist(ax3, [(data['event_scores'], labels[key], colors[key])
+                             for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]],
+                        rasterized=True)
     ax3.set_xlabel('事件收益积分')
     ax3.set_ylabel('频次')
     ax3.set_title('事件收益分布')
@@ -900,6 +1416,7 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
     for patch, color in zip(bp['boxes'], [colors['best'], colors['normal'], colors['worst']]):
         patch.set_facecolor(color)
         patch.set_alpha(0.6)
+        patch.set_rasterized(True)
     ax4.set_ylabel('净消耗积分')
     ax4.set_title('净消耗箱线图对比')
     ax4.axhline(y=0, color='black', linestyle='--', alpha=0.5)
@@ -913,9 +1430,9 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
     net_cost_means = [best_data['net_cost_mean'], normal_data['net_cost_mean'], worst_data['net_cost_mean']]
     event_means = [best_data['event_score_mean'], normal_data['event_score_mean'], worst_data['event_score_mean']]
 
-    ax5.bar([i - width for i in x], cost_means, width, label='总消耗', color='#9b59b6', alpha=0.8)
-    ax5.bar(x, net_cost_means, width, label='净消耗', color='#1abc9c', alpha=0.8)
-    ax5.bar([i + width for i in x], event_means, width, label='事件收益', color='#f39c12', alpha=0.8)
+    ax5.bar([i - width for i in x], cost_means, width, label='总消耗', color='#9b59b6', alpha=0.8, rasterized=True)
+    ax5.bar(x, net_cost_means, width, label='净消耗', color='#1abc9c', alpha=0.8, rasterized=True)
+    ax5.bar([i + width for i in x], event_means, width, label='事件收益', color='#f39c12', alpha=0.8, rasterized=True)
 
     ax5.set_xticks(x)
     ax5.set_xticklabels(['最佳运气', '普通运气', '最差运气'])
@@ -950,18 +1467,22 @@ def plot_statistics(best_data: Dict, normal_data: Dict, worst_data: Dict, save_p
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"图表已保存到: {save_path}")
     else:
         save_path = r"C:\Users\cmp094\Documents\0_Develop\0_Personal\cant-stop-2.0\simulation\simulation_game_result.png"
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"图表已保存到: {save_path}")
 
     plt.close()
 
 
-def plot_detailed_distribution(best_data: Dict, normal_data: Dict, worst_data: Dict, save_path: str = None):
-    """生成详细的分布对比图"""
+def plot_detailed_distribution(best_data: Dict, normal_data: Dict, worst_data: Dict, save_path: str = None,
+                               dpi: int = 100):
+    """生成详细的分布对比图
+
+    dpi 默认 100 供日常查看，需要高清图时传 150 或更高。
+    """
     if not MATPLOTLIB_AVAILABLE:
         print("需要安装 matplotlib: pip install matplotlib")
         return
@@ -976,17 +1497,14 @@ def plot_detailed_distribution(best_data: Dict, normal_data: Dict, worst_data: D
         (normal_data, 'normal', '普通运气'),
         (worst_data, 'worst', '最差运气')
     ]):
-        net_costs = sorted(data['net_costs'])
-        n = len(net_costs)
-        percentiles = [(i + 1) / n * 100 for i in range(n)]
+        net_costs, percentiles = _cdf_points(data['net_costs'])
 
-        ax.fill_between(net_costs, percentiles, alpha=0.3, color=colors[key])
+        ax.fill_between(net_costs, percentiles, alpha=0.3, color=colors[key], rasterized=True)
         ax.plot(net_costs, percentiles, color=colors[key], linewidth=2)
 
-        # 标记关键百分位
-        for p in [5, 25, 50, 75, 95]:
-            idx = int(n * p / 100)
-            val = net_costs[idx]
+        # 标记关键百分位：一次取出各百分位对应的排序位置
+        marks = np.array([5, 25, 50, 75, 95])
+        for p, val in zip(marks, net_costs[len(net_costs) * marks // 100]):
             ax.axhline(y=p, color='gray', linestyle=':', alpha=0.5)
             ax.axvline(x=val, color='gray', linestyle=':', alpha=0.5)
             ax.annotate(f'{p}%: {val:.0f}', xy=(val, p), fontsize=8,
@@ -1001,11 +1519,11 @@ def plot_detailed_distribution(best_data: Dict, normal_data: Dict, worst_data: D
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"详细分布图已保存到: {save_path}")
     else:
         save_path = r"C:\Users\cmp094\Documents\0_Develop\0_Personal\cant-stop-2.0\simulation\simulation_distribution.png"
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"详细分布图已保存到: {save_path}")
 
     plt.close()
@@ -1020,13 +1538,10 @@ if __name__ == "__main__":
     print("=" * 80)
     print()
 
-    best_stats, best_results = run_simulation_with_details(num_games=num_games, greedy=0.6, luck="best")
-    print()
-
-    normal_stats, normal_results = run_simulation_with_details(num_games=num_games, greedy=0.6, luck="normal")
-    print()
-
-    worst_stats, worst_results = run_simulation_with_details(num_games=num_games, greedy=0.6, luck="worst")
+    scenario_stats = run_luck_scenarios(num_games, greedy=0.6)
+    best_stats = scenario_stats["best"]
+    normal_stats = scenario_stats["normal"]
+    worst_stats = scenario_stats["worst"]
     print()
 
     # 生成统计图表
@@ -1035,21 +1550,31 @@ if __name__ == "__main__":
     plot_detailed_distribution(best_stats, normal_stats, worst_stats)
 
     # 打印文字结果
+    # 每种运气的消耗和净消耗各排序一次，各分位数和最值都从排好序的列表中取
+    sorted_costs = {}
+    sorted_net_costs = {}
+    for stats, luck in [(best_stats, "best"), (normal_stats, "normal"), (worst_stats, "worst")]:
+        sorted_costs[luck] = sorted(stats["costs"])
+        sorted_net_costs[luck] = sorted(stats["net_costs"])
+
     all_stats = []
     for stats, luck in [(best_stats, "best"), (normal_stats, "normal"), (worst_stats, "worst")]:
+        costs = sorted_costs[luck]
+        net_costs = sorted_net_costs[luck]
+        n_costs = len(costs)
         all_stats.append({
             "luck": stats["luck"],
             "win_rate": 100.0,
             "cost": {"mean": stats["cost_mean"], "median": stats["cost_median"],
-                     "min": min(stats["costs"]), "max": max(stats["costs"]),
-                     "p5": sorted(stats["costs"])[len(stats["costs"])//20],
-                     "p95": sorted(stats["costs"])[len(stats["costs"])*19//20]},
+                     "min": costs[0], "max": costs[-1],
+                     "p5": costs[n_costs//20],
+                     "p95": costs[n_costs*19//20]},
             "net_cost": {"mean": stats["net_cost_mean"], "median": stats["net_cost_median"],
-                        "min": min(stats["net_costs"]), "max": max(stats["net_costs"]),
-                        "p5": sorted(stats["net_costs"])[len(stats["net_costs"])//20],
-                        "p95": sorted(stats["net_costs"])[len(stats["net_costs"])*19//20],
-                        "p25": sorted(stats["net_costs"])[len(stats["net_costs"])//4],
-                        "p75": sorted(stats["net_costs"])[len(stats["net_costs"])*3//4]},
+                        "min": net_costs[0], "max": net_costs[-1],
+                        "p5": net_costs[n_costs//20],
+                        "p95": net_costs[n_costs*19//20],
+                        "p25": net_costs[n_costs//4],
+                        "p75": net_costs[n_costs*3//4]},
             "events": {"score_from_events_mean": stats["event_score_mean"],
                       "score_from_events_min": min(stats["event_scores"]),
                       "score_from_events_max": max(stats["event_scores"])},
@@ -1062,12 +1587,14 @@ if __name__ == "__main__":
 
     # 构建详细对比数据
     def build_detailed_stats(stats):
+        costs = sorted_costs[stats["luck_key"]]
+        net_costs = sorted_net_costs[stats["luck_key"]]
         return {
             "cost": {"mean": stats["cost_mean"], "median": stats["cost_median"],
-                     "min": min(stats["costs"]), "max": max(stats["costs"])},
+                     "min": costs[0], "max": costs[-1]},
             "net_cost": {"mean": stats["net_cost_mean"], "median": stats["net_cost_median"],
-                        "p5": sorted(stats["net_costs"])[len(stats["net_costs"])//20],
-                        "p95": sorted(stats["net_costs"])[len(stats["net_costs"])*19//20]},
+                        "p5": net_costs[len(net_costs)//20],
+                        "p95": net_costs[len(net_costs)*19//20]},
             "events": {"score_from_events_mean": stats["event_score_mean"],
                       "score_from_events_min": min(stats["event_scores"]),
                       "score_from_events_max": max(stats["event_scores"])},
@@ -1090,6 +1617,11 @@ if __name__ == "__main__":
 def simulate_single_column(target_column: int, num_games: int = 5000, luck: str = "normal") -> Dict:
     """模拟只攻略单一列直到登顶"""
     results = []
+    # 每次投骰只需知道目标列前进几格，按精确概率直接抽样，不再逐颗投骰、逐种分组
+    any_odds, two_odds = _ADVANCE_ODDS[target_column]
+    cell_scores = _CELL_SCORE_BY_LUCK[luck][target_column]
+    n_cells = len(cell_scores)
+    height = COLUMN_HEIGHTS[target_column]
 
     for _ in range(num_games):
         state = PlayerState()
@@ -1105,78 +1637,35 @@ def simulate_single_column(target_column: int, num_games: int = 5000, luck: str
                 state.total_rolls += 1
                 rolls_this_round += 1
 
-                # 投6个骰子
-                dice = [random.randint(1, 6) for _ in range(6)]
-
-                # 检查是否能投出目标列的和
+                # 投6个骰子，玩家选择最优分组：目标列前进0、1或2格
                 # 实际游戏中：玩家选择一种分组方式，可以选择1个或2个数值前进
-                from itertools import combinations
-                can_advance = False
-                advances = 0
-
-                for indices in combinations(range(6), 3):
-                    group1 = [dice[i] for i in indices]
-                    group2 = [dice[i] for i in range(6) if i not in indices]
-                    sum1, sum2 = sum(group1), sum(group2)
-
-                    # 这次分组能让目标列前进几格（0、1或2）
-                    this_advances = 0
-                    if sum1 == target_column:
-                        this_advances += 1
-                    if sum2 == target_column:
-                        this_advances += 1
-
-                    # 选择最优的分组方式
-                    if this_advances > advances:
-                        advances = this_advances
-                        can_advance = True
-
-                if can_advance:
+                u = _random()
+                advances = 2 if u < two_odds else (1 if u < any_odds else 0)
+
+                if advances:
                     # 每次投骰最多前进1-2格（取决于两个和值是否都是目标列）
                     temp_pos += advances
 
                     # 处理格子效果
-                    if temp_pos <= COLUMN_HEIGHTS[target_column]:
-                        cell_data = BOARD_DATA.get(target_column, [])
-                        if temp_pos <= len(cell_data):
-                            cell = cell_data[temp_pos - 1]
-                            cell_type, cell_id, cell_name = cell
-
-                            if cell_type == "E" and cell_id in ENCOUNTER_EFFECTS:
-                                effect = ENCOUNTER_EFFECTS[cell_id]
-                                score_change = effect[0]
-                                if luck == "best":
-                                    score_change = int(score_change * 2.0) if score_change > 0 else int(score_change * 0.2)
-                                elif luck == "worst":
-                                    score_change = int(score_change * 0.3) if score_change > 0 else int(score_change * 2.0)
-                                state.score_from_events += score_change
+                    if temp_pos <= n_cells:
+                        cell_type, score_change = cell_scores[temp_pos - 1]
+                        if cell_type:
+                            state.score_from_events += score_change
+                            if cell_type == "E":
                                 state.encounters_triggered += 1
-                            elif cell_type == "T" and cell_id in TRAP_EFFECTS:
-                                effect = TRAP_EFFECTS[cell_id]
-                                score_change = effect[0]
-                                if luck == "best":
-                                    score_change = int(score_change * 2.0) if score_change > 0 else int(score_change * 0.2)
-                                elif luck == "worst":
-                                    score_change = int(score_change * 0.3) if score_change > 0 else int(score_change * 2.0)
-                                state.score_from_events += score_change
+                            elif cell_type == "T":
                                 state.traps_triggered += 1
-                            elif cell_type == "I" and cell_id in ITEM_VALUES:
-                                value = ITEM_VALUES[cell_id]
-                                if luck == "best":
-                                    value = int(value * 1.5)
-                                elif luck == "worst":
-                                    value = int(value * 0.5)
-                                state.score_from_events += value
+                            else:
                                 state.items_collected += 1
 
                     # 检查是否登顶
-                    if temp_pos >= COLUMN_HEIGHTS[target_column]:
+                    if temp_pos >= height:
                         state.topped_columns.add(target_column)
-                        state.permanent_positions[target_column] = COLUMN_HEIGHTS[target_column]
+                        state.permanent_positions[target_column] = height
                         break
 
                     # 简单策略：前进了就有概率停止保存进度
-                    if rolls_this_round >= 3 and random.random() < 0.4:
+                    if rolls_this_round >= 3 and _random() < 0.4:
                         state.permanent_positions[target_column] = temp_pos
                         break
                 else:
@@ -1197,18 +1686,18 @@ def simulate_single_column(target_column: int, num_games: int = 5000, luck: str
             "score_from_events": state.score_from_events,
         })
 
-    costs = [r["total_cost"] for r in results]
-    net_costs = [r["net_cost"] for r in results]
+    cost_mean, cost_median, _, _ = _agg([r["total_cost"] for r in results])
+    net_cost_mean, net_cost_median, _, _ = _agg([r["net_cost"] for r in results])
 
     return {
         "column": target_column,
         "height": COLUMN_HEIGHTS[target_column],
-        "cost_mean": statistics.mean(costs),
-        "cost_median": statistics.median(costs),
-        "net_cost_mean": statistics.mean(net_costs),
-        "net_cost_median": statistics.median(net_costs),
-        "rolls_mean": statistics.mean([r["total_rolls"] for r in results]),
-        "event_score_mean": statistics.mean([r["score_from_events"] for r in results]),
+        "cost_mean": cost_mean,
+        "cost_median": cost_median,
+        "net_cost_mean": net_cost_mean,
+        "net_cost_median": net_cost_median,
+        "rolls_mean": statistics.fmean([r["total_rolls"] for r in results]),
+        "event_score_mean": statistics.fmean([r["score_from_events"] for r in results]),
     }
 
 
@@ -1321,13 +1810,24 @@ def simulate_specific_columns(target_columns: List[int], num_games: int = 3000,
     Returns:
         包含统计数据的字典
     """
-    all_costs = []
-    all_net_costs = []
-    all_rolls = []
-
+    # 按局数预先分配，按局号写入
+    all_costs = [0] * num_games
+    all_net_costs = [0] * num_games
+    all_rolls = [0] * num_games
+    cell_scores = _MULTI_COLUMN_CELL_SCORE_BY_LUCK[luck]
+    # 各目标列的高度在循环外取好，投骰循环内只读局部变量
+    heights = {col: COLUMN_HEIGHTS[col] for col in target_columns}
+    target_heights = tuple(heights.items())
+    # 投骰结果整批抽取，按顺序取用，用完再补
+    roll_buffer = []
+    roll_index = 0
+
+    last_report = time.monotonic()
     for game_i in range(num_games):
-        if game_i % 10 == 0:
-            print(f"      游戏 {game_i+1}/{num_games}", flush=True)
+        now = time.monotonic()
+        if now - last_report >= PROGRESS_SECONDS:
+            print(f"      游戏 {game_i+1}/{num_games}")
+            last_report = now
         state = PlayerState()
         target_set = set(target_columns)
 
@@ -1336,6 +1836,8 @@ def simulate_specific_columns(target_columns: List[int], num_games: int = 3000,
 
             # 模拟一轮：持续投骰直到失败或选择停止
             temp_positions = {col: state.permanent_positions.get(col, 0) for col in target_columns}
+            # 本轮内登顶列不会变化，本轮每次投骰的最优移动都查同一张表
+            advance_table = _best_advances_table(frozenset(target_set - state.topped_columns))
             rolls_this_round = 0
             round_success = True
 
@@ -1344,29 +1846,12 @@ def simulate_specific_columns(target_columns: List[int], num_games: int = 3000,
                 state.total_rolls += 1
                 rolls_this_round += 1
 
-                # 投骰
-                dice = [random.randint(1, 6) for _ in range(6)]
-
-                # 找出所有可能的分组方式，选择最优的
-                best_advances = {}  # col -> advances
-
-                for indices in combinations(range(6), 3):
-                    group1 = [dice[i] for i in indices]
-                    group2 = [dice[i] for i in range(6) if i not in indices]
-                    sum1, sum2 = sum(group1), sum(group2)
-
-                    # 计算这个分组对目标列的贡献
-                    advances_this_combo = {}
-                    for s in [sum1, sum2]:
-                        if s in target_set and s not in state.topped_columns:
-                            if s not in advances_this_combo:
-                                advances_this_combo[s] = 0
-                            advances_this_combo[s] += 1
-
-                    # 选择总贡献最大的分组
-                    total_advance = sum(advances_this_combo.values())
-                    if total_advance > sum(best_advances.values()) if best_advances else 0:
-                        best_advances = advances_this_combo
+                # 投骰：按出现次数抽一种点数组合，直接查出对目标列最优的移动
+                if roll_index == len(roll_buffer):
+                    roll_buffer = _choices(_ROLL_OUTCOME_IDS, cum_weights=_ROLL_CUM_WEIGHTS, k=_ROLL_BUFFER_SIZE)
+                    roll_index = 0
+                best_advances = advance_table[roll_buffer[roll_index]]  # ((列, 前进格数), ...)
+                roll_index += 1
 
                 if not best_advances:
                     # 没有有效移动，本轮失败
@@ -1375,47 +1860,28 @@ def simulate_specific_columns(target_columns: List[int], num_games: int = 3000,
                     break
 
                 # 应用移动
-                for col, adv in best_advances.items():
+                for col, adv in best_advances:
                     temp_positions[col] = temp_positions.get(col, 0) + adv
 
                     # 处理格子效果
                     new_pos = temp_positions[col]
-                    if new_pos <= COLUMN_HEIGHTS[col]:
-                        cell_data = BOARD_DATA.get(col, [])
-                        if new_pos <= len(cell_data):
-                            cell = cell_data[new_pos - 1]
-                            cell_type, cell_id, cell_name = cell
-
-                            score_change = 0
-                            if cell_type == "E" and cell_id in ENCOUNTER_EFFECTS:
-                                effect = ENCOUNTER_EFFECTS[cell_id]
-                                score_change = effect[0]
-                            elif cell_type == "T" and cell_id in TRAP_EFFECTS:
-                                effect = TRAP_EFFECTS[cell_id]
-                                score_change = effect[0]
-                            elif cell_type == "I" and cell_id in ITEM_VALUES:
-                                score_change = ITEM_VALUES[cell_id]
-
-                            # 应用运气修正
-                            if luck == "best":
-                                score_change = int(score_change * 2.0) if score_change > 0 else int(score_change * 0.2)
-                            elif luck == "worst":
-                                score_change = int(score_change * 0.3) if score_change > 0 else int(score_change * 2.0)
-
-                            state.score_from_events += score_change
-
-                # 检查是否有登顶
-                topped_this_roll = []
-                for col in target_columns:
-                    if col not in state.topped_columns and temp_positions.get(col, 0) >= COLUMN_HEIGHTS[col]:
-                        topped_this_roll.append(col)
+                    column_scores = cell_scores[col]
+                    if new_pos <= len(column_scores):
+                        state.score_from_events += column_scores[new_pos - 1][1]
+
+                # 检查是否有登顶：只有本次前进的未登顶列可能新登顶
+                topped_this_roll = False
+                for col, _ in best_advances:
+                    if temp_positions[col] >= heights[col]:
+                        topped_this_roll = True
+                        break
 
                 # 决定是否继续（简化：投3次后有概率停止）
-                if topped_this_roll or (rolls_this_round >= 3 and random.random() < 0.4):
+                if topped_this_roll or (rolls_this_round >= 3 and _random() < 0.4):
                     # 保存进度
-                    for col in target_columns:
+                    for col, height in target_heights:
                         pos = temp_positions.get(col, 0)
-                        if pos >= COLUMN_HEIGHTS[col]:
+                        if pos >= height:
                             state.topped_columns.add(col)
                         else:
                             state.permanent_positions[col] = pos
@@ -1423,183 +1889,56 @@ def simulate_specific_columns(target_columns: List[int], num_games: int = 3000,
 
             # 如果本轮失败，不保存临时进度
             if round_success:
-                for col in target_columns:
+                for col, height in target_heights:
                     pos = temp_positions.get(col, 0)
-                    if pos >= COLUMN_HEIGHTS[col]:
+                    if pos >= height:
                         state.topped_columns.add(col)
                     elif pos > state.permanent_positions.get(col, 0):
                         state.permanent_positions[col] = pos
 
-        all_costs.append(state.total_cost)
-        all_net_costs.append(state.total_cost - state.score_from_events)
-        all_rolls.append(state.total_rolls)
+        all_costs[game_i] = state.total_cost
+        all_net_costs[game_i] = state.total_cost - state.score_from_events
+        all_rolls[game_i] = state.total_rolls
 
+    # 净消耗只排序一次，中位数、最值和分位数都从中取
+    net_sorted = sorted(all_net_costs)
+    cost_mean, cost_median, _, _ = _agg(all_costs)
     return {
         "columns": target_columns,
-        "cost_mean": statistics.mean(all_costs),
-        "cost_median": statistics.median(all_costs),
-        "net_cost_mean": statistics.mean(all_net_costs),
-        "net_cost_median": statistics.median(all_net_costs),
-        "net_cost_min": min(all_net_costs),
-        "net_cost_max": max(all_net_costs),
-        "net_cost_p5": sorted(all_net_costs)[len(all_net_costs) // 20],
-        "net_cost_p95": sorted(all_net_costs)[len(all_net_costs) * 19 // 20],
-        "rolls_mean": statistics.mean(all_rolls),
+        "cost_mean": cost_mean,
+        "cost_median": cost_median,
+        "net_cost_mean": statistics.fmean(all_net_costs),
+        "net_cost_median": _sorted_median(net_sorted),
+        "net_cost_min": net_sorted[0],
+        "net_cost_max": net_sorted[-1],
+        "net_cost_p5": net_sorted[num_games // 20],
+        "net_cost_p95": net_sorted[num_games * 19 // 20],
+        "rolls_mean": statistics.fmean(all_rolls),
         "all_net_costs": all_net_costs,
     }
 
 
 def calculate_dice_probabilities():
     """计算6个骰子分成两组各3个时，每个和值出现的概率"""
-    # 统计每个和值出现的次数
+    # 按不计顺序的 462 种点数组合累加，每种组合按其在 6^6 种有序结果中的出现次数加权
     sum_counts = defaultdict(int)
-    total_outcomes = 0
-
-    # 遍历所有可能的骰子结果
-    for d1 in range(1, 7):
-        for d2 in range(1, 7):
-            for d3 in range(1, 7):
-                for d4 in range(1, 7):
-                    for d5 in range(1, 7):
-                        for d6 in range(1, 7):
-                            dice = [d1, d2, d3, d4, d5, d6]
-                            # 获取所有可能的分组方式
-                            sums_this_roll = set()
-                            for indices in combinations(range(6), 3):
-                                group1 = [dice[i] for i in indices]
-                                group2 = [dice[i] for i in range(6) if i not in indices]
-                                sums_this_roll.add(sum(group1))
-                                sums_this_roll.add(sum(group2))
-
-                            for s in sums_this_roll:
-                                sum_counts[s] += 1
-                            total_outcomes += 1
+    prev = 0
+    for possible_sums, cum in zip(_ROLL_SPLIT_SUMS, _ROLL_CUM_WEIGHTS):
+        weight = cum - prev
+        prev = cum
+        sums_this_roll = set()
+        for sum1, sum2 in possible_sums:
+            sums_this_roll.add(sum1)
+            sums_this_roll.add(sum2)
+        for s in sums_this_roll:
+            sum_counts[s] += weight
 
     # 转换为概率
+    total_outcomes = _ROLL_CUM_WEIGHTS[-1]
     probabilities = {s: count / total_outcomes * 100 for s, count in sum_counts.items()}
     return probabilities
 
 
-def simulate_single_column_detailed(target_column: int, num_games: int = 3000, luck: str = "normal") -> Dict:
-    """模拟只攻略单一列直到登顶，返回详细数据"""
-    results = []
-    all_costs = []
-    all_net_costs = []
-    all_rolls = []
-    all_rounds = []
-
-    for _ in range(num_games):
-        state = PlayerState()
-
-        while target_column not in state.topped_columns:
-            state.total_rounds += 1
-            temp_pos = state.permanent_positions.get(target_column, 0)
-            rolls_this_round = 0
-
-            while rolls_this_round < 50:
-                state.total_cost += COST_PER_ROLL
-                state.total_rolls += 1
-                rolls_this_round += 1
-
-                dice = [random.randint(1, 6) for _ in range(6)]
-                can_advance = False
-                advances = 0
-
-                # 检查所有可能的分组方式，找出最佳选择
-                # 实际游戏中：玩家选择一种分组方式，可以选择1个或2个数值前进
-                # 每个选中的数值对应的列前进1格
-                for indices in combinations(range(6), 3):
-                    group1 = [dice[i] for i in indices]
-                    group2 = [dice[i] for i in range(6) if i not in indices]
-                    sum1, sum2 = sum(group1), sum(group2)
-
-                    # 这次分组能让目标列前进几格（0、1或2）
-                    this_advances = 0
-                    if sum1 == target_column:
-                        this_advances += 1
-                    if sum2 == target_column:
-                        this_advances += 1
-
-                    # 选择最优的分组方式
-                    if this_advances > advances:
-                        advances = this_advances
-                        can_advance = True
-
-                if can_advance:
-                    # 每次投骰最多前进1-2格（取决于两个和值是否都是目标列）
-                    temp_pos += advances
-
-                    if temp_pos <= COLUMN_HEIGHTS[target_column]:
-                        cell_data = BOARD_DATA.get(target_column, [])
-                        if temp_pos <= len(cell_data):
-                            cell = cell_data[temp_pos - 1]
-                            cell_type, cell_id, cell_name = cell
-
-                            if cell_type == "E" and cell_id in ENCOUNTER_EFFECTS:
-                                effect = ENCOUNTER_EFFECTS[cell_id]
-                                score_change = effect[0]
-                                if luck == "best":
-                                    score_change = int(score_change * 2.0) if score_change > 0 else int(score_change * 0.2)
-                                elif luck == "worst":
-                                    score_change = int(score_change * 0.3) if score_change > 0 else int(score_change * 2.0)
-                                state.score_from_events += score_change
-                            elif cell_type == "T" and cell_id in TRAP_EFFECTS:
-                                effect = TRAP_EFFECTS[cell_id]
-                                score_change = effect[0]
-                                if luck == "best":
-                                    score_change = int(score_change * 2.0) if score_change > 0 else int(score_change * 0.2)
-                                elif luck == "worst":
-                                    score_change = int(score_change * 0.3) if score_change > 0 else int(score_change * 2.0)
-                                state.score_from_events += score_change
-                            elif cell_type == "I" and cell_id in ITEM_VALUES:
-                                value = ITEM_VALUES[cell_id]
-                                if luck == "best":
-                                    value = int(value * 1.5)
-                                elif luck == "worst":
-                                    value = int(value * 0.5)
-                                state.score_from_events += value
-
-                    if temp_pos >= COLUMN_HEIGHTS[target_column]:
-                        state.topped_columns.add(target_column)
-                        state.permanent_positions[target_column] = COLUMN_HEIGHTS[target_column]
-                        break
-
-                    if rolls_this_round >= 3 and random.random() < 0.4:
-                        state.permanent_positions[target_column] = temp_pos
-                        break
-                else:
-                    state.failed_rounds += 1
-                    break
-
-            if target_column not in state.topped_columns and temp_pos > state.permanent_positions.get(target_column, 0):
-                state.permanent_positions[target_column] = temp_pos
-
-        all_costs.append(state.total_cost)
-        all_net_costs.append(state.total_cost - state.score_from_events)
-        all_rolls.append(state.total_rolls)
-        all_rounds.append(state.total_rounds)
-
-    return {
-        "column": target_column,
-        "height": COLUMN_HEIGHTS[target_column],
-        "cost_mean": statistics.mean(all_costs),
-        "cost_median": statistics.median(all_costs),
-        "cost_min": min(all_costs),
-        "cost_max": max(all_costs),
-        "cost_std": statistics.stdev(all_costs) if len(all_costs) > 1 else 0,
-        "net_cost_mean": statistics.mean(all_net_costs),
-        "net_cost_median": statistics.median(all_net_costs),
-        "net_cost_min": min(all_net_costs),
-        "net_cost_max": max(all_net_costs),
-        "net_cost_p5": sorted(all_net_costs)[len(all_net_costs) // 20],
-        "net_cost_p95": sorted(all_net_costs)[len(all_net_costs) * 19 // 20],
-        "rolls_mean": statistics.mean(all_rolls),
-        "rounds_mean": statistics.mean(all_rounds),
-        "all_net_costs": all_net_costs,
-        "all_costs": all_costs,
-    }
-
-
 def run_comprehensive_analysis():
     """运行综合分析并生成大图表"""
     print("=" * 80)
@@ -1614,28 +1953,16 @@ def run_comprehensive_analysis():
     # 2. 模拟每列在不同运气下的数据
     print("模拟每列登顶数据 (3种运气情况)...")
 
-    column_data = {luck: {} for luck in ["best", "normal", "worst"]}
-
-    for luck in ["best", "normal", "worst"]:
-        luck_name = {"best": "最佳", "normal": "普通", "worst": "最差"}[luck]
-        print(f"  {luck_name}运气...", flush=True)
-        for col in VALID_COLUMNS:
-            print(f"    列{col}...", end="", flush=True)
-            column_data[luck][col] = simulate_single_column_detailed(col, num_games=2000, luck=luck)
-            print("完成", flush=True)
+    column_data = run_column_scenarios(2000)
+    print("  完成", flush=True)
 
     # 3. 模拟登顶3列获胜的整体数据
     print("模拟登顶3列获胜数据...", flush=True)
     global WIN_CONDITION
     WIN_CONDITION = 3
 
-    overall_data = {}
-    for luck in ["best", "normal", "worst"]:
-        luck_name = {"best": "最佳", "normal": "普通", "worst": "最差"}[luck]
-        print(f"  {luck_name}运气整体模拟...", flush=True)
-        stats, results = run_simulation_with_details(num_games=5000, greedy=0.6, luck=luck)
-        overall_data[luck] = stats
-        print(f"    完成", flush=True)
+    overall_data = run_luck_scenarios(5000, greedy=0.6)
+    print("    完成", flush=True)
 
     # 4. 统计最容易登顶的列组合
     print("分析最佳列组合...", flush=True)
@@ -1883,8 +2210,7 @@ def run_comprehensive_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][best_col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][best_col]["all_net_costs"])
         ax10.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax10.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax10.set_xlabel('净消耗积分')
@@ -1975,27 +2301,14 @@ def run_ultra_detailed_analysis():
     # 2. 模拟每列在不同运气下的详细数据 (增加模拟次数)
     print("步骤 2/4: 模拟每列登顶数据 (3种运气, 每列3000次)...")
 
-    column_data = {luck: {} for luck in ["best", "normal", "worst"]}
-
-    for luck in ["best", "normal", "worst"]:
-        luck_name = {"best": "最佳", "normal": "普通", "worst": "最差"}[luck]
-        print(f"  {luck_name}运气...")
-        for col in VALID_COLUMNS:
-            column_data[luck][col] = simulate_single_column_detailed(col, num_games=3000, luck=luck)
+    column_data = run_column_scenarios(3000)
 
     # 3. 模拟登顶3列获胜的整体数据
     print("步骤 3/4: 模拟登顶3列获胜数据 (每种运气8000次)...")
     global WIN_CONDITION
     WIN_CONDITION = 3
 
-    overall_data = {}
-    overall_results = {}
-    for luck in ["best", "normal", "worst"]:
-        luck_name = {"best": "最佳", "normal": "普通", "worst": "最差"}[luck]
-        print(f"  {luck_name}运气整体模拟...")
-        stats, results = run_simulation_with_details(num_games=8000, greedy=0.6, luck=luck)
-        overall_data[luck] = stats
-        overall_results[luck] = results
+    overall_data = run_luck_scenarios(8000, greedy=0.6)
 
     # 4. 排序找出最佳和最差列
     sorted_cols = sorted(VALID_COLUMNS, key=lambda c: column_data["normal"][c]["net_cost_mean"])
@@ -2353,8 +2666,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax11.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax11.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax11.set_xlabel('净消耗积分', fontsize=10)
@@ -2370,8 +2682,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax12.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax12.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax12.set_xlabel('净消耗积分', fontsize=10)
@@ -2387,8 +2698,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax13.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax13.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax13.set_xlabel('净消耗积分', fontsize=10)
@@ -2422,8 +2732,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax15.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax15.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax15.set_xlabel('净消耗积分', fontsize=10)
@@ -2438,8 +2747,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax16.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax16.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax16.set_xlabel('净消耗积分', fontsize=10)
@@ -2454,8 +2762,7 @@ def run_ultra_detailed_analysis():
     for luck, color, label in [("best", '#2ecc71', '最佳运气'),
                                 ("normal", '#3498db', '普通运气'),
                                 ("worst", '#e74c3c', '最差运气')]:
-        net_costs_sorted = sorted(column_data[luck][col]["all_net_costs"])
-        percentiles = [(i + 1) / len(net_costs_sorted) * 100 for i in range(len(net_costs_sorted))]
+        net_costs_sorted, percentiles = _cdf_points(column_data[luck][col]["all_net_costs"])
         ax17.plot(net_costs_sorted, percentiles, color=color, linewidth=2, label=label)
         ax17.fill_between(net_costs_sorted, percentiles, alpha=0.1, color=color)
     ax17.set_xlabel('净消耗积分', fontsize=10)
@@ -2482,10 +2789,10 @@ def run_ultra_detailed_analysis():
 
     # 6-1: 登顶3列整体净消耗分布
     ax19 = fig.add_subplot(gs[5, 0])
-    for luck, color, label in [("best", '#2ecc71', '最佳运气'),
-                                ("normal", '#3498db', '普通运气'),
-                                ("worst", '#e74c3c', '最差运气')]:
-        ax19.hist(overall_data[luck]["net_costs"], bins=40, alpha=0.5, label=label, color=color, edgecolor='white')
+    _plot_overlaid_hist(ax19, [(overall_data[luck]["net_costs"], label, color)
+                               for luck, color, label in [("best", '#2ecc71', '最佳运气'),
+                                                          ("normal", '#3498db', '普通运气'),
+                                                          ("worst", '#e74c3c', '最差运气')]], bins=40)
     ax19.set_xlabel('净消耗积分', fontsize=10)
     ax19.set_ylabel('频次', fontsize=10)
     ax19.set_title('(19) 登顶3列 净消耗分布', fontsize=12, fontweight='bold')
@@ -2583,13 +2890,15 @@ def generate_per_column_charts():
     # 计算骰子概率
     dice_probs = calculate_dice_probabilities()
 
+    # 先并行模拟所有列三种运气情况的数据
+    column_data = run_column_scenarios(3000)
+
     for col in VALID_COLUMNS:
         print(f"正在生成列 {col} 的图表...")
 
-        # 收集三种运气情况的数据
-        best_data = simulate_single_column_detailed(col, num_games=3000, luck="best")
-        normal_data = simulate_single_column_detailed(col, num_games=3000, luck="normal")
-        worst_data = simulate_single_column_detailed(col, num_games=3000, luck="worst")
+        best_data = column_data["best"][col]
+        normal_data = column_data["normal"][col]
+        worst_data = column_data["worst"][col]
 
         # 创建图表
         fig, axes = plt.subplots(2, 3, figsize=(16, 10))
@@ -2602,8 +2911,8 @@ def generate_per_column_charts():
 
         # 1. 净消耗分布直方图
         ax1 = axes[0, 0]
-        for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-            ax1.hist(data['all_net_costs'], bins=30, alpha=0.5, label=labels[key], color=colors[key], edgecolor='white')
+        _plot_overlaid_hist(ax1, [(data['all_net_costs'], labels[key], colors[key])
+                                 for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]])
         ax1.set_xlabel('净消耗积分')
         ax1.set_ylabel('频次')
         ax1.set_title('净消耗分布')
@@ -2612,8 +2921,8 @@ def generate_per_column_charts():
 
         # 2. 总消耗分布直方图
         ax2 = axes[0, 1]
-        for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-            ax2.hist(data['all_costs'], bins=30, alpha=0.5, label=labels[key], color=colors[key], edgecolor='white')
+        _plot_overlaid_hist(ax2, [(data['all_costs'], labels[key], colors[key])
+                                 for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]])
         ax2.set_xlabel('总消耗积分')
         ax2.set_ylabel('频次')
         ax2.set_title('总消耗分布')
@@ -2622,9 +2931,7 @@ def generate_per_column_charts():
         # 3. 累积分布图
         ax3 = axes[0, 2]
         for data, key in [(best_data, 'best'), (normal_data, 'normal'), (worst_data, 'worst')]:
-            sorted_costs = sorted(data['all_net_costs'])
-            n = len(sorted_costs)
-            percentiles = [(i + 1) / n * 100 for i in range(n)]
+            sorted_costs, percentiles = _cdf_points(data['all_net_costs'])
             ax3.plot(sorted_costs, percentiles, color=colors[key], linewidth=2, label=labels[key])
             ax3.fill_between(sorted_costs, percentiles, alpha=0.2, color=colors[key])
         ax3.set_xlabel('净消耗积分')